@@ -12,6 +12,7 @@ import logging
 import time
 
 from ragsearch1.config import settings
+from ragsearch1.executor import shutdown_executors, start_loop_lag_monitor
 from ragsearch1.scheduler import get_scheduler
 
 from .routes import search, compare, bcv, admin
@@ -113,12 +114,14 @@ async def startup_event():
     """Initialize services on startup"""
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
 
-    # Start scheduler if enabled
-    if settings.SCHEDULER_ENABLE:
+    # Event loop lag shows when sync work stalls request serving
+    start_loop_lag_monitor()
+
+    # Run the scheduler in whichever worker wins the leader election, unless
+    # jobs run in the standalone worker (python -m ragsearch1.worker)
+    if settings.SCHEDULER_ENABLE and settings.SCHEDULER_IN_API:
         try:
-            scheduler = get_scheduler()
-            scheduler.start()
-            logger.info("Scheduler started successfully")
+            get_scheduler().start_elected()
         except Exception as e:
             logger.error(f"Failed to start scheduler: {e}")
 
@@ -131,15 +134,17 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down application...")
 
-    # Stop scheduler
-    if settings.SCHEDULER_ENABLE:
+    # Stop scheduler and hand leadership over
+    if settings.SCHEDULER_ENABLE and settings.SCHEDULER_IN_API:
         try:
-            scheduler = get_scheduler()
-            scheduler.stop()
+            await get_scheduler().stop_elected()
             logger.info("Scheduler stopped")
         except Exception as e:
             logger.error(f"Failed to stop scheduler: {e}")
 
+    # Release worker pools
+    shutdown_executors()
+
     logger.info("Application shutdown complete")
 
 
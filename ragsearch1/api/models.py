@@ -25,6 +25,7 @@ class EntityMetadata(BaseModel):
     country: str
     api_available: bool
     url: Optional[str] = None
+    rating: Optional[float] = None
 
 
 class SearchResult(BaseModel):
@@ -32,7 +33,8 @@ class SearchResult(BaseModel):
     id: str
     document: str
     metadata: EntityMetadata
-    similarity_score: float
+    similarity_score: Optional[float] = Field(None, description="Vector similarity (None for listings and keyword-only matches)")
+    lexical_score: Optional[float] = Field(None, description="Normalized BM25 score of keyword-only matches")
 
 
 class SearchResponse(BaseModel):
@@ -43,6 +45,22 @@ class SearchResponse(BaseModel):
     filters: Optional[Dict[str, str]] = None
 
 
+class BatchSearchRequest(BaseModel):
+    """Batched search request model"""
+    requests: List[SearchRequest] = Field(
+        ...,
+        description="Search requests, answered in the same order",
+        min_length=1,
+        max_length=20
+    )
+
+
+class BatchSearchResponse(BaseModel):
+    """Batched search response model"""
+    responses: List[SearchResponse]
+    total: int
+
+
 # ====================
 # COMPARISON MODELS
 # ====================
@@ -61,7 +79,7 @@ class RemittanceOption(BaseModel):
     name: str
     type: str
     country: str
-    similarity_score: float
+    similarity_score: Optional[float] = None
     metadata: Dict[str, Any]
 
 
@@ -75,6 +93,10 @@ class CompareResponse(BaseModel):
     comparison: str
     sources: List[Dict[str, Any]]
     total_found: int
+    timings: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Stage timings in ms (retrieval_ms, generation_ms, total_ms)"
+    )
 
 
 # ====================
@@ -119,6 +141,7 @@ class CollectionStatsResponse(BaseModel):
     name: str
     count: int
     metadata: Dict[str, Any]
+    memory: Optional[Dict[str, Any]] = Field(None, description="Search matrix memory (local backend)")
 
 
 class SchedulerStatusResponse(BaseModel):
@@ -126,6 +149,11 @@ class SchedulerStatusResponse(BaseModel):
     is_running: bool
     timezone: str
     jobs: List[Dict[str, Any]]
+    last_runs: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Latest ingest summary per scope (new, changed, refreshed, unchanged, removed)"
+    )
+    leader: Optional[Dict[str, Any]] = Field(None, description="Leader election state of this process")
 
 
 class DataCollectionStatusResponse(BaseModel):
@@ -152,6 +180,7 @@ class EntityListResponse(BaseModel):
     total: int
     country: Optional[str] = None
     type: Optional[str] = None
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
 
 
 # ====================
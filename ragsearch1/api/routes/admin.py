@@ -3,13 +3,13 @@ Admin endpoints for RAGSearch1 API
 System management and monitoring
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException
 import logging
 
+from ragsearch1.config import settings
 from ragsearch1.vectordb import get_vector_db
 from ragsearch1.scheduler import get_scheduler
 from ragsearch1.collector import get_collector
-from ragsearch1.processor import get_processor
 from ..models import (
     CollectionStatsResponse,
     SchedulerStatusResponse,
@@ -30,6 +30,7 @@ async def get_collection_stats():
     - Collection name
     - Total number of indexed entities
     - Collection metadata
+    - Search matrix memory and quantization (local backend)
     """
     try:
         vector_db = get_vector_db()
@@ -38,7 +39,8 @@ async def get_collection_stats():
         return CollectionStatsResponse(
             name=stats.get('name', 'unknown'),
             count=stats.get('count', 0),
-            metadata=stats.get('metadata', {})
+            metadata=stats.get('metadata', {}),
+            memory=stats.get('memory')
         )
 
     except Exception as e:
@@ -55,6 +57,8 @@ async def get_scheduler_status():
     - Running status
     - Configured timezone
     - List of scheduled jobs with next run times
+    - Latest ingest summary per scope (new/changed/refreshed/unchanged/removed)
+    - Leader election state of the worker answering (only the leader runs jobs)
     """
     try:
         scheduler = get_scheduler()
@@ -63,7 +67,9 @@ async def get_scheduler_status():
         return SchedulerStatusResponse(
             is_running=status['is_running'],
             timezone=status['timezone'],
-            jobs=status['jobs']
+            jobs=status['jobs'],
+            last_runs=status.get('last_runs', {}),
+            leader=status.get('leader')
         )
 
     except Exception as e:
@@ -76,15 +82,20 @@ async def start_scheduler():
     """
     Start the scheduler
 
-    Begins automatic data collection and update tasks.
+    Joins this API worker to the scheduler leader election: it runs the
+    jobs only if it wins, so workers never run them twice.
     """
+    if not settings.SCHEDULER_IN_API:
+        raise HTTPException(status_code=409, detail="Scheduled jobs run in the standalone worker (SCHEDULER_IN_API=false)")
+
     try:
         scheduler = get_scheduler()
-        scheduler.start()
+        scheduler.start_elected()
 
         return {
-            "message": "Scheduler started successfully",
-            "status": "running"
+            "message": "Joined the scheduler election",
+            "status": "running" if scheduler.is_running else "standby",
+            "leader": scheduler.elector.status() if scheduler.elector else None
         }
 
     except Exception as e:
@@ -97,14 +108,18 @@ async def stop_scheduler():
     """
     Stop the scheduler
 
-    Stops all automatic data collection tasks.
+    Stops the jobs in this API worker and leaves the leader election,
+    releasing the lease so another process takes over.
     """
+    if not settings.SCHEDULER_IN_API:
+        raise HTTPException(status_code=409, detail="Scheduled jobs run in the standalone worker (SCHEDULER_IN_API=false)")
+
     try:
         scheduler = get_scheduler()
-        scheduler.stop()
+        await scheduler.stop_elected()
 
         return {
-            "message": "Scheduler stopped successfully",
+            "message": "Scheduler stopped in this process; another one can take over",
             "status": "stopped"
         }
 
@@ -139,143 +154,66 @@ async def get_collection_status():
 
 
 @router.post("/collection/run")
-async def run_collection(background_tasks: BackgroundTasks):
+async def run_collection():
     """
     Trigger data collection manually
 
-    Runs data collection in the background and returns immediately.
-    Use /admin/collection/status to check progress.
+    Queues a run of the discovery job in the process running the scheduler
+    (the elected API worker or the standalone worker) and returns immediately.
+    Use /admin/scheduler/status to check the latest run.
     """
     try:
-        async def collect_data():
-            """Background task for data collection"""
-            try:
-                collector = get_collector()
-                processor = get_processor()
-                vector_db = get_vector_db()
-
-                # Collect data
-                logger.info("Starting manual data collection...")
-                entities = await collector.collect_all()
-
-                if not entities:
-                    logger.warning("No entities collected")
-                    return
-
-                # Process entities
-                logger.info(f"Processing {len(entities)} entities...")
-                documents, metadatas, ids, embeddings = processor.process_entity_batch(entities)
-
-                # Add to vector database
-                logger.info(f"Adding {len(documents)} documents to vector DB...")
-                success = vector_db.add_documents(
-                    documents=documents,
-                    metadatas=metadatas,
-                    ids=ids,
-                    embeddings=embeddings
-                )
-
-                if success:
-                    logger.info(f"Manual collection completed: {len(entities)} entities added")
-                else:
-                    logger.error("Failed to add documents to vector DB")
-
-            except Exception as e:
-                logger.error(f"Manual collection failed: {e}")
-
-        # Add to background tasks
-        background_tasks.add_task(collect_data)
+        if not get_scheduler().request_run("discover_entities"):
+            raise HTTPException(status_code=503, detail="Run request could not be queued for the scheduler")
 
         return {
-            "message": "Data collection started in background",
-            "status": "running"
+            "message": "Data collection queued for the scheduler",
+            "job_id": "discover_entities",
+            "status": "queued"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Run collection failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Scheduler job updating each entity type
+UPDATE_JOBS = {
+    "exchanges": "update_exchanges",
+    "banks": "update_banks",
+    "venezuela": "update_bcv",
+    "remittance": "update_remittance",
+}
+
+
 @router.post("/collection/update/{entity_type}")
-async def update_entity_type(entity_type: str, background_tasks: BackgroundTasks):
+async def update_entity_type(entity_type: str):
     """
     Update a specific type of entities
 
     Args:
         entity_type: Type to update (exchanges, banks, venezuela, remittance)
 
-    Runs update in the background.
+    Queues the update job in the process running the scheduler.
     """
+    if entity_type not in UPDATE_JOBS:
+        raise HTTPException(status_code=400, detail=f"Unknown entity type: {entity_type}")
+
     try:
-        async def update_type():
-            """Background task for type-specific update"""
-            try:
-                collector = get_collector()
-                processor = get_processor()
-                vector_db = get_vector_db()
-
-                # Collect based on type
-                if entity_type == "exchanges":
-                    entities = await collector.collect_crypto_exchanges()
-                elif entity_type == "banks":
-                    from ragsearch1.collector import asyncio
-                    tasks = []
-                    if collector.sources_status.get("plaid"):
-                        tasks.append(collector.collect_plaid_institutions())
-                    if collector.sources_status.get("belvo"):
-                        tasks.append(collector.collect_belvo_institutions())
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-                    entities = []
-                    for r in results:
-                        if isinstance(r, list):
-                            entities.extend(r)
-                elif entity_type == "venezuela":
-                    entities = await collector.collect_venezuela_entities()
-                elif entity_type == "remittance":
-                    entities = await collector.collect_remittance_services()
-                else:
-                    logger.error(f"Unknown entity type: {entity_type}")
-                    return
-
-                if not entities:
-                    logger.warning(f"No {entity_type} entities collected")
-                    return
-
-                # Process and update
-                documents, metadatas, ids, embeddings = processor.process_entity_batch(entities)
-
-                for i, entity_id in enumerate(ids):
-                    existing = vector_db.get_entity_by_id(entity_id)
-
-                    if existing:
-                        vector_db.update_document(
-                            document_id=entity_id,
-                            document=documents[i],
-                            metadata=metadatas[i],
-                            embedding=embeddings[i]
-                        )
-                    else:
-                        vector_db.add_documents(
-                            documents=[documents[i]],
-                            metadatas=[metadatas[i]],
-                            ids=[entity_id],
-                            embeddings=[embeddings[i]]
-                        )
-
-                logger.info(f"Updated {len(entities)} {entity_type} entities")
-
-            except Exception as e:
-                logger.error(f"Update {entity_type} failed: {e}")
-
-        # Add to background tasks
-        background_tasks.add_task(update_type)
+        if not get_scheduler().request_run(UPDATE_JOBS[entity_type]):
+            raise HTTPException(status_code=503, detail="Run request could not be queued for the scheduler")
 
         return {
-            "message": f"Update of {entity_type} started in background",
+            "message": f"Update of {entity_type} queued for the scheduler",
             "entity_type": entity_type,
-            "status": "running"
+            "job_id": UPDATE_JOBS[entity_type],
+            "status": "queued"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Update entity type failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -344,8 +282,15 @@ async def admin_health_check():
         try:
             scheduler = get_scheduler()
             status = scheduler.get_job_status()
+            leader = status.get('leader') or {}
+            if status['is_running']:
+                scheduler_state = "healthy"
+            elif leader.get('participating'):
+                scheduler_state = "standby"  # Another process is the leader
+            else:
+                scheduler_state = "stopped"
             health_status["components"]["scheduler"] = {
-                "status": "healthy" if status['is_running'] else "stopped",
+                "status": scheduler_state,
                 "job_count": len(status['jobs'])
             }
         except Exception as e:
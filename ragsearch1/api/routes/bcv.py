@@ -3,7 +3,8 @@ BCV Venezuela endpoints for RAGSearch1 API
 Real-time exchange rates from multiple Venezuelan sources
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
 import logging
 from datetime import datetime
 
@@ -171,22 +172,32 @@ async def get_bcv_history(days: int = 7):
 
 
 @router.get("/bcv/entities")
-async def get_venezuela_entities():
+async def get_venezuela_entities(
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page")
+):
     """
     Get all financial entities in Venezuela
 
+    **limit**: Maximum number of results
+    **cursor**: Pagination cursor (`next_cursor` of the previous page)
+
     Returns banks, exchanges, casas de cambio, and fintech companies
-    operating in Venezuela.
+    operating in Venezuela, one page at a time.
     """
     try:
+        from ragsearch1.executor import get_executor
         from ragsearch1.retriever import get_retriever
 
         retriever = get_retriever()
 
-        entities = retriever.get_entities_by_country(
+        page = await get_executor("retrieval").run(
+            retriever.get_entities_by_country,
             country_code="VE",
-            limit=50
+            limit=limit,
+            cursor=cursor
         )
+        entities = page['entities']
 
         return {
             "entities": [
@@ -196,14 +207,17 @@ async def get_venezuela_entities():
                     "type": e['metadata']['type'],
                     "api_available": e['metadata'].get('api_available', False),
                     "url": e['metadata'].get('url', ''),
-                    "similarity_score": e['similarity_score']
+                    "rating": e['metadata'].get('rating')
                 }
                 for e in entities
             ],
             "total": len(entities),
-            "country": "VE"
+            "country": "VE",
+            "next_cursor": page['next_cursor']
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Get Venezuela entities failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,9 +2,11 @@
 Remittance comparison endpoints for RAGSearch1 API
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
 import logging
 
+from ragsearch1.executor import get_executor
 from ragsearch1.retriever import get_retriever
 from ..models import (
     CompareRequest,
@@ -36,15 +38,16 @@ async def compare_remittance_options(request: CompareRequest):
     ```
 
     Returns:
-    - List of available remittance services
+    - Remittance services the comparison is based on
     - AI-powered comparison and recommendation
     - Source citations
+    - Stage timings (retrieval, generation)
     """
     try:
         retriever = get_retriever()
 
         # Get comparison
-        comparison = retriever.compare_remittance_options(
+        comparison = await retriever.acompare_remittance_options(
             from_country=request.from_country.upper(),
             to_country=request.to_country.upper(),
             amount=request.amount
@@ -71,7 +74,8 @@ async def compare_remittance_options(request: CompareRequest):
             options=formatted_options,
             comparison=comparison.get('comparison', comparison.get('recommendation', '')),
             sources=comparison.get('sources', []),
-            total_found=comparison['total_found']
+            total_found=comparison['total_found'],
+            timings=comparison.get('timings', {})
         )
 
     except Exception as e:
@@ -140,21 +144,29 @@ async def get_supported_countries():
 
 
 @router.get("/compare/services")
-async def get_remittance_services():
+async def get_remittance_services(
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page")
+):
     """
     Get list of all remittance services in the database
 
-    Returns all known remittance and money transfer services.
+    **limit**: Maximum number of results
+    **cursor**: Pagination cursor (`next_cursor` of the previous page)
+
+    Returns all known remittance and money transfer services, one page at a time.
     """
     try:
         retriever = get_retriever()
 
-        # Search for remittance services
-        services = retriever.search(
-            query="remittance money transfer services",
-            limit=50,
-            filters={"type": "fintech"}
+        # List remittance services (metadata only, no embedding)
+        page = await get_executor("retrieval").run(
+            retriever.list_entities,
+            filters={"type": "fintech"},
+            limit=limit,
+            cursor=cursor
         )
+        services = page['entities']
 
         return {
             "services": [
@@ -167,9 +179,12 @@ async def get_remittance_services():
                 }
                 for s in services
             ],
-            "total": len(services)
+            "total": len(services),
+            "next_cursor": page['next_cursor']
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Get services failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
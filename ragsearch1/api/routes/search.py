@@ -2,14 +2,21 @@
 Search endpoints for RAGSearch1 API
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Optional
+import asyncio
+import json
 import logging
 
+from ragsearch1.executor import get_executor
+from ragsearch1.metrics import ASK_STREAMS_CANCELLED
 from ragsearch1.retriever import get_retriever
 from ..models import (
     SearchRequest,
     SearchResponse,
+    BatchSearchRequest,
+    BatchSearchResponse,
     SearchResult,
     EntityMetadata,
     AskRequest,
@@ -48,7 +55,7 @@ async def search_entities(request: SearchRequest):
         retriever = get_retriever()
 
         # Perform search
-        results = retriever.search(
+        results = await retriever.asearch(
             query=request.query,
             limit=request.limit,
             filters=request.filters
@@ -60,7 +67,8 @@ async def search_entities(request: SearchRequest):
                 id=r['id'],
                 document=r['document'],
                 metadata=EntityMetadata(**r['metadata']),
-                similarity_score=r['similarity_score']
+                similarity_score=r['similarity_score'],
+                lexical_score=r.get('lexical_score')
             )
             for r in results
         ]
@@ -77,6 +85,62 @@ async def search_entities(request: SearchRequest):
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_entities_batch(request: BatchSearchRequest):
+    """
+    Run several searches in one call
+
+    All queries are embedded in a single batch and requests sharing the
+    same filters are answered by one multi-query vector search.
+    Responses are returned in request order.
+
+    Example:
+    ```json
+    {
+        "requests": [
+            {"query": "exchanges", "limit": 5, "filters": {"country": "MX"}},
+            {"query": "casas de cambio", "limit": 5, "filters": {"country": "VE"}}
+        ]
+    }
+    ```
+    """
+    try:
+        retriever = get_retriever()
+
+        batch_results = await get_executor("retrieval").run(retriever.search_batch, [
+            {"query": r.query, "limit": r.limit, "filters": r.filters}
+            for r in request.requests
+        ])
+
+        responses = []
+        for search_request, results in zip(request.requests, batch_results):
+            formatted_results = [
+                SearchResult(
+                    id=r['id'],
+                    document=r['document'],
+                    metadata=EntityMetadata(**r['metadata']),
+                    similarity_score=r['similarity_score'],
+                    lexical_score=r.get('lexical_score')
+                )
+                for r in results
+            ]
+            responses.append(SearchResponse(
+                results=formatted_results,
+                total=len(formatted_results),
+                query=search_request.query,
+                filters=search_request.filters
+            ))
+
+        return BatchSearchResponse(
+            responses=responses,
+            total=len(responses)
+        )
+
+    except Exception as e:
+        logger.error(f"Batch search failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch search failed: {str(e)}")
+
+
 @router.post("/ask", response_model=AskResponse)
 async def ask_question(request: AskRequest):
     """
@@ -97,7 +161,7 @@ async def ask_question(request: AskRequest):
         retriever = get_retriever()
 
         # Get answer
-        response = retriever.ask(
+        response = await retriever.aask(
             question=request.question,
             context_limit=request.context_limit
         )
@@ -114,6 +178,60 @@ async def ask_question(request: AskRequest):
         raise HTTPException(status_code=500, detail=f"Question answering failed: {str(e)}")
 
 
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/ask/stream")
+async def ask_question_stream(request: AskRequest, http_request: Request):
+    """
+    Ask a question and stream the answer over Server-Sent Events
+
+    Events, in order:
+    - **sources**: retrieved source entities
+    - **token**: answer fragments as they are generated (many)
+    - **confidence**: final confidence score
+    - **error**: sent instead of the remaining events if generation fails
+
+    Generation is cancelled as soon as the client disconnects.
+    """
+    retriever = get_retriever()
+
+    async def event_stream():
+        events = retriever.astream_ask(
+            question=request.question,
+            context_limit=request.context_limit
+        )
+
+        try:
+            async for event in events:
+                if await http_request.is_disconnected():
+                    logger.info("Client disconnected, cancelling answer stream")
+                    ASK_STREAMS_CANCELLED.inc()
+                    break
+
+                yield format_sse(event["event"], event["data"])
+
+        except asyncio.CancelledError:
+            logger.info("Answer stream cancelled")
+            ASK_STREAMS_CANCELLED.inc()
+            raise
+
+        except Exception as e:
+            logger.error(f"Ask stream failed: {e}")
+            yield format_sse("error", {"detail": f"Question answering failed: {str(e)}"})
+
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/entity/{entity_id}", response_model=EntityByIdResponse)
 async def get_entity_by_id(entity_id: str):
     """
@@ -124,7 +242,7 @@ async def get_entity_by_id(entity_id: str):
     try:
         retriever = get_retriever()
 
-        entity = retriever.get_entity_by_id(entity_id)
+        entity = await get_executor("retrieval").run(retriever.get_entity_by_id, entity_id)
 
         if not entity:
             raise HTTPException(status_code=404, detail=f"Entity {entity_id} not found")
@@ -145,20 +263,26 @@ async def get_entity_by_id(entity_id: str):
 @router.get("/entities/country/{country_code}", response_model=EntityListResponse)
 async def get_entities_by_country(
     country_code: str,
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page")
 ):
     """
     Get all financial entities for a specific country
 
     **country_code**: ISO country code (e.g., 'VE', 'US', 'MX')
     **limit**: Maximum number of results
+    **cursor**: Pagination cursor (`next_cursor` of the previous page)
+
+    Entities are listed from metadata only, ordered by rating and name.
     """
     try:
         retriever = get_retriever()
 
-        entities = retriever.get_entities_by_country(
+        page = await get_executor("retrieval").run(
+            retriever.get_entities_by_country,
             country_code=country_code.upper(),
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
 
         formatted_results = [
@@ -168,15 +292,18 @@ async def get_entities_by_country(
                 metadata=EntityMetadata(**e['metadata']),
                 similarity_score=e['similarity_score']
             )
-            for e in entities
+            for e in page['entities']
         ]
 
         return EntityListResponse(
             entities=formatted_results,
             total=len(formatted_results),
-            country=country_code.upper()
+            country=country_code.upper(),
+            next_cursor=page['next_cursor']
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Get entities by country failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -185,20 +312,26 @@ async def get_entities_by_country(
 @router.get("/entities/type/{entity_type}", response_model=EntityListResponse)
 async def get_entities_by_type(
     entity_type: str,
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page")
 ):
     """
     Get all entities of a specific type
 
     **entity_type**: Type of entity (bank, exchange, fintech, casa_cambio, wallet, defi)
     **limit**: Maximum number of results
+    **cursor**: Pagination cursor (`next_cursor` of the previous page)
+
+    Entities are listed from metadata only, ordered by rating and name.
     """
     try:
         retriever = get_retriever()
 
-        entities = retriever.get_entities_by_type(
+        page = await get_executor("retrieval").run(
+            retriever.get_entities_by_type,
             entity_type=entity_type.lower(),
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
 
         formatted_results = [
@@ -208,15 +341,18 @@ async def get_entities_by_type(
                 metadata=EntityMetadata(**e['metadata']),
                 similarity_score=e['similarity_score']
             )
-            for e in entities
+            for e in page['entities']
         ]
 
         return EntityListResponse(
             entities=formatted_results,
             total=len(formatted_results),
-            type=entity_type.lower()
+            type=entity_type.lower(),
+            next_cursor=page['next_cursor']
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Get entities by type failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -235,7 +371,8 @@ async def get_similar_entities(
     try:
         retriever = get_retriever()
 
-        similar = retriever.suggest_similar(
+        similar = await get_executor("retrieval").run(
+            retriever.suggest_similar,
             entity_id=entity_id,
             limit=limit
         )
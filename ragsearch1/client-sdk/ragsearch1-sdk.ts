@@ -39,8 +39,9 @@ export interface SearchResult {
     country: string;
     api_available: boolean;
     url?: string;
+    rating?: number;
   };
-  similarity_score: number;
+  similarity_score: number | null;
 }
 
 export interface SearchResponse {
@@ -92,6 +93,7 @@ export interface CompareResponse {
   comparison: string;
   sources: Array<Record<string, any>>;
   total_found: number;
+  timings?: Record<string, number>;
 }
 
 export interface BCVRates {
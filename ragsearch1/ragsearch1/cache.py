@@ -0,0 +1,542 @@
+"""
+Caching utilities for RAGSearch1
+In-process LRU caches, Redis-backed shared result cache, semantic answer
+cache and collection version tracking for invalidation
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+import redis
+
+from .config import settings
+from .metrics import CACHE_HITS, CACHE_MISSES, CACHE_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize query text so trivially different queries share cache entries
+
+    Args:
+        text: Raw query text
+
+    Returns:
+        Case-folded text with collapsed whitespace
+    """
+    return re.sub(r'\s+', ' ', text or "").strip().casefold()
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe LRU cache with per-entry TTL
+    Hits and misses are exported to Prometheus under the cache name
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: int):
+        """
+        Initialize cache
+
+        Args:
+            name: Cache name used as metrics label
+            max_entries: Maximum number of entries before evicting the oldest
+            ttl: Entry lifetime in seconds (0 disables expiration)
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a value from the cache
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                expires_at, value = entry
+                if not expires_at or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    CACHE_HITS.labels(cache=self.name).inc()
+                    return value
+
+                del self._entries[key]
+                CACHE_ENTRIES.labels(cache=self.name).set(len(self._entries))
+
+        CACHE_MISSES.labels(cache=self.name).inc()
+        return None
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store a value in the cache, evicting least recently used entries
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            CACHE_ENTRIES.labels(cache=self.name).set(len(self._entries))
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            CACHE_ENTRIES.labels(cache=self.name).set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisConnection:
+    """
+    Lazily created Redis client shared by all caches
+    After a connection error Redis is skipped for REDIS_RETRY_INTERVAL seconds
+    so an unavailable server does not add latency to every request
+    """
+
+    def __init__(self):
+        """Initialize connection holder"""
+        self._client: Optional[redis.Redis] = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_client(self) -> Optional[redis.Redis]:
+        """
+        Get the Redis client
+
+        Returns:
+            Redis client or None while Redis is marked unavailable
+        """
+        if time.monotonic() < self._retry_at:
+            return None
+
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = redis.Redis.from_url(
+                        settings.REDIS_URL,
+                        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                    )
+
+        return self._client
+
+    def mark_unavailable(self, error: Exception):
+        """
+        Skip Redis for a while after a failure
+
+        Args:
+            error: Error raised by the Redis client
+        """
+        logger.warning(f"Redis unavailable, using in-process cache only: {error}")
+        self._retry_at = time.monotonic() + settings.REDIS_RETRY_INTERVAL
+
+
+class CollectionVersion:
+    """
+    Monotonic version counter of the vector collection
+    Every write bumps the counter; cache entries are keyed on the version they
+    were computed at, so a bump invalidates them in every worker at once.
+    The counter lives in Redis and falls back to a process-local value.
+    """
+
+    KEY = "ragsearch1:collection_version"
+
+    def __init__(self, connection: RedisConnection):
+        """
+        Initialize version counter
+
+        Args:
+            connection: Shared Redis connection
+        """
+        self.connection = connection
+        self._value = 0
+        self._checked_at = 0.0
+
+    def current(self) -> int:
+        """
+        Get the current collection version
+        The value read from Redis is reused for CACHE_VERSION_CHECK_INTERVAL seconds
+
+        Returns:
+            Collection version
+        """
+        now = time.monotonic()
+        if now - self._checked_at < settings.CACHE_VERSION_CHECK_INTERVAL:
+            return self._value
+
+        client = self.connection.get_client()
+        if client is not None:
+            try:
+                self._value = int(client.get(self.KEY) or 0)
+            except redis.RedisError as e:
+                self.connection.mark_unavailable(e)
+
+        self._checked_at = now
+        return self._value
+
+    def bump(self) -> int:
+        """
+        Increment the collection version after a write
+
+        Returns:
+            New collection version
+        """
+        client = self.connection.get_client()
+        value = None
+
+        if client is not None:
+            try:
+                value = int(client.incr(self.KEY))
+            except redis.RedisError as e:
+                self.connection.mark_unavailable(e)
+
+        self._value = value if value is not None else self._value + 1
+        self._checked_at = time.monotonic()
+        return self._value
+
+
+class ResultCache:
+    """
+    Two-tier result cache: in-process LRU in front of Redis
+    Keys combine a namespace, the collection version and a hash of the
+    request parameters, so results are shared by all API workers and dropped
+    as soon as the collection changes
+    """
+
+    def __init__(self, connection: RedisConnection, version: CollectionVersion):
+        """
+        Initialize result cache
+
+        Args:
+            connection: Shared Redis connection
+            version: Collection version counter
+        """
+        self.connection = connection
+        self.version = version
+        self.local = LRUCache(
+            name="result_local",
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            ttl=settings.CACHE_DEFAULT_TTL
+        )
+
+    def make_key(self, namespace: str, params: Dict[str, Any], version: Optional[int]) -> str:
+        """
+        Build a cache key
+
+        Args:
+            namespace: Cache namespace (e.g. 'search', 'similar')
+            params: Request parameters
+            version: Collection version, or None for entries kept valid by
+                their writer instead of dropped on every collection write
+
+        Returns:
+            Cache key string
+        """
+        digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        if version is None:
+            return f"ragsearch1:cache:{namespace}:{digest}"
+        return f"ragsearch1:cache:{namespace}:v{version}:{digest}"
+
+    def lookup(self, namespace: str, params: Dict[str, Any]) -> tuple[str, Optional[Any]]:
+        """
+        Look up a result in the local tier, then in Redis
+
+        Args:
+            namespace: Cache namespace
+            params: Request parameters identifying the result
+
+        Returns:
+            Tuple of (cache key, cached value or None). The key must be passed
+            to store() so the result is saved under the version read here.
+        """
+        # The version is read before computing, so a write that lands while
+        # computing leaves the result under the old (already stale) version
+        key = self.make_key(namespace, params, self.version.current())
+
+        value = self.local.get(key)
+        if value is not None:
+            return key, value
+
+        client = self.connection.get_client()
+        if client is not None:
+            try:
+                raw = client.get(key)
+                if raw is not None:
+                    CACHE_HITS.labels(cache="result_redis").inc()
+                    value = json.loads(raw)
+                    self.local.set(key, value)
+                    return key, value
+                CACHE_MISSES.labels(cache="result_redis").inc()
+            except redis.RedisError as e:
+                self.connection.mark_unavailable(e)
+
+        return key, None
+
+    def store(self, key: str, value: Any, ttl: Optional[int] = None, local: bool = True):
+        """
+        Store a result in both tiers
+
+        Args:
+            key: Cache key returned by lookup()
+            value: JSON-serializable result
+            ttl: Optional TTL override in seconds
+            local: Also keep the result in the in-process tier (disable for
+                bulk warm-ups that would flush the local LRU)
+        """
+        if local:
+            self.local.set(key, value)
+
+        client = self.connection.get_client()
+        if client is not None:
+            try:
+                client.set(
+                    key,
+                    json.dumps(value, default=str),
+                    ex=ttl or settings.CACHE_DEFAULT_TTL
+                )
+            except redis.RedisError as e:
+                self.connection.mark_unavailable(e)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Read several entries from Redis in one round trip (no local tier)
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dict of key to value, for the keys found
+        """
+        client = self.connection.get_client()
+        if client is None or not keys:
+            return {}
+
+        try:
+            raw_values = client.mget(keys)
+        except redis.RedisError as e:
+            self.connection.mark_unavailable(e)
+            return {}
+
+        return {key: json.loads(raw) for key, raw in zip(keys, raw_values) if raw is not None}
+
+    def store_many(self, values: Dict[str, Any], ttl: Optional[int] = None):
+        """
+        Write several entries to Redis in one pipelined round trip (no local
+        tier: meant for bulk warm-ups)
+
+        Args:
+            values: Dict of key to JSON-serializable value
+            ttl: Optional TTL override in seconds
+        """
+        client = self.connection.get_client()
+        if client is None or not values:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.set(key, json.dumps(value, default=str), ex=ttl or settings.CACHE_DEFAULT_TTL)
+            pipe.execute()
+        except redis.RedisError as e:
+            self.connection.mark_unavailable(e)
+
+    def delete_many(self, keys: List[str]):
+        """
+        Delete entries from Redis (entries written by store_many())
+
+        Args:
+            keys: Cache keys
+        """
+        client = self.connection.get_client()
+        if client is None or not keys:
+            return
+
+        try:
+            client.delete(*keys)
+        except redis.RedisError as e:
+            self.connection.mark_unavailable(e)
+
+    def get_or_compute(
+        self,
+        namespace: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Return a cached result or compute and store it
+
+        Args:
+            namespace: Cache namespace
+            params: Request parameters identifying the result
+            compute: Function producing the result on a miss
+            ttl: Optional TTL override in seconds
+
+        Returns:
+            Cached or freshly computed result
+        """
+        key, value = self.lookup(namespace, params)
+        if value is not None:
+            return value
+
+        value = compute()
+        self.store(key, value, ttl=ttl)
+        return value
+
+
+class SemanticCache:
+    """
+    In-memory semantic cache for LLM answers
+    Stores (question embedding, answer) pairs and returns a cached answer when
+    a new question is within a cosine distance of a stored one. Lookups are a
+    single NumPy matrix-vector product over the normalized embeddings.
+    Entries are only returned for the scope and collection version they were
+    computed at; when full, stale entries are evicted first, then the least
+    recently used.
+    """
+
+    def __init__(self, name: str, max_entries: int, max_distance: float):
+        """
+        Initialize cache
+
+        Args:
+            name: Cache name used as metrics label
+            max_entries: Maximum number of stored answers
+            max_distance: Maximum cosine distance for a hit
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._vectors: Optional[np.ndarray] = None   # Allocated on first insert
+        self._values: list = [None] * max_entries
+        self._scopes = np.empty(max_entries, dtype=object)
+        self._versions = np.full(max_entries, -1, dtype=np.int64)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._size = 0
+        self._tick = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, embedding, scope: str, version: int) -> Optional[Any]:
+        """
+        Find a cached answer for a semantically close question
+
+        Args:
+            embedding: Question embedding
+            scope: Scope the answer must belong to (e.g. 'ask:5')
+            version: Current collection version
+
+        Returns:
+            Cached answer or None
+        """
+        query = self._normalize(embedding)
+
+        with self._lock:
+            if self._size and self._vectors is not None and self._vectors.shape[1] == query.shape[0]:
+                n = self._size
+                similarities = self._vectors[:n] @ query
+                valid = (self._versions[:n] == version) & (self._scopes[:n] == scope)
+                similarities = np.where(valid, similarities, -np.inf)
+                best = int(np.argmax(similarities))
+
+                if 1.0 - similarities[best] <= self.max_distance:
+                    self._tick += 1
+                    self._last_used[best] = self._tick
+                    CACHE_HITS.labels(cache=self.name).inc()
+                    return self._values[best]
+
+        CACHE_MISSES.labels(cache=self.name).inc()
+        return None
+
+    def set(self, embedding, scope: str, version: int, value: Any):
+        """
+        Store an answer
+
+        Args:
+            embedding: Question embedding
+            scope: Scope of the answer
+            version: Collection version the answer was computed at
+            value: Answer to store
+        """
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                # First insert, or the embedding model changed
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._versions[:] = -1
+                self._size = 0
+
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                stale = np.flatnonzero(self._versions != version)
+                slot = int(stale[0]) if stale.size else int(np.argmin(self._last_used))
+
+            self._tick += 1
+            self._vectors[slot] = vector
+            self._values[slot] = value
+            self._scopes[slot] = scope
+            self._versions[slot] = version
+            self._last_used[slot] = self._tick
+
+            CACHE_ENTRIES.labels(cache=self.name).set(self._size)
+
+
+# Global cache instances
+redis_connection = RedisConnection()
+collection_version = CollectionVersion(redis_connection)
+result_cache = ResultCache(redis_connection, collection_version)
+answer_cache = SemanticCache(
+    name="semantic_answer",
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+    max_distance=settings.SEMANTIC_CACHE_MAX_DISTANCE
+)
+
+
+def get_collection_version() -> CollectionVersion:
+    """Get global collection version counter"""
+    return collection_version
+
+
+def get_result_cache() -> ResultCache:
+    """Get global result cache instance"""
+    return result_cache
+
+
+def get_answer_cache() -> SemanticCache:
+    """Get global semantic answer cache instance"""
+    return answer_cache
@@ -8,7 +8,7 @@ Collects financial entity data from multiple sources:
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Optional
 import asyncio
 import aiohttp
 from datetime import datetime
@@ -26,6 +26,7 @@ class DataCollector:
     def __init__(self):
         """Initialize collector"""
         self.collected_entities = []
+        self.last_collected = 0  # Entities in the latest full collection (list or stream)
         self.sources_status = {}
 
     async def collect_all(self) -> List[Dict[str, Any]]:
@@ -35,38 +36,119 @@ class DataCollector:
         Returns:
             List of collected entities
         """
-        tasks = []
+        all_entities = []
+        async for batch in self.stream_all():
+            all_entities.extend(batch)
+
+        self.collected_entities = all_entities
+        logger.info(f"Collected {len(all_entities)} total entities")
+
+        return all_entities
+
+    def enabled_sources(self) -> Dict[str, Callable[[], AsyncIterator[Dict[str, Any]]]]:
+        """
+        Entity streams of the sources enabled in settings
+
+        Returns:
+            Dict of source name to async generator function
+        """
+        sources = {}
 
         # Banking sources
         if settings.PLAID_CLIENT_ID and settings.PLAID_SECRET:
-            tasks.append(self.collect_plaid_institutions())
+            sources["plaid"] = self.iter_plaid_institutions
 
         if settings.BELVO_SECRET_ID and settings.BELVO_SECRET_PASSWORD:
-            tasks.append(self.collect_belvo_institutions())
+            sources["belvo"] = lambda: self._iter_collected(self.collect_belvo_institutions)
 
         # Crypto sources
         if settings.CCXT_ENABLE:
-            tasks.append(self.collect_crypto_exchanges())
+            sources["ccxt"] = self.iter_crypto_exchanges
 
         # Scraping sources
         if settings.BCV_SCRAPER_ENABLE:
-            tasks.append(self.collect_venezuela_entities())
+            sources["venezuela"] = lambda: self._iter_collected(self.collect_venezuela_entities)
 
-        # Execute all collection tasks in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return sources
 
-        # Combine all results
-        all_entities = []
-        for result in results:
-            if isinstance(result, list):
-                all_entities.extend(result)
-            elif isinstance(result, Exception):
-                logger.error(f"Collection task failed: {result}")
+    async def stream_all(
+        self,
+        sources: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+        failed: Optional[set] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Collect from enabled sources concurrently, yielding entity batches as
+        they arrive instead of one list at the end
+        Sources write into a bounded buffer: they pause while the consumer is busy
+
+        Args:
+            sources: Source names to collect (default: all enabled)
+            batch_size: Entities per batch (default: PIPELINE_COLLECT_BATCH_SIZE)
+            failed: Optional set receiving the names of sources that failed
+                (their entities may be missing or incomplete)
+
+        Yields:
+            Lists of entities, each tagged with its source name under "source"
+        """
+        batch_size = batch_size or settings.PIPELINE_COLLECT_BATCH_SIZE
+        streams = {
+            name: stream for name, stream in self.enabled_sources().items()
+            if sources is None or name in sources
+        }
 
-        self.collected_entities = all_entities
-        logger.info(f"Collected {len(all_entities)} total entities")
+        done = object()
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=batch_size)
+        semaphore = asyncio.Semaphore(settings.PIPELINE_COLLECT_CONCURRENCY)
 
-        return all_entities
+        async def drain(name: str, stream: Callable[[], AsyncIterator[Dict[str, Any]]]):
+            async with semaphore:
+                try:
+                    async for entity in stream():
+                        # Decides which version of an ID several sources return is kept
+                        entity["source"] = name
+                        await buffer.put(entity)
+                except Exception as e:
+                    logger.error(f"Collection task {name} failed: {e}")
+                    if failed is not None:
+                        failed.add(name)
+
+        async def produce():
+            await asyncio.gather(*(drain(name, stream) for name, stream in streams.items()))
+            await buffer.put(done)
+
+        producer = asyncio.ensure_future(produce())
+        total = 0
+        try:
+            batch = []
+            while True:
+                entity = await buffer.get()
+                if entity is done:
+                    break
+                batch.append(entity)
+                if len(batch) >= batch_size:
+                    total += len(batch)
+                    yield batch
+                    batch = []
+
+            if batch:
+                total += len(batch)
+                yield batch
+
+            if sources is None:
+                self.last_collected = total
+            logger.info(f"Streamed {total} entities from {', '.join(streams) or 'no sources'}")
+
+        finally:
+            producer.cancel()
+
+    @staticmethod
+    async def _iter_collected(
+        collect: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a source that only returns a complete list"""
+        for entity in await collect():
+            yield entity
 
     async def collect_plaid_institutions(self) -> List[Dict[str, Any]]:
         """
@@ -75,31 +157,49 @@ class DataCollector:
         Returns:
             List of bank entities
         """
+        return [entity async for entity in self.iter_plaid_institutions()]
+
+    async def iter_plaid_institutions(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream institutions from Plaid API, page by page
+
+        Yields:
+            Bank entities
+        """
         try:
             # Note: This is a simplified version
             # Full implementation would use plaid-python SDK
             logger.info("Collecting Plaid institutions...")
 
-            entities = []
+            count = 0
 
             # Example: Plaid supports 11,000+ institutions
-            # We would fetch and format them here
-            # For now, returning placeholder structure
+            # We would fetch, format and yield them one page at a time, so
+            # the whole catalog is never held in memory
+            # For now, no pages are fetched
+            pages: List[List[Dict[str, Any]]] = []
 
             # In production, this would be:
             # from plaid.api import plaid_api
             # client = plaid_api.PlaidApi(plaid.ApiClient(configuration))
-            # response = client.institutions_get(request)
+            # offset = 0
+            # while offset < total:
+            #     response = client.institutions_get(request)  # count=500, offset=offset
+            #     offset += len(response.institutions)
+            #     ...yield each formatted institution
 
-            self.sources_status["plaid"] = "success"
-            logger.info(f"Collected {len(entities)} Plaid institutions")
+            for page in pages:
+                for entity in page:
+                    count += 1
+                    yield entity
 
-            return entities
+            self.sources_status["plaid"] = "success"
+            logger.info(f"Collected {count} Plaid institutions")
 
         except Exception as e:
             logger.error(f"Plaid collection failed: {e}")
             self.sources_status["plaid"] = f"error: {str(e)}"
-            return []
+            raise
 
     async def collect_belvo_institutions(self) -> List[Dict[str, Any]]:
         """
@@ -140,7 +240,7 @@ class DataCollector:
         except Exception as e:
             logger.error(f"Belvo collection failed: {e}")
             self.sources_status["belvo"] = f"error: {str(e)}"
-            return []
+            raise
 
     async def collect_crypto_exchanges(self) -> List[Dict[str, Any]]:
         """
@@ -149,12 +249,22 @@ class DataCollector:
         Returns:
             List of exchange entities
         """
+        return [entity async for entity in self.iter_crypto_exchanges()]
+
+    async def iter_crypto_exchanges(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream crypto exchanges from ccxt as each one loads
+
+        Yields:
+            Exchange entities
+        """
         try:
             import ccxt
 
             logger.info("Collecting crypto exchanges...")
 
-            entities = []
+            count = 0
+            failed = []
 
             # Get list of exchanges to collect
             exchanges_to_collect = settings.CCXT_EXCHANGES_LIST
@@ -188,23 +298,28 @@ class DataCollector:
                         }
                     }
 
-                    entities.append(entity)
                     logger.info(f"Collected {exchange.name}")
 
                     await exchange.close()
 
+                    count += 1
+                    yield entity
+
                 except Exception as e:
                     logger.warning(f"Failed to collect {exchange_id}: {e}")
+                    failed.append(exchange_id)
 
-            self.sources_status["ccxt"] = "success"
-            logger.info(f"Collected {len(entities)} crypto exchanges")
+            if failed:
+                # The others were yielded, but the run is incomplete
+                raise RuntimeError(f"failed to collect {', '.join(failed)}")
 
-            return entities
+            self.sources_status["ccxt"] = "success"
+            logger.info(f"Collected {count} crypto exchanges")
 
         except Exception as e:
             logger.error(f"Crypto exchanges collection failed: {e}")
             self.sources_status["ccxt"] = f"error: {str(e)}"
-            return []
+            raise
 
     async def collect_venezuela_entities(self) -> List[Dict[str, Any]]:
         """
@@ -289,7 +404,7 @@ class DataCollector:
         except Exception as e:
             logger.error(f"Venezuela entities collection failed: {e}")
             self.sources_status["venezuela"] = f"error: {str(e)}"
-            return []
+            raise
 
     async def collect_remittance_services(self) -> List[Dict[str, Any]]:
         """
@@ -372,7 +487,7 @@ class DataCollector:
         except Exception as e:
             logger.error(f"Remittance collection failed: {e}")
             self.sources_status["remittance"] = f"error: {str(e)}"
-            return []
+            raise
 
     def get_collection_status(self) -> Dict[str, Any]:
         """
@@ -382,7 +497,7 @@ class DataCollector:
             Dict with source statuses
         """
         return {
-            "total_entities": len(self.collected_entities),
+            "total_entities": self.last_collected,
             "sources": self.sources_status,
             "last_collection": datetime.now().isoformat(),
         }
@@ -47,6 +47,8 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: Optional[str] = None
     REDIS_DB: int = 0
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_RETRY_INTERVAL: int = 30
     CACHE_TTL: int = 3600
 
     # ChromaDB
@@ -54,6 +56,17 @@ class Settings(BaseSettings):
     CHROMA_PORT: int = 8001
     CHROMA_PERSIST_DIR: str = "/data/chromadb"
 
+    # Vector backend: "chroma" or "local" (exact kNN over a memory-mapped matrix)
+    VECTOR_BACKEND: str = "chroma"
+    LOCAL_VECTOR_DIR: str = "/data/vectors"
+    LOCAL_VECTOR_QUANTIZATION: str = "none"   # none | float16 | int8 (search matrix in memory)
+    LOCAL_VECTOR_RESCORE_FACTOR: int = 4      # Shortlist of k * factor rescored at float32
+
+    # PCA projection: search a reduced-dimension copy of the collection
+    PROJECTION_ENABLE: bool = False           # Requires scripts/pca_projection.py fit
+    PROJECTION_COMPONENTS: int = 256
+    PROJECTION_DIR: Optional[str] = None      # Defaults to the vector backend's data directory
+
     # ====================
     # AI/ML SETTINGS
     # ====================
@@ -65,6 +78,22 @@ class Settings(BaseSettings):
     OPENAI_MAX_TOKENS: int = 4000
     OPENAI_TEMPERATURE: float = 0.7
 
+    # Embeddings: "openai" or "local" (sentence-transformers on CPU)
+    EMBEDDING_PROVIDER: str = "openai"
+    LOCAL_EMBEDDING_MODEL: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    EMBEDDING_THREADS: int = 4                # Torch threads for local inference
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_BATCH_WAIT_MS: int = 5          # Query batching window
+
+    # OpenAI embedding requests (limits apply per process)
+    EMBEDDING_BATCH_TOKENS: int = 100000      # Tokens per request
+    EMBEDDING_CONCURRENCY: int = 4            # Concurrent requests per async run
+    EMBEDDING_REQUESTS_PER_MINUTE: int = 3000
+    EMBEDDING_TOKENS_PER_MINUTE: int = 1000000
+    EMBEDDING_MAX_RETRIES: int = 6            # On 429, timeouts and 5xx
+    EMBEDDING_BACKOFF_BASE: float = 1.0       # Seconds, doubled per retry (with jitter)
+    EMBEDDING_BACKOFF_MAX: float = 60.0
+
     # Langchain
     LANGCHAIN_TRACING_V2: bool = False
     LANGCHAIN_API_KEY: Optional[str] = None
@@ -147,7 +176,33 @@ class Settings(BaseSettings):
 
     SCHEDULER_ENABLE: bool = True
     SCHEDULER_TIMEZONE: str = "America/Caracas"
-    MAX_CONCURRENT_TASKS: int = 5
+    SCHEDULER_IN_API: bool = True             # False: only `python -m ragsearch1.worker` runs jobs
+    SCHEDULER_LEADER_BACKEND: str = "redis"   # redis | file | none (every process runs jobs)
+    SCHEDULER_LEASE_TTL: int = 30             # Seconds before a dead leader's lease expires
+    SCHEDULER_LEASE_RENEW_INTERVAL: float = 10.0
+    SCHEDULER_LEASE_REDIS_TIMEOUT: float = 2.0  # Lease client timeout (separate from the caches')
+    SCHEDULER_LOCK_DIR: str = "/data"         # Lock files for the file backend
+    SCHEDULER_RUN_REQUEST_INTERVAL: int = 5   # Seconds between checks for manual run requests
+    WORKER_METRICS_PORT: int = 9100           # Prometheus port of the standalone worker
+    MAX_CONCURRENT_TASKS: int = 5             # Scheduled jobs running at once
+    SCHEDULER_JOB_JITTER: int = 30            # Seconds of random delay per run
+    SCHEDULER_MISFIRE_GRACE_TIME: int = 300   # Late runs within this window still run (once)
+
+    # Incremental ingest: documents are diffed by content hash
+    INGEST_REMOVE_MISSING: bool = True        # Delete documents a job no longer collects
+    INGEST_MAX_REMOVED_RATIO: float = 0.5     # Skip removal above this share of the job's documents
+    INGEST_SOURCE_PRIORITY: str = "venezuela,plaid,belvo,ccxt"  # Source kept when several return an ID
+
+    # Streaming ingest: collect → normalize → embed → upsert, bounded queues between stages
+    PIPELINE_QUEUE_SIZE: int = 4              # Batches buffered in front of each stage
+    PIPELINE_COLLECT_BATCH_SIZE: int = 500    # Entities per collected batch
+    PIPELINE_COLLECT_CONCURRENCY: int = 4     # Sources collected at once
+    PIPELINE_NORMALIZE_BATCH_SIZE: int = 500
+    PIPELINE_NORMALIZE_CONCURRENCY: int = 2
+    PIPELINE_EMBED_BATCH_SIZE: int = 256
+    PIPELINE_EMBED_CONCURRENCY: int = 2
+    PIPELINE_UPSERT_BATCH_SIZE: int = 500
+    PIPELINE_UPSERT_CONCURRENCY: int = 1
 
     # ====================
     # MONITORING
@@ -189,9 +244,41 @@ class Settings(BaseSettings):
     API_REQUEST_TIMEOUT: int = 60
     SCRAPER_TIMEOUT: int = 30
 
+    RETRIEVAL_POOL_SIZE: int = 16             # Threads for blocking retrieval work
+    VECTORDB_POOL_SIZE: int = 8               # Threads for vector DB calls
+    VECTORDB_UPSERT_CHUNK_SIZE: int = 500     # Documents per bulk upsert chunk
+    LISTING_ORDER_CACHE_SIZE: int = 64        # Listing filters whose sort order is kept per version
+    INGEST_POOL_SIZE: int = 2                 # Threads for ingest reads and writes
+    INGEST_PROCESSES: int = 2                 # Processes normalizing entities (0: use threads)
+    INGEST_PROCESS_MIN_ENTITIES: int = 500    # Smaller batches are normalized in a thread
+    LOOP_LAG_INTERVAL: float = 0.5            # Seconds between event loop lag samples (0: off)
+    LLM_MAX_CONCURRENCY: int = 16             # Concurrent LLM calls per worker
+
     CACHE_ENABLE: bool = True
     CACHE_DEFAULT_TTL: int = 3600
     CACHE_MAX_ENTRIES: int = 10000
+    CACHE_VERSION_CHECK_INTERVAL: float = 1.0
+
+    EMBEDDING_CACHE_ENABLE: bool = True
+    EMBEDDING_CACHE_TTL: int = 86400          # 24 hours
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 5000
+
+    EMBEDDING_STORE_ENABLE: bool = True       # Persistent embeddings shared by workers
+    EMBEDDING_STORE_PATH: str = "/data/embeddings.sqlite3"
+    EMBEDDING_STORE_MAX_MB: int = 512         # LRU eviction above this size
+
+    SINGLEFLIGHT_ENABLE: bool = True          # Coalesce identical in-flight requests
+    SINGLEFLIGHT_SEARCH_TIMEOUT: float = 10.0
+    SINGLEFLIGHT_ASK_TIMEOUT: float = 60.0
+
+    SEMANTIC_CACHE_ENABLE: bool = True
+    SEMANTIC_CACHE_MAX_DISTANCE: float = 0.05  # Cosine distance
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 2000
+
+    SIMILAR_PRECOMPUTE_ENABLE: bool = True    # Precompute /similar after each ingest
+    SIMILAR_PRECOMPUTE_K: int = 20
+    SIMILAR_PRECOMPUTE_BATCH_SIZE: int = 100
+    SIMILAR_PRECOMPUTE_TTL: int = 172800      # 48 hours (outlives the daily full rebuild)
 
     # ====================
     # DATA COLLECTION
@@ -218,7 +305,7 @@ class Settings(BaseSettings):
     # ADVANCED
     # ====================
 
-    VECTOR_DIMENSION: int = 1536  # OpenAI ada-002
+    VECTOR_DIMENSION: Optional[int] = None  # Defaults to the embedding provider's dimension
     VECTOR_METRIC: str = "cosine"
     CHUNK_SIZE: int = 500
     CHUNK_OVERLAP: int = 50
@@ -227,9 +314,22 @@ class Settings(BaseSettings):
     MAX_SEARCH_LIMIT: int = 100
     MIN_SIMILARITY_SCORE: float = 0.7
 
+    HYBRID_SEARCH_ENABLE: bool = True         # Fuse BM25 and vector results
+    HYBRID_SHORTCUT_ENABLE: bool = True       # Serve exact-name queries lexically
+    HYBRID_RRF_K: int = 60                    # Reciprocal rank fusion constant
+    HYBRID_CANDIDATES: int = 20               # Results per ranker before fusion
+    HYBRID_INDEX_REBUILD_INTERVAL: int = 30   # Seconds between lexical index rebuilds
+
     RAG_RETRIEVAL_K: int = 5
     RAG_RERANK: bool = True
-    RAG_CONTEXT_WINDOW: int = 4000
+    RAG_CONTEXT_WINDOW: int = 4000            # Token budget for prompt context
+    RAG_CONTEXT_SOURCE_TOKENS: int = 400      # Token limit per context source
+
+    RERANK_MODEL: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"  # Multilingual
+    RERANK_CANDIDATES: int = 20               # Candidates scored per search
+    RERANK_BATCH_SIZE: int = 16
+    RERANK_BUDGET_MS: int = 150               # Keep retrieval order when exceeded
+    RERANK_CONTEXT_LIMIT: int = 3             # Context documents sent to the LLM once reranked
 
     # ====================
     # COMPUTED PROPERTIES
@@ -272,6 +372,11 @@ class Settings(BaseSettings):
         """CCXT exchanges as list"""
         return [exchange.strip() for exchange in self.CCXT_EXCHANGES.split(",")]
 
+    @property
+    def INGEST_SOURCE_PRIORITY_LIST(self) -> List[str]:
+        """Collector sources, preferred first, as list"""
+        return [source.strip() for source in self.INGEST_SOURCE_PRIORITY.split(",")]
+
     class Config:
         env_file = ".env"
         case_sensitive = True
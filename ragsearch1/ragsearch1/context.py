@@ -0,0 +1,156 @@
+"""
+Context Packing for RAGSearch1
+Fits retrieved documents into the RAG prompt under a token budget
+"""
+
+import logging
+import threading
+from typing import List, Dict, Any, Optional
+
+import tiktoken
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ContextPacker:
+    """
+    Token-budgeted context packer
+
+    Documents are added in ranking order until the budget is spent. Each source
+    is truncated to a per-source limit, exact duplicate documents are skipped,
+    and 'Field: value' lines shared by every source are written once.
+    """
+
+    # Smallest remainder worth filling with a truncated source
+    MIN_SOURCE_TOKENS = 32
+
+    def __init__(self, model: str, budget: int, max_source_tokens: int):
+        """
+        Initialize packer
+
+        Args:
+            model: Model name used to pick the tokenizer
+            budget: Token budget for the whole context section
+            max_source_tokens: Token limit per source
+        """
+        self.model = model
+        self.budget = budget
+        self.max_source_tokens = max_source_tokens
+        self._encoding = None
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self) -> "tiktoken.Encoding":
+        """Tokenizer for the configured model (loaded on first use)"""
+        if self._encoding is None:
+            with self._lock:
+                if self._encoding is None:
+                    try:
+                        self._encoding = tiktoken.encoding_for_model(self.model)
+                    except KeyError:
+                        self._encoding = tiktoken.get_encoding("cl100k_base")
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text"""
+        return len(self.encoding.encode(text or ""))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens tokens"""
+        tokens = self.encoding.encode(text or "")
+        if len(tokens) <= max_tokens:
+            return text
+        return self.encoding.decode(tokens[:max_tokens]).rstrip() + " ..."
+
+    def pack(self, docs: List[Dict[str, Any]], budget: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Pack documents into context text
+
+        Args:
+            docs: Retrieved documents, best first
+            budget: Optional override of the token budget
+
+        Returns:
+            Dict with context text, the sources it contains and its token count
+        """
+        budget = budget or self.budget
+
+        # Skip exact duplicates, keeping the better-ranked copy
+        unique, seen = [], set()
+        for doc in docs:
+            key = (doc.get("document") or "").strip()
+            if key not in seen:
+                seen.add(key)
+                unique.append(doc)
+
+        shared = self._shared_lines(unique)
+        header = ""
+        if shared:
+            header = "Shared by all sources:\n" + "\n".join(shared) + "\n\n"
+
+        parts = [header] if header else []
+        used = self.count(header)
+        sources: List[Dict[str, Any]] = []
+
+        for doc in unique:
+            lines = [
+                line for line in (doc.get("document") or "").splitlines()
+                if line.strip() and line.strip() not in shared
+            ]
+            body = self.truncate("\n".join(lines), self.max_source_tokens)
+            block = f"Source {len(sources) + 1}:\n{body}"
+            cost = self.count(block) + 1
+
+            if used + cost > budget:
+                remaining = budget - used
+                if remaining >= self.MIN_SOURCE_TOKENS or not sources:
+                    block = self.truncate(block, max(remaining, 1))
+                    parts.append(block)
+                    sources.append(doc)
+                    used += self.count(block)
+                break
+
+            parts.append(block)
+            sources.append(doc)
+            used += cost
+
+        if len(sources) < len(unique):
+            logger.info(f"Context packed {len(sources)}/{len(unique)} sources in {used} tokens")
+
+        return {
+            "text": "\n\n".join(part.rstrip("\n") for part in parts),
+            "sources": sources,
+            "tokens": used,
+        }
+
+    def _shared_lines(self, docs: List[Dict[str, Any]]) -> List[str]:
+        """'Field: value' lines present in every document (only with 2+ documents)"""
+        if len(docs) < 2:
+            return []
+
+        line_sets = [
+            {line.strip() for line in (doc.get("document") or "").splitlines() if ":" in line}
+            for doc in docs
+        ]
+        common = set.intersection(*line_sets)
+
+        # Keep the order in which they appear in the first document
+        return [
+            line.strip() for line in (docs[0].get("document") or "").splitlines()
+            if line.strip() in common
+        ]
+
+
+# Global context packer instance
+context_packer = ContextPacker(
+    model=settings.OPENAI_MODEL,
+    budget=settings.RAG_CONTEXT_WINDOW,
+    max_source_tokens=settings.RAG_CONTEXT_SOURCE_TOKENS
+)
+
+
+def get_context_packer() -> ContextPacker:
+    """Get global context packer instance"""
+    return context_packer
@@ -0,0 +1,338 @@
+"""
+Embedding Providers for RAGSearch1
+OpenAI API or local sentence-transformers inference on CPU,
+selected with EMBEDDING_PROVIDER
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+from openai import AsyncOpenAI, OpenAI
+
+from .config import settings
+from .embeddingstore import EmbeddingStore
+from .embedpipeline import EmbeddingPipeline
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingProvider:
+    """
+    Interface shared by embedding backends
+    Vectors from different providers (or models) are not comparable, so a
+    collection must be re-ingested after switching
+    """
+
+    name = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    @property
+    def dimension(self) -> int:
+        """Embedding vector size"""
+        raise NotImplementedError
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents (ingestion)"""
+        raise NotImplementedError
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed one search query"""
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Async variant of embed_documents()"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Async variant of embed_query()"""
+        return (await self.aembed_documents([text]))[0]
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """
+    OpenAI embeddings API
+    Requests go through an EmbeddingPipeline: token-sized batches, rate
+    limits, retries, and concurrent batches for async callers
+    """
+
+    name = "openai"
+
+    # OpenAI has a limit of 2048 texts per request
+    BATCH_SIZE = 2048
+
+    # Longest input accepted by the embedding models
+    MAX_INPUT_TOKENS = 8191
+
+    DIMENSIONS = {
+        "text-embedding-ada-002": 1536,
+        "text-embedding-3-small": 1536,
+        "text-embedding-3-large": 3072,
+    }
+
+    def __init__(self, model: str, api_key: str):
+        super().__init__(model)
+        self.client = OpenAI(api_key=api_key)
+        self.async_client = AsyncOpenAI(api_key=api_key)
+        self._dimension: Optional[int] = self.DIMENSIONS.get(model)
+        self.pipeline = EmbeddingPipeline(
+            self.client,
+            self.async_client,
+            model,
+            max_batch_tokens=settings.EMBEDDING_BATCH_TOKENS,
+            max_batch_size=self.BATCH_SIZE,
+            max_input_tokens=self.MAX_INPUT_TOKENS,
+            concurrency=settings.EMBEDDING_CONCURRENCY,
+            requests_per_minute=settings.EMBEDDING_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.EMBEDDING_TOKENS_PER_MINUTE,
+            max_retries=settings.EMBEDDING_MAX_RETRIES,
+            backoff_base=settings.EMBEDDING_BACKOFF_BASE,
+            backoff_max=settings.EMBEDDING_BACKOFF_MAX
+        )
+
+    @property
+    def dimension(self) -> int:
+        if self._dimension is None:
+            self._dimension = len(self.embed_query("dimension probe"))
+        return self._dimension
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.pipeline.embed(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.pipeline.aembed(texts)
+
+
+class DynamicBatcher:
+    """
+    Groups concurrent single-text requests into batches for one model call
+    A batch is sent when it reaches max_batch_size or max_wait_ms after its
+    first request, whichever comes first
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], List[List[float]]],
+        max_batch_size: int,
+        max_wait_ms: int
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            encode: Function embedding a list of texts
+            max_batch_size: Largest batch sent to the model
+            max_wait_ms: Longest a request waits for others to join its batch
+        """
+        self.encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: "queue.Queue[tuple[str, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="ragsearch1-embed-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text; the future resolves to its embedding"""
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                vectors = self.encode([text for text, _ in batch])
+                for (_, future), vector in zip(batch, vectors):
+                    future.set_result(vector)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    sentence-transformers model on CPU
+    Documents are encoded in fixed-size batches; queries go through a
+    dynamic batcher so concurrent requests share model calls
+    """
+
+    name = "local"
+
+    def __init__(self, model: str, threads: int, batch_size: int, max_wait_ms: int):
+        """
+        Initialize provider (the model loads on first use)
+
+        Args:
+            model: sentence-transformers model name
+            threads: Torch intra-op threads
+            batch_size: Texts per model call
+            max_wait_ms: Query batching window
+        """
+        super().__init__(model)
+        self.threads = threads
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self._model = None
+        self._batcher: Optional[DynamicBatcher] = None
+        self._lock = threading.Lock()
+
+    @property
+    def dimension(self) -> int:
+        return self._get_model().get_sentence_embedding_dimension()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._get_batcher().submit(text).result()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await asyncio.wrap_future(self._get_batcher().submit(text))
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self._get_model().encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ).tolist()
+
+    def _get_batcher(self) -> DynamicBatcher:
+        if self._batcher is None:
+            with self._lock:
+                if self._batcher is None:
+                    self._batcher = DynamicBatcher(self._encode, self.batch_size, self.max_wait_ms)
+        return self._batcher
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import torch
+                    from sentence_transformers import SentenceTransformer
+
+                    torch.set_num_threads(self.threads)
+                    self._model = SentenceTransformer(self.model, device="cpu")
+                    logger.info(f"Loaded local embedding model {self.model} ({self.threads} threads)")
+        return self._model
+
+
+class StoredEmbeddingProvider(EmbeddingProvider):
+    """
+    Reads through a persistent embedding store
+    Only texts missing from the store reach the wrapped provider, so a
+    re-ingest after a restart costs almost no embedding calls
+    """
+
+    def __init__(self, provider: EmbeddingProvider, store: EmbeddingStore):
+        """
+        Initialize provider
+
+        Args:
+            provider: Provider computing missing embeddings
+            store: Persistent embedding store
+        """
+        super().__init__(provider.model)
+        self.name = provider.name
+        self.provider = provider
+        self.store = store
+
+    @property
+    def dimension(self) -> int:
+        return self.provider.dimension
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        found = self.store.get_many(self.model, texts)
+        missing = [text for text in dict.fromkeys(texts) if text not in found]
+
+        if missing:
+            computed = dict(zip(missing, self.provider.embed_documents(missing)))
+            self.store.set_many(self.model, computed)
+            found.update(computed)
+
+        return [found[text] for text in texts]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Bulk store reads and writes (ingest) run off the event loop
+        loop = asyncio.get_running_loop()
+        found = await loop.run_in_executor(None, self.store.get_many, self.model, texts)
+        missing = [text for text in dict.fromkeys(texts) if text not in found]
+
+        if missing:
+            computed = dict(zip(missing, await self.provider.aembed_documents(missing)))
+            await loop.run_in_executor(None, self.store.set_many, self.model, computed)
+            found.update(computed)
+
+        return [found[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        found = self.store.get_many(self.model, [text])
+        if text not in found:
+            found[text] = self.provider.embed_query(text)
+            self.store.set_many(self.model, found)
+        return found[text]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        # SQLite calls block: keep them off the event loop serving requests
+        loop = asyncio.get_running_loop()
+        found = await loop.run_in_executor(None, self.store.get_many, self.model, [text])
+        if text not in found:
+            found[text] = await self.provider.aembed_query(text)
+            await loop.run_in_executor(None, self.store.set_many, self.model, found)
+        return found[text]
+
+
+def create_embedding_provider() -> EmbeddingProvider:
+    """Build the provider selected by EMBEDDING_PROVIDER, behind the embedding store if enabled"""
+    if settings.EMBEDDING_PROVIDER == "local":
+        provider = LocalEmbeddingProvider(
+            model=settings.LOCAL_EMBEDDING_MODEL,
+            threads=settings.EMBEDDING_THREADS,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS
+        )
+    else:
+        provider = OpenAIEmbeddingProvider(
+            model=settings.OPENAI_EMBEDDING_MODEL,
+            api_key=settings.OPENAI_API_KEY
+        )
+
+    if settings.EMBEDDING_STORE_ENABLE:
+        store = EmbeddingStore(settings.EMBEDDING_STORE_PATH, settings.EMBEDDING_STORE_MAX_MB * 2**20)
+        return StoredEmbeddingProvider(provider, store)
+
+    return provider
+
+
+# Global embedding provider instance
+embedding_provider = create_embedding_provider()
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """Get global embedding provider instance"""
+    return embedding_provider
+
+
+def get_vector_dimension() -> int:
+    """VECTOR_DIMENSION when set, otherwise the provider's dimension"""
+    return settings.VECTOR_DIMENSION or embedding_provider.dimension
@@ -0,0 +1,198 @@
+"""
+Persistent Embedding Store for RAGSearch1
+SQLite file of float32 embeddings keyed by sha256(model + text), shared by
+all workers and kept across restarts
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from .metrics import CACHE_ENTRIES, CACHE_HITS, CACHE_MISSES
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingStore:
+    """
+    Size-bounded on-disk embedding cache
+    Lookups and writes are batched; when the stored vectors exceed max_bytes
+    the least recently used ones are evicted. WAL mode lets every uvicorn
+    worker read and write the same file concurrently. Lookups only read:
+    last-used times are buffered and written with the next write (or every
+    TOUCH_FLUSH_INTERVAL), and the size check runs at most once per
+    EVICT_CHECK_INTERVAL.
+    """
+
+    # SQLite limits the number of bound parameters per statement
+    BATCH_SIZE = 500
+
+    # Eviction frees space down to this fraction of max_bytes
+    EVICT_TARGET = 0.9
+
+    # Seconds between last-used flushes when there are no writes
+    TOUCH_FLUSH_INTERVAL = 60
+
+    # Seconds between size checks (a full scan of the sizes)
+    EVICT_CHECK_INTERVAL = 60
+
+    def __init__(self, path: str, max_bytes: int, name: str = "embedding_store"):
+        """
+        Initialize store (the database opens on first use)
+
+        Args:
+            path: SQLite file
+            max_bytes: Maximum size of stored vectors
+            name: Cache name used as metrics label
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.name = name
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._touched: Dict[bytes, int] = {}
+        self._touch_flushed = time.monotonic()
+        self._evict_checked = time.monotonic() - self.EVICT_CHECK_INTERVAL
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """Store key for a text embedded with a model"""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).digest()
+
+    def get_many(self, model: str, texts: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Look up stored embeddings
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            Embeddings found, by text (missing texts are absent)
+        """
+        keys = {self.key(model, text): text for text in dict.fromkeys(texts)}
+        if not keys:
+            return {}
+
+        found: Dict[str, List[float]] = {}
+        try:
+            with self._lock:
+                conn = self._connection()
+                key_list = list(keys)
+                for i in range(0, len(key_list), self.BATCH_SIZE):
+                    batch = key_list[i:i + self.BATCH_SIZE]
+                    rows = conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                        batch
+                    ).fetchall()
+                    for key, vector in rows:
+                        found[keys[key]] = np.frombuffer(vector, dtype=np.float32).tolist()
+
+                if found:
+                    now = int(time.time())
+                    self._touched.update((self.key(model, text), now) for text in found)
+                    if time.monotonic() - self._touch_flushed >= self.TOUCH_FLUSH_INTERVAL:
+                        self._flush_touched(conn)
+                        conn.commit()
+
+        except Exception as e:
+            logger.warning(f"Embedding store lookup failed: {e}")
+
+        CACHE_HITS.labels(cache=self.name).inc(len(found))
+        CACHE_MISSES.labels(cache=self.name).inc(len(keys) - len(found))
+        return found
+
+    def set_many(self, model: str, embeddings: Dict[str, List[float]]):
+        """
+        Store embeddings, evicting the least recently used ones above max_bytes
+
+        Args:
+            model: Embedding model name
+            embeddings: Embeddings by text
+        """
+        if not embeddings:
+            return
+
+        now = int(time.time())
+        rows = []
+        for text, embedding in embeddings.items():
+            vector = np.asarray(embedding, dtype=np.float32).tobytes()
+            rows.append((self.key(model, text), vector, len(vector), now))
+
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, size, last_used) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                for row in rows:
+                    self._touched.pop(row[0], None)
+                self._flush_touched(conn)
+                if time.monotonic() - self._evict_checked >= self.EVICT_CHECK_INTERVAL:
+                    self._evict(conn)
+                conn.commit()
+
+        except Exception as e:
+            logger.warning(f"Embedding store write failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Number of stored embeddings and their total size"""
+        with self._lock:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM embeddings"
+            ).fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def _flush_touched(self, conn: sqlite3.Connection):
+        """Write buffered last-used times (caller holds the lock and commits)"""
+        if self._touched:
+            conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(now, key) for key, now in self._touched.items()]
+            )
+            self._touched.clear()
+        self._touch_flushed = time.monotonic()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete least recently used embeddings while over max_bytes"""
+        self._evict_checked = time.monotonic()
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM embeddings").fetchone()
+
+        if size > self.max_bytes and entries:
+            average = size / entries
+            excess = size - self.max_bytes * self.EVICT_TARGET
+            conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (int(excess / average) + 1,)
+            )
+            entries = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            logger.info(f"Evicted embeddings down to {entries} entries")
+
+        CACHE_ENTRIES.labels(cache=self.name).set(entries)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database, again after a fork (connections cannot cross processes)"""
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key BLOB PRIMARY KEY, vector BLOB NOT NULL, "
+                "size INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
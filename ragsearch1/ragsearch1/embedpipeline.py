@@ -0,0 +1,287 @@
+"""
+Embedding Pipeline for RAGSearch1
+Token-aware batching, concurrent requests, rate limiting and retries for
+the OpenAI embeddings API
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, List, Optional
+
+import tiktoken
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+from .metrics import (
+    EMBEDDING_RATE_LIMIT_WAIT_SECONDS,
+    EMBEDDING_REQUEST_SECONDS,
+    EMBEDDING_RETRIES,
+    EMBEDDING_TEXTS,
+    EMBEDDING_THROUGHPUT,
+    EMBEDDING_TOKENS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Transient failures worth retrying; anything else fails the batch at once
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate
+    Reservations are debited immediately and return how long the caller must
+    wait, so one bucket serves sync and async callers on any thread
+    """
+
+    def __init__(self, name: str, per_minute: int):
+        """
+        Initialize bucket (starts full)
+
+        Args:
+            name: Bucket name used as metrics label
+            per_minute: Refill rate and capacity
+        """
+        self.name = name
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._available = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount from the bucket
+
+        Args:
+            amount: Units to take (capped at capacity)
+
+        Returns:
+            Seconds to wait before using the reservation
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._available = min(self.capacity, self._available + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._available -= min(amount, self.capacity)
+            wait = max(0.0, -self._available / self.rate)
+
+        if wait:
+            EMBEDDING_RATE_LIMIT_WAIT_SECONDS.labels(bucket=self.name).inc(wait)
+        return wait
+
+
+def backoff_delay(attempt: int, base: float, cap: float, error: Optional[Exception] = None) -> float:
+    """
+    Delay before a retry: the server's Retry-After when given, otherwise
+    exponential backoff with full jitter
+
+    Args:
+        attempt: Retry number, starting at 0
+        base: First backoff ceiling in seconds
+        cap: Maximum backoff in seconds
+        error: Error that triggered the retry
+
+    Returns:
+        Seconds to wait
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+        return min(cap, retry_after)
+    except (TypeError, ValueError):
+        return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class EmbeddingPipeline:
+    """
+    Embeds large text lists with the OpenAI API
+    Texts are grouped into batches by token count (and item count), batches
+    run concurrently under a semaphore, request and token budgets are
+    enforced by token buckets, and transient errors are retried
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        async_client: Any,
+        model: str,
+        max_batch_tokens: int,
+        max_batch_size: int,
+        max_input_tokens: int,
+        concurrency: int,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float
+    ):
+        """
+        Initialize pipeline
+
+        Args:
+            client: OpenAI client
+            async_client: AsyncOpenAI client
+            model: Embedding model
+            max_batch_tokens: Token budget per request
+            max_batch_size: Texts per request
+            max_input_tokens: Longest text accepted by the model (longer ones are truncated)
+            concurrency: Requests in flight per async run
+            requests_per_minute: Request rate limit
+            tokens_per_minute: Token rate limit
+            max_retries: Retries per batch on transient errors
+            backoff_base: First backoff ceiling in seconds
+            backoff_max: Maximum backoff in seconds
+        """
+        self.client = client
+        self.async_client = async_client
+        self.model = model
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_input_tokens = max_input_tokens
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.requests = TokenBucket("requests", requests_per_minute)
+        self.tokens = TokenBucket("tokens", tokens_per_minute)
+        self._encoding = None
+
+    @property
+    def encoding(self) -> "tiktoken.Encoding":
+        """Tokenizer of the embedding model (loaded on first use)"""
+        if self._encoding is None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(self.model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+        return self._encoding
+
+    def batches(self, texts: List[str]) -> List[tuple[List[str], int]]:
+        """
+        Split texts into request batches, in order
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of (batch texts, batch token count)
+        """
+        batches = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for text in texts:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            if len(tokens) > self.max_input_tokens:
+                tokens = tokens[:self.max_input_tokens]
+                text = self.encoding.decode(tokens)
+
+            if current and (
+                current_tokens + len(tokens) > self.max_batch_tokens or len(current) >= self.max_batch_size
+            ):
+                batches.append((current, current_tokens))
+                current, current_tokens = [], 0
+
+            current.append(text)
+            current_tokens += len(tokens)
+
+        if current:
+            batches.append((current, current_tokens))
+        return batches
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, one batch at a time (blocking)
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors, in input order
+        """
+        start = time.perf_counter()
+        embeddings: List[List[float]] = []
+
+        batches = self.batches(texts)
+        for batch, tokens in batches:
+            embeddings.extend(self._request(batch, tokens))
+
+        self._record_run(len(texts), len(batches), start)
+        return embeddings
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with concurrent batch requests
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors, in input order
+        """
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(batch: List[str], tokens: int) -> List[List[float]]:
+            async with semaphore:
+                return await self._arequest(batch, tokens)
+
+        # Tokenizing a bulk load is CPU work: keep it off the event loop
+        if len(texts) > 1:
+            batches = await asyncio.get_running_loop().run_in_executor(None, self.batches, texts)
+        else:
+            batches = self.batches(texts)
+        results = await asyncio.gather(*(run(batch, tokens) for batch, tokens in batches))
+
+        self._record_run(len(texts), len(batches), start)
+        return [embedding for batch in results for embedding in batch]
+
+    def _request(self, batch: List[str], tokens: int) -> List[List[float]]:
+        """Send one batch, waiting for rate limits and retrying transient errors"""
+        for attempt in range(self.max_retries + 1):
+            time.sleep(max(self.requests.reserve(1), self.tokens.reserve(tokens)))
+            started = time.perf_counter()
+            try:
+                response = self.client.embeddings.create(model=self.model, input=batch)
+                return self._record_batch(response, batch, tokens, started)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(attempt, e))
+
+    async def _arequest(self, batch: List[str], tokens: int) -> List[List[float]]:
+        """Async variant of _request()"""
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(max(self.requests.reserve(1), self.tokens.reserve(tokens)))
+            started = time.perf_counter()
+            try:
+                response = await self.async_client.embeddings.create(model=self.model, input=batch)
+                return self._record_batch(response, batch, tokens, started)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, e))
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, error)
+        EMBEDDING_RETRIES.labels(reason=type(error).__name__).inc()
+        logger.warning(f"Embedding batch failed ({type(error).__name__}), retry {attempt + 1} in {delay:.1f}s")
+        return delay
+
+    def _record_batch(self, response: Any, batch: List[str], tokens: int, started: float) -> List[List[float]]:
+        EMBEDDING_REQUEST_SECONDS.observe(time.perf_counter() - started)
+        EMBEDDING_TEXTS.inc(len(batch))
+        EMBEDDING_TOKENS.inc(tokens)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def _record_run(self, count: int, n_batches: int, start: float):
+        # Single-batch runs are mostly queries; throughput is about bulk loads
+        elapsed = time.perf_counter() - start
+        if n_batches > 1 and elapsed > 0:
+            EMBEDDING_THROUGHPUT.set(count / elapsed)
+            logger.info(
+                f"Embedded {count} texts in {n_batches} batches, {elapsed:.1f}s ({count / elapsed:.0f} texts/sec)"
+            )
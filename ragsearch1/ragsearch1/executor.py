@@ -0,0 +1,239 @@
+"""
+Worker pools for RAGSearch1
+Runs blocking client calls (ChromaDB, Redis, sync SDKs) off the event loop
+in bounded, dedicated thread pools, CPU-heavy work in a process pool, and
+limits concurrent async calls
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+from .config import settings
+from .metrics import EVENT_LOOP_LAG_SECONDS, POOL_WORKERS, POOL_ACTIVE, POOL_QUEUED, POOL_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    """
+    Fixed-size thread pool with saturation metrics
+    Queue depth, active tasks and queue wait time are exported per pool
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        """
+        Initialize pool
+
+        Args:
+            name: Pool name used as metrics label
+            max_workers: Number of worker threads
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"ragsearch1-{name}"
+        )
+        POOL_WORKERS.labels(pool=name).set(max_workers)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking function in the pool without blocking the event loop
+
+        Args:
+            fn: Blocking function
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Return value of fn
+        """
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+        POOL_QUEUED.labels(pool=self.name).inc()
+
+        def task():
+            POOL_QUEUED.labels(pool=self.name).dec()
+            POOL_WAIT_SECONDS.labels(pool=self.name).observe(time.perf_counter() - submitted_at)
+            POOL_ACTIVE.labels(pool=self.name).inc()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                POOL_ACTIVE.labels(pool=self.name).dec()
+
+        return await loop.run_in_executor(self._pool, task)
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release the threads"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class ProcessExecutor:
+    """
+    Process pool for CPU-bound work that would otherwise hold the GIL
+    Workers are spawned on first use and respawned if one dies; fn and its
+    arguments must be picklable (module-level functions)
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        """
+        Initialize pool (no processes start until the first run)
+
+        Args:
+            name: Pool name used as metrics label
+            max_workers: Number of worker processes
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        POOL_WORKERS.labels(pool=name).set(max_workers)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run a function in a worker process without blocking the event loop
+
+        Args:
+            fn: Picklable function
+            *args: Picklable arguments for fn
+
+        Returns:
+            Return value of fn
+        """
+        if self._pool is None:
+            # Spawn, not fork: the parent runs threads (pools, scheduler) whose
+            # locks a forked child could inherit held
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        POOL_ACTIVE.labels(pool=self.name).inc()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+        except BrokenProcessPool:
+            logger.error(f"{self.name} process pool broke, respawning on next use")
+            self.shutdown()
+            raise
+        finally:
+            POOL_ACTIVE.labels(pool=self.name).dec()
+
+    def shutdown(self, wait: bool = False):
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+class ConcurrencyLimiter:
+    """
+    Limits the number of concurrent async calls to a backend (e.g. the LLM)
+    Exports the same saturation metrics as BoundedExecutor
+    """
+
+    def __init__(self, name: str, limit: int):
+        """
+        Initialize limiter
+
+        Args:
+            name: Limiter name used as metrics label
+            limit: Maximum number of concurrent calls
+        """
+        self.name = name
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        POOL_WORKERS.labels(pool=name).set(limit)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Wait for a free slot and hold it for the duration of the block"""
+        submitted_at = time.perf_counter()
+        POOL_QUEUED.labels(pool=self.name).inc()
+
+        try:
+            await self._semaphore.acquire()
+        finally:
+            POOL_QUEUED.labels(pool=self.name).dec()
+
+        POOL_WAIT_SECONDS.labels(pool=self.name).observe(time.perf_counter() - submitted_at)
+        POOL_ACTIVE.labels(pool=self.name).inc()
+        try:
+            yield
+        finally:
+            POOL_ACTIVE.labels(pool=self.name).dec()
+            self._semaphore.release()
+
+
+# Global pool instances
+executors: Dict[str, BoundedExecutor] = {
+    "retrieval": BoundedExecutor("retrieval", settings.RETRIEVAL_POOL_SIZE),
+    "vectordb": BoundedExecutor("vectordb", settings.VECTORDB_POOL_SIZE),
+    "ingest": BoundedExecutor("ingest", settings.INGEST_POOL_SIZE),
+}
+
+process_executor = ProcessExecutor("ingest_cpu", settings.INGEST_PROCESSES) if settings.INGEST_PROCESSES > 0 else None
+
+llm_limiter = ConcurrencyLimiter("llm", settings.LLM_MAX_CONCURRENCY)
+
+_loop_lag_task: Optional[asyncio.Task] = None
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Get a global worker pool by name"""
+    return executors[name]
+
+
+def get_process_executor() -> Optional[ProcessExecutor]:
+    """Get global process pool (None when INGEST_PROCESSES is 0)"""
+    return process_executor
+
+
+def get_llm_limiter() -> ConcurrencyLimiter:
+    """Get global LLM concurrency limiter"""
+    return llm_limiter
+
+
+async def monitor_event_loop_lag(interval: float):
+    """
+    Measure how late the event loop wakes up from a sleep
+    Lag is time the loop spent blocked by synchronous work instead of
+    serving requests
+
+    Args:
+        interval: Seconds between samples
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - started - interval))
+
+
+def start_loop_lag_monitor():
+    """Start sampling event loop lag on the running loop (API startup or worker)"""
+    global _loop_lag_task
+
+    if _loop_lag_task is None and settings.LOOP_LAG_INTERVAL > 0:
+        _loop_lag_task = asyncio.get_running_loop().create_task(
+            monitor_event_loop_lag(settings.LOOP_LAG_INTERVAL)
+        )
+
+
+def shutdown_executors():
+    """Shut down all worker pools and the loop lag monitor"""
+    global _loop_lag_task
+
+    if _loop_lag_task is not None:
+        _loop_lag_task.cancel()
+        _loop_lag_task = None
+
+    for executor in executors.values():
+        executor.shutdown()
+
+    if process_executor is not None:
+        process_executor.shutdown()
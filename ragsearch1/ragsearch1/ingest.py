@@ -0,0 +1,273 @@
+"""
+Ingest Pipeline for RAGSearch1
+Async facade over the ingest stages (normalize → embed → write), streamed
+through bounded queues: entity normalization runs in the process pool,
+diffing and vector DB reads and writes in the ingest thread pool, and
+embeddings on async clients, so scheduled jobs do not block the event loop
+serving API requests
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .config import settings
+from .executor import get_executor, get_process_executor
+from .pipeline import Stage, StreamingPipeline
+from .processor import get_processor, prepare_entities
+from .vectordb import get_vector_db
+
+logger = logging.getLogger(__name__)
+
+
+class IngestPipeline:
+    """
+    Writes collected entities incrementally
+    Documents are diffed against the collection by content hash: only new
+    and changed ones are embedded, metadata-only changes are updated in
+    place, and documents of the run's scope no longer collected are deleted
+    """
+
+    def __init__(self):
+        """Initialize pipeline with the global processor, vector DB and pools"""
+        self.processor = get_processor()
+        self.vector_db = get_vector_db()
+        self.threads = get_executor("ingest")
+        self.processes = get_process_executor()
+
+    async def prepare(
+        self,
+        entities: List[Dict[str, Any]],
+        scope: Optional[str] = None
+    ) -> tuple[List[str], List[Dict[str, Any]], List[str]]:
+        """
+        Normalize entities into documents, split across the process pool
+
+        Args:
+            entities: Raw entities from the collector
+            scope: Ingest scope recorded in metadata
+
+        Returns:
+            Tuple of (documents, metadatas, ids)
+        """
+        if self.processes is None or len(entities) < settings.INGEST_PROCESS_MIN_ENTITIES:
+            return await self.threads.run(self.processor.prepare_entity_batch, entities, scope)
+
+        size = -(-len(entities) // self.processes.max_workers)
+        try:
+            parts = await asyncio.gather(*(
+                self.processes.run(prepare_entities, entities[i:i + size], scope)
+                for i in range(0, len(entities), size)
+            ))
+        except Exception as e:
+            logger.warning(f"Normalization in the process pool failed ({e}), using a thread")
+            return await self.threads.run(self.processor.prepare_entity_batch, entities, scope)
+
+        documents, metadatas, ids = [], [], []
+        for part_documents, part_metadatas, part_ids in parts:
+            documents.extend(part_documents)
+            metadatas.extend(part_metadatas)
+            ids.extend(part_ids)
+
+        return documents, metadatas, ids
+
+    async def write(
+        self,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None
+    ) -> int:
+        """
+        Upsert documents in the ingest thread pool
+
+        Returns:
+            Number of documents that failed to write
+        """
+        result = await self.threads.run(
+            self.vector_db.upsert_documents,
+            documents=documents,
+            metadatas=metadatas,
+            ids=ids,
+            embeddings=embeddings
+        )
+        return result["failed"]
+
+    async def run(
+        self,
+        entities: List[Dict[str, Any]],
+        scope: str,
+        changed_ids: Optional[set] = None
+    ) -> Dict[str, Any]:
+        """
+        Ingest an already collected list of entities (see stream())
+
+        Args:
+            entities: Raw entities from the collector
+            scope: Ingest scope (job) owning the documents
+            changed_ids: Optional set receiving the IDs embedded or removed
+
+        Returns:
+            Run summary
+        """
+        async def single_batch():
+            yield entities
+
+        return await self.stream(single_batch(), scope, changed_ids)
+
+    async def stream(
+        self,
+        batches: AsyncIterator[List[Dict[str, Any]]],
+        scope: str,
+        changed_ids: Optional[set] = None,
+        failed_sources: Optional[set] = None
+    ) -> Dict[str, Any]:
+        """
+        Ingest entity batches as they are collected
+        Batches flow through normalize → embed → upsert stages with bounded
+        queues in between, so collection, embedding and writes overlap and
+        memory holds a few batches rather than the whole catalog. Callers
+        serialize runs: diffs are computed against one collection snapshot.
+
+        Args:
+            batches: Async iterator of raw entity batches (e.g. DataCollector.stream_all())
+            scope: Ingest scope (job) owning the documents
+            changed_ids: Optional set receiving the IDs embedded or removed
+                (metadata-only refreshes leave the vectors as they were)
+            failed_sources: Optional set filled with the names of sources that
+                failed while collecting (see DataCollector.stream_all());
+                documents are only removed when it ends up empty
+
+        Returns:
+            Run summary, with per-stage throughput under "stages"
+        """
+        start = time.perf_counter()
+        counts = {key: 0 for key in ("collected", "new", "changed", "refreshed", "unchanged", "embedded", "failed")}
+        # Kept version of each ID so far: (version rank, plan key)
+        winners: Dict[str, tuple] = {}
+
+        async def load_stored() -> Dict[str, Dict[str, Any]]:
+            stored = await self.threads.run(self.vector_db.get, include=["metadatas"])
+            return dict(zip(stored["ids"], stored["metadatas"]))
+
+        # The collection snapshot loads while the first batches are collected
+        snapshot = asyncio.ensure_future(load_stored())
+
+        async def normalize(entities: List[Dict[str, Any]]) -> List[tuple]:
+            prepared = await self.prepare(entities, scope)
+            stored = await snapshot
+            # Removed documents are only known once the whole run is seen
+            plan = await self.threads.run(self.processor.plan_prepared, prepared, stored, None)
+
+            # Same rule as plan_prepared() within a batch: a later version
+            # replaces an earlier one only if it ranks lower (version_rank),
+            # so the version kept does not depend on arrival order
+            positions = {entity_id: i for i, entity_id in enumerate(plan["ids"])}
+            items = []
+            for key in ("new", "changed", "refreshed", "unchanged"):
+                for entity_id in plan[key]:
+                    document = plan["documents"][positions[entity_id]]
+                    metadata = plan["metadatas"][positions[entity_id]]
+                    rank = self.processor.version_rank(metadata)
+                    previous = winners.get(entity_id)
+                    if previous is not None and rank >= previous[0]:
+                        continue
+
+                    winners[entity_id] = (rank, key)
+                    counts[key] += 1
+                    if previous is None:
+                        counts["collected"] += 1
+                    else:
+                        counts[previous[1]] -= 1
+
+                    # A replaced version may already be written (and with another
+                    # text): overwrite it, re-embedding unless both match the stored text
+                    embedded_before = previous is not None and previous[1] in ("new", "changed")
+                    if key != "unchanged" or (previous is not None and previous[1] != "unchanged"):
+                        items.append((entity_id, document, metadata, key in ("new", "changed") or embedded_before, rank))
+            return items
+
+        async def embed(items: List[tuple]) -> List[tuple]:
+            # Refreshed documents pass through: their stored embeddings are still valid
+            texts = [document for _, document, _, needs_embedding, _ in items if needs_embedding]
+            vectors = iter(await self.processor.agenerate_embeddings(texts) if texts else [])
+            counts["embedded"] += len(texts)
+            return [
+                (entity_id, document, metadata, next(vectors) if needs_embedding else None, rank)
+                for entity_id, document, metadata, needs_embedding, rank in items
+            ]
+
+        async def upsert(items: List[tuple]):
+            # Drop versions replaced while they were being embedded
+            items = [item for item in items if winners[item[0]][0] == item[4]]
+            embedded = [item for item in items if item[3] is not None]
+            refreshed = [item for item in items if item[3] is None]
+
+            if changed_ids is not None:
+                changed_ids.update(item[0] for item in embedded)
+
+            for group, with_embeddings in ((embedded, True), (refreshed, False)):
+                if group:
+                    counts["failed"] += await self.write(
+                        documents=[item[1] for item in group],
+                        metadatas=[item[2] for item in group],
+                        ids=[item[0] for item in group],
+                        embeddings=[item[3] for item in group] if with_embeddings else None
+                    )
+
+        pipeline = StreamingPipeline("ingest", [
+            Stage("normalize", normalize, settings.PIPELINE_NORMALIZE_BATCH_SIZE, settings.PIPELINE_NORMALIZE_CONCURRENCY),
+            Stage("embed", embed, settings.PIPELINE_EMBED_BATCH_SIZE, settings.PIPELINE_EMBED_CONCURRENCY),
+            Stage("upsert", upsert, settings.PIPELINE_UPSERT_BATCH_SIZE, settings.PIPELINE_UPSERT_CONCURRENCY),
+        ], queue_size=settings.PIPELINE_QUEUE_SIZE)
+
+        try:
+            stages = await pipeline.run(batches)
+            stored = await snapshot
+        finally:
+            snapshot.cancel()
+
+        # A failing source can return a fraction of the usual entities (or
+        # none): never let one run wipe most of its scope
+        owned = [
+            entity_id for entity_id, metadata in stored.items()
+            if (metadata or {}).get("ingest_scope") == scope
+        ]
+        removed = [entity_id for entity_id in owned if entity_id not in winners]
+        removal_skipped = bool(removed) and (
+            not winners
+            or bool(failed_sources)
+            or not settings.INGEST_REMOVE_MISSING
+            or len(removed) > len(owned) * settings.INGEST_MAX_REMOVED_RATIO
+        )
+        if removal_skipped:
+            logger.warning(
+                f"Skipped removing {len(removed)} of {len(owned)} '{scope}' documents missing from this run"
+                + (f" (failed sources: {', '.join(sorted(failed_sources))})" if failed_sources else "")
+            )
+        elif removed:
+            await self.threads.run(self.vector_db.delete_documents, removed)
+            if changed_ids is not None:
+                changed_ids.update(removed)
+
+        return {
+            "scope": scope,
+            **counts,
+            "removed": 0 if removal_skipped else len(removed),
+            "removal_skipped": len(removed) if removal_skipped else 0,
+            "failed_sources": sorted(failed_sources or []),
+            "stages": stages,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "finished_at": datetime.now().isoformat(),
+        }
+
+
+# Global ingest pipeline instance
+ingest_pipeline = IngestPipeline()
+
+
+def get_ingest_pipeline() -> IngestPipeline:
+    """Get global ingest pipeline instance"""
+    return ingest_pipeline
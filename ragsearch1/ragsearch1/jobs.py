@@ -0,0 +1,144 @@
+"""
+Scheduled Job Runner for RAGSearch1
+Wraps scheduler jobs with a global concurrency limit and Prometheus
+metrics, and hands manual run requests to the elected scheduler process
+"""
+
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, JobEvent
+
+from .cache import RedisConnection
+from .executor import ConcurrencyLimiter
+from .metrics import JOB_DURATION_SECONDS, JOB_QUEUE_WAIT_SECONDS, JOB_RUNS
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """
+    Runs scheduled coroutines
+    At most max_concurrent jobs run at once (others wait their turn). Overlap
+    of the same job is left to the scheduler's max_instances.
+    """
+
+    # Scheduler events to register on_scheduler_event for
+    EVENTS = EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+
+    def __init__(self, max_concurrent: int):
+        """
+        Initialize runner
+
+        Args:
+            max_concurrent: Jobs running at the same time, across all jobs
+        """
+        self.limiter = ConcurrencyLimiter("jobs", max_concurrent)
+
+    def wrap(self, job_id: str, fn: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[None]]:
+        """
+        Build the coroutine function registered with the scheduler
+
+        Args:
+            job_id: Job ID used as metrics label
+            fn: Job coroutine function
+
+        Returns:
+            Wrapped coroutine function
+        """
+        async def run():
+            submitted_at = time.perf_counter()
+            async with self.limiter.acquire():
+                JOB_QUEUE_WAIT_SECONDS.labels(job=job_id).observe(time.perf_counter() - submitted_at)
+                started_at = time.perf_counter()
+                outcome = "success"
+                try:
+                    await fn()
+                except Exception as e:
+                    outcome = "failure"
+                    logger.error(f"Job {job_id} failed: {e}")
+                finally:
+                    JOB_DURATION_SECONDS.labels(job=job_id, outcome=outcome).observe(
+                        time.perf_counter() - started_at
+                    )
+                    JOB_RUNS.labels(job=job_id, outcome=outcome).inc()
+
+        return run
+
+    def on_scheduler_event(self, event: JobEvent):
+        """APScheduler listener counting runs it dropped (misfired or over max_instances)"""
+        if event.code == EVENT_JOB_MISSED:
+            JOB_RUNS.labels(job=event.job_id, outcome="missed").inc()
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            JOB_RUNS.labels(job=event.job_id, outcome="skipped").inc()
+
+
+class RunRequests:
+    """
+    Manual run requests, handed from any process to the elected scheduler
+    Requests live in a Redis set or as files in a shared directory, so
+    repeated requests for a job still pending collapse into one run
+    """
+
+    def __init__(self, name: str, connection: Optional[RedisConnection], directory: str):
+        """
+        Initialize request queue
+
+        Args:
+            name: Queue name (one per elected role)
+            connection: Redis connection, or None to use the directory
+            directory: Shared directory of the file backend
+        """
+        self.connection = connection
+        self.key = f"ragsearch1:run_requests:{name}"
+        self.directory = os.path.join(directory, f"{name}.requests")
+
+    def push(self, job_id: str) -> bool:
+        """
+        Request a run of a job
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            True if the request was stored
+        """
+        try:
+            if self.connection is None:
+                os.makedirs(self.directory, exist_ok=True)
+                open(os.path.join(self.directory, job_id), "a").close()
+                return True
+
+            client = self.connection.get_client()
+            if client is None:
+                return False
+            client.sadd(self.key, job_id)
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to request a run of {job_id}: {e}")
+            return False
+
+    def pop_all(self) -> List[str]:
+        """Take all pending requests (each one is returned to one caller only)"""
+        try:
+            if self.connection is None:
+                job_ids = []
+                for job_id in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+                    try:
+                        os.remove(os.path.join(self.directory, job_id))
+                        job_ids.append(job_id)
+                    except FileNotFoundError:
+                        pass  # Taken by another process
+                return job_ids
+
+            client = self.connection.get_client()
+            if client is None:
+                return []
+            return [job_id.decode() for job_id in client.spop(self.key, 100) or []]
+
+        except Exception as e:
+            logger.error(f"Failed to read run requests: {e}")
+            return []
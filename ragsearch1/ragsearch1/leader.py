@@ -0,0 +1,297 @@
+"""
+Leader Election for RAGSearch1
+Makes sure exactly one process (among API workers and standalone workers)
+runs the scheduler, using a Redis lease or a file lock
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+import redis
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RedisLease:
+    """
+    Lease stored in a Redis key with a TTL
+    The holder renews it before it expires; if the holder dies the key
+    expires and another process takes over. The lease has its own client
+    and retries, apart from the caches' Redis connection: a cache timeout
+    must not cost the leadership, nor the cache's back-off skip a renewal.
+    """
+
+    # Extend or delete the key only if this process still holds it
+    RENEW_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+    )
+    RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) else return 0 end"
+    )
+
+    # Attempts per lease operation before it counts as failed
+    ATTEMPTS = 3
+
+    def __init__(self, key: str, ttl: int):
+        """
+        Initialize lease (the client connects on first use)
+
+        Args:
+            key: Redis key of the lease
+            ttl: Lease lifetime in seconds
+        """
+        self.key = key
+        self.ttl = ttl
+        self.ttl_ms = ttl * 1000
+        self._client: Optional[redis.Redis] = None
+        self._holder = None
+        self._pid = None
+        self._renewed_at: Optional[float] = None
+        self._unreachable = False
+
+    @property
+    def holder(self) -> str:
+        """Identifier of this process (regenerated after a fork)"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._holder = f"{socket.gethostname()}:{self._pid}:{uuid.uuid4().hex[:8]}"
+        return self._holder
+
+    def acquire(self) -> bool:
+        """Take the lease if nobody holds it (or this process still does)"""
+        held = self._call(
+            lambda client: bool(client.set(self.key, self.holder, nx=True, px=self.ttl_ms))
+            or bool(client.eval(self.RENEW_SCRIPT, 1, self.key, self.holder, self.ttl_ms))
+        )
+        if held:
+            self._renewed_at = time.monotonic()
+        return bool(held)
+
+    def renew(self) -> bool:
+        """
+        Extend the lease; False if it was lost
+        While Redis cannot be reached the lease is kept for half its TTL
+        after the last renewal: the key cannot have expired before that
+        """
+        renewed = self._call(
+            lambda client: bool(client.eval(self.RENEW_SCRIPT, 1, self.key, self.holder, self.ttl_ms))
+        )
+        if renewed is None:
+            return self._renewed_at is not None and time.monotonic() - self._renewed_at < self.ttl / 2
+
+        if renewed:
+            self._renewed_at = time.monotonic()
+        return renewed
+
+    def release(self):
+        """Give the lease up so another process can take over at once"""
+        self._call(lambda client: client.eval(self.RELEASE_SCRIPT, 1, self.key, self.holder))
+        self._renewed_at = None
+
+    def _call(self, fn: Callable[[Any], Any]) -> Optional[Any]:
+        """
+        Run a lease operation, retrying connection errors and timeouts
+
+        Returns:
+            Result of fn, or None if Redis could not be reached
+        """
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.SCHEDULER_LEASE_REDIS_TIMEOUT,
+                socket_connect_timeout=settings.SCHEDULER_LEASE_REDIS_TIMEOUT,
+            )
+
+        for attempt in range(self.ATTEMPTS):
+            try:
+                result = fn(self._client)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                error = e
+                if attempt + 1 < self.ATTEMPTS:
+                    time.sleep(0.2 * (attempt + 1))
+                continue
+            except Exception as e:
+                logger.error(f"Lease {self.key} operation failed: {e}")
+                return None
+
+            if self._unreachable:
+                logger.info(f"Lease {self.key}: Redis reachable again")
+                self._unreachable = False
+            return result
+
+        if not self._unreachable:
+            # Logged once per outage: the elector retries every renew interval
+            logger.error(
+                f"Lease {self.key}: Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT} unreachable "
+                f"({error}); no process takes the lease until it is back. Set "
+                f"SCHEDULER_LEADER_BACKEND=file (single host) or none to run without Redis"
+            )
+            self._unreachable = True
+        return None
+
+
+class FileLease:
+    """
+    Exclusive lock on a file, for processes sharing one host or volume
+    The OS releases the lock when the holder exits, so no TTL is needed
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize lease
+
+        Args:
+            path: Lock file
+        """
+        self.path = path
+        self._file = None
+
+    def acquire(self) -> bool:
+        """Take the lock if nobody holds it"""
+        import fcntl
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self._file = lock_file
+        return True
+
+    def renew(self) -> bool:
+        """The lock is held for as long as the file stays open"""
+        return self._file is not None
+
+    def release(self):
+        """Unlock and close the file"""
+        if self._file is not None:
+            import fcntl
+
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+class LeaderElector:
+    """
+    Periodically tries to take or renew a lease, and runs callbacks when
+    this process becomes or stops being the leader
+    """
+
+    def __init__(
+        self,
+        name: str,
+        lease: Any,
+        on_elected: Callable[[], Any],
+        on_demoted: Callable[[], Any],
+        renew_interval: float
+    ):
+        """
+        Initialize elector
+
+        Args:
+            name: Name used in logs
+            lease: RedisLease or FileLease
+            on_elected: Called when this process becomes the leader
+            on_demoted: Called when leadership is lost or given up
+            renew_interval: Seconds between acquire/renew attempts (well below the lease TTL)
+        """
+        self.name = name
+        self.lease = lease
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.renew_interval = renew_interval
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Join the election (runs on the current event loop)"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"Joined {self.name} leader election as {self.holder}")
+
+    @property
+    def holder(self) -> str:
+        return getattr(self.lease, "holder", None) or f"{socket.gethostname()}:{os.getpid()}"
+
+    async def stop(self):
+        """Leave the election, releasing the lease if held"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self.is_leader:
+            self._demote()
+            self.lease.release()
+
+    def status(self) -> Dict[str, Any]:
+        """Election state of this process"""
+        return {
+            "participating": self._task is not None,
+            "is_leader": self.is_leader,
+            "holder": self.holder,
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                if self.is_leader:
+                    if not await loop.run_in_executor(None, self.lease.renew):
+                        logger.warning(f"Lost {self.name} leadership")
+                        self._demote()
+                elif await loop.run_in_executor(None, self.lease.acquire):
+                    logger.info(f"Elected {self.name} leader ({self.holder})")
+                    self.is_leader = True
+                    self.on_elected()
+
+            except Exception as e:
+                logger.error(f"{self.name} leader election failed: {e}")
+
+            await asyncio.sleep(self.renew_interval)
+
+    def _demote(self):
+        self.is_leader = False
+        try:
+            self.on_demoted()
+        except Exception as e:
+            logger.error(f"Failed to step down as {self.name} leader: {e}")
+
+
+def create_lease(name: str) -> Optional[Any]:
+    """
+    Build the lease selected by SCHEDULER_LEADER_BACKEND
+
+    Args:
+        name: Lease name (one lease per elected role)
+
+    Returns:
+        RedisLease, FileLease, or None when election is disabled
+    """
+    if settings.SCHEDULER_LEADER_BACKEND == "redis":
+        return RedisLease(
+            key=f"ragsearch1:leader:{name}",
+            ttl=settings.SCHEDULER_LEASE_TTL
+        )
+
+    if settings.SCHEDULER_LEADER_BACKEND == "file":
+        return FileLease(os.path.join(settings.SCHEDULER_LOCK_DIR, f"{name}.lock"))
+
+    return None
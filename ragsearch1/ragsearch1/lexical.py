@@ -0,0 +1,285 @@
+"""
+Lexical Search for RAGSearch1
+In-process inverted index with BM25 scoring over entity documents
+Complements vector search for exact-name queries ("Italcambio", "Bitso")
+"""
+
+import logging
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase, accent-free alphanumeric tokens
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return re.findall(r"[a-z0-9]+", text.casefold())
+
+
+class InvertedIndex:
+    """
+    BM25 inverted index over document texts (names, services, currencies)
+    Keeps documents and metadata so lexical hits can be returned without a
+    vector database round-trip. Tracks the collection version it reflects.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize index
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.version: Optional[int] = None
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._names: Dict[str, Tuple[str, ...]] = {}
+        self._documents: Dict[str, str] = {}
+        self._metadatas: Dict[str, Dict[str, Any]] = {}
+        self._total_len = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def build(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        version: int
+    ):
+        """
+        Rebuild the whole index
+        The new index is built aside and swapped in, so searches keep using
+        the previous one meanwhile
+
+        Args:
+            ids: Document IDs
+            documents: Document texts
+            metadatas: Document metadata
+            version: Collection version the documents were read at
+        """
+        fresh = InvertedIndex(self.k1, self.b)
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            fresh._add(doc_id, document, metadata or {})
+
+        with self._lock:
+            self._postings = fresh._postings
+            self._doc_terms = fresh._doc_terms
+            self._doc_len = fresh._doc_len
+            self._names = fresh._names
+            self._documents = fresh._documents
+            self._metadatas = fresh._metadatas
+            self._total_len = fresh._total_len
+            self.version = version
+
+        logger.info(f"Lexical index built with {len(ids)} documents (version {version})")
+
+    def upsert(
+        self,
+        doc_id: str,
+        document: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Add or update a document; omitted fields keep their indexed value
+
+        Args:
+            doc_id: Document ID
+            document: New document text
+            metadata: New metadata
+        """
+        with self._lock:
+            if document is None:
+                document = self._documents.get(doc_id)
+            if metadata is None:
+                metadata = self._metadatas.get(doc_id, {})
+
+            self._remove(doc_id)
+            if document is not None:
+                self._add(doc_id, document, metadata)
+
+    def upsert_many(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ):
+        """Add or update several documents"""
+        with self._lock:
+            for doc_id, document, metadata in zip(ids, documents, metadatas):
+                self.upsert(doc_id, document, metadata)
+
+    def remove(self, ids: List[str]):
+        """Remove documents from the index"""
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def clear(self, version: Optional[int] = None):
+        """Remove all documents"""
+        self.build([], [], [], version)
+
+    def mark_written(self, version: int):
+        """
+        Record that an in-process write produced a new collection version
+        The index stays in sync only if it was current before the write;
+        otherwise it remains stale and gets rebuilt on next use
+        """
+        with self._lock:
+            if self.version is not None and self.version == version - 1:
+                self.version = version
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank documents by BM25
+
+        Args:
+            query: Search query
+            limit: Number of results
+            filters: Optional metadata equality filters
+
+        Returns:
+            List of (doc_id, score) with scores normalized to the top hit (0-1]
+        """
+        terms = tokenize(query)
+
+        with self._lock:
+            n_docs = len(self._doc_len)
+            if not terms or not n_docs:
+                return []
+
+            avg_len = self._total_len / n_docs
+            scores: Dict[str, float] = {}
+
+            for term in set(terms):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            ranked = sorted(
+                (item for item in scores.items() if self._matches(item[0], filters)),
+                key=lambda item: (-item[1], item[0])
+            )[:limit]
+
+        if not ranked:
+            return []
+
+        top = ranked[0][1]
+        return [(doc_id, score / top) for doc_id, score in ranked]
+
+    def exact_name_matches(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        Find documents whose name has exactly the query's tokens
+
+        Args:
+            query: Search query
+            filters: Optional metadata equality filters
+
+        Returns:
+            List of matching document IDs
+        """
+        terms = tuple(sorted(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            return sorted(
+                doc_id for doc_id, name in self._names.items()
+                if name == terms and self._matches(doc_id, filters)
+            )
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an indexed document
+
+        Returns:
+            Dict with id, document and metadata, or None
+        """
+        with self._lock:
+            if doc_id not in self._documents:
+                return None
+            return {
+                "id": doc_id,
+                "document": self._documents[doc_id],
+                "metadata": self._metadatas[doc_id],
+            }
+
+    def _matches(self, doc_id: str, filters: Optional[Dict[str, Any]]) -> bool:
+        if not filters:
+            return True
+        metadata = self._metadatas.get(doc_id, {})
+        return all(metadata.get(key) == value for key, value in filters.items())
+
+    def _add(self, doc_id: str, document: str, metadata: Dict[str, Any]):
+        terms = Counter(tokenize(document))
+
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_len[doc_id] = length
+        self._names[doc_id] = tuple(sorted(tokenize(str(metadata.get("name", "")))))
+        self._documents[doc_id] = document
+        self._metadatas[doc_id] = metadata
+        self._total_len += length
+
+    def _remove(self, doc_id: str):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+        self._total_len -= self._doc_len.pop(doc_id, 0)
+        self._names.pop(doc_id, None)
+        self._documents.pop(doc_id, None)
+        self._metadatas.pop(doc_id, None)
+
+
+# Global lexical index instance
+lexical_index = InvertedIndex()
+
+
+def get_lexical_index() -> InvertedIndex:
+    """Get global lexical index instance"""
+    return lexical_index
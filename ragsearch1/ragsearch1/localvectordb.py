@@ -0,0 +1,789 @@
+"""
+Local Vector Store for RAGSearch1
+Exact k-nearest-neighbour search over a memory-mapped NumPy matrix
+Implements the subset of the ChromaDB client/collection API used by VectorDatabase
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCollection:
+    """
+    Brute-force vector collection for corpora of up to ~100k documents
+
+    Layout on disk (one directory per collection):
+        meta.json       dimension, capacity, metric and collection metadata
+        embeddings.f32  contiguous float32 matrix (capacity x dimension), memory-mapped
+        records.jsonl   append-only log of puts/deletes, replayed on load
+
+    Metadata is also kept as columnar object arrays, so equality filters are
+    vectorized masks instead of per-document dict lookups.
+
+    Several processes (API workers, the ingest worker) can share a directory:
+    writes hold an flock on write.lock and first catch up with the log, and
+    every call replays the records other processes appended since the last
+    one (vectors are read through the shared memory map).
+
+    With quantization ("float16" or "int8" with a per-vector scale) the search
+    matrix held in memory is compressed; top-k runs on it and a shortlist of
+    rescore_factor * k candidates is rescored against the float32 file.
+    """
+
+    INITIAL_CAPACITY = 1024
+    QUANTIZATIONS = ("none", "float16", "int8")
+
+    # Rows converted to float32 at a time when scoring compressed vectors
+    SCORE_CHUNK_ROWS = 8192
+
+    def __init__(
+        self,
+        path: str,
+        name: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        quantization: str = "none",
+        rescore_factor: int = 4
+    ):
+        """
+        Open or create a collection
+
+        Args:
+            path: Collection directory
+            name: Collection name
+            metadata: Collection metadata (dimension and metric are read from it)
+            quantization: In-memory search vectors: none, float16 or int8
+            rescore_factor: Shortlist size, as a multiple of k, rescored at full precision
+        """
+        if quantization not in self.QUANTIZATIONS:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+
+        self.name = name
+        self.quantization = quantization
+        self.rescore_factor = max(1, rescore_factor)
+        self.metadata = metadata or {}
+        self._path = path
+        self._metric = self.metadata.get("metric", "cosine")
+        self._dimension: Optional[int] = self.metadata.get("dimension")
+        self._lock = threading.RLock()
+
+        os.makedirs(path, exist_ok=True)
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        """Empty the in-memory state (before loading the files again)"""
+        self._capacity = 0
+        self._size = 0                      # High-water mark of used slots
+        self._matrix: Optional[np.memmap] = None
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._compressed: Optional[np.ndarray] = None
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._ids: List[Optional[str]] = []
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._log_entries = 0
+        self._log_inode: Optional[int] = None   # Identifies the log file read (compaction replaces it)
+        self._log_offset = 0                    # Bytes of it applied so far
+
+    @property
+    def metric(self) -> str:
+        """Distance function of query() results: cosine, l2 or ip"""
+        return self._metric
+
+    # ====================
+    # CHROMA-COMPATIBLE API
+    # ====================
+
+    def count(self) -> int:
+        """Number of documents in the collection"""
+        with self._lock:
+            self._sync()
+            return len(self._slots)
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """
+        Size of the search vectors held in memory
+
+        Returns:
+            Dict with quantization, search_bytes and the float32 equivalent
+        """
+        size, dimension = self._size, self._dimension or 0
+        full_bytes = size * dimension * 4
+        if self.quantization == "none":
+            search_bytes = full_bytes
+        else:
+            search_bytes = int(self._compressed[:size].nbytes + self._scales[:size].nbytes) if size else 0
+
+        return {
+            "quantization": self.quantization,
+            "search_bytes": search_bytes,
+            "float32_bytes": full_bytes,
+            "ratio": round(search_bytes / full_bytes, 3) if full_bytes else None,
+        }
+
+    def add(
+        self,
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        documents: Optional[List[str]] = None
+    ):
+        """
+        Add documents; IDs that already exist are skipped, as in ChromaDB
+
+        Raises:
+            ValueError: If embeddings are missing or have the wrong dimension
+        """
+        with self._lock, self._exclusive():
+            new = [i for i, doc_id in enumerate(ids) if doc_id not in self._slots]
+            if len(new) < len(ids):
+                logger.warning(f"Skipping {len(ids) - len(new)} existing IDs in {self.name}")
+
+            self._put(
+                [ids[i] for i in new],
+                self._select(embeddings, new),
+                self._select(metadatas, new),
+                self._select(documents, new)
+            )
+
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        documents: Optional[List[str]] = None
+    ):
+        """Add new documents and replace existing ones"""
+        with self._lock, self._exclusive():
+            self._put(ids, embeddings, metadatas, documents)
+
+    def update(
+        self,
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        documents: Optional[List[str]] = None
+    ):
+        """Update existing documents; omitted fields are kept, unknown IDs are skipped"""
+        with self._lock, self._exclusive():
+            known = [i for i, doc_id in enumerate(ids) if doc_id in self._slots]
+            if len(known) < len(ids):
+                logger.warning(f"Skipping {len(ids) - len(known)} unknown IDs in {self.name}")
+
+            for i in known:
+                slot = self._slots[ids[i]]
+                self._put(
+                    [ids[i]],
+                    [embeddings[i]] if embeddings else None,
+                    [metadatas[i]] if metadatas else [self._metadatas[slot]],
+                    [documents[i]] if documents else [self._documents[slot]]
+                )
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None):
+        """Delete documents by ID and/or metadata filter"""
+        with self._lock, self._exclusive():
+            slots = self._match(ids, where)
+            if not slots:
+                return
+
+            with open(self._file("records.jsonl"), "a", encoding="utf-8") as log:
+                for slot in slots:
+                    log.write(json.dumps({"op": "del", "id": self._ids[slot]}) + "\n")
+                    self._release(slot)
+                    self._log_entries += 1
+            self._mark_log_read()
+
+            self._maybe_compact()
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Get documents by ID and/or metadata filter
+
+        Returns:
+            Dict with ids and the included fields (None when not included)
+        """
+        include = include if include is not None else ["documents", "metadatas"]
+
+        with self._lock:
+            self._sync()
+            slots = self._match(ids, where)
+            slots = slots[offset or 0:]
+            if limit is not None:
+                slots = slots[:limit]
+
+            return {
+                "ids": [self._ids[slot] for slot in slots],
+                "documents": [self._documents[slot] for slot in slots] if "documents" in include else None,
+                "metadatas": [self._metadatas[slot] for slot in slots] if "metadatas" in include else None,
+                "embeddings": [self._matrix[slot].tolist() for slot in slots] if "embeddings" in include else None,
+            }
+
+    def query(
+        self,
+        query_embeddings: Optional[List[List[float]]] = None,
+        query_texts: Optional[List[str]] = None,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Exact filtered top-k search
+
+        Returns:
+            Dict with one row of ids, documents, metadatas and distances per query
+
+        Raises:
+            ValueError: If no query embeddings are given (this store does not embed text)
+        """
+        if query_embeddings is None:
+            raise ValueError("Local vector store requires query_embeddings")
+
+        include = include if include is not None else ["metadatas", "documents", "distances"]
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(len(query_embeddings), -1)
+
+        with self._lock:
+            self._sync()
+            rows = self._top_k(queries, n_results, where, where_document)
+
+            return {
+                "ids": [[self._ids[slot] for slot, _ in row] for row in rows],
+                "documents": [[self._documents[slot] for slot, _ in row] for row in rows] if "documents" in include else None,
+                "metadatas": [[self._metadatas[slot] for slot, _ in row] for row in rows] if "metadatas" in include else None,
+                "distances": [[distance for _, distance in row] for row in rows] if "distances" in include else None,
+                "embeddings": [[self._matrix[slot].tolist() for slot, _ in row] for row in rows] if "embeddings" in include else None,
+            }
+
+    # ====================
+    # SEARCH
+    # ====================
+
+    def _top_k(
+        self,
+        queries: np.ndarray,
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        where_document: Optional[Dict[str, Any]]
+    ) -> List[List[tuple]]:
+        """Rank candidates with one matrix product and argpartition per query"""
+        size = self._size
+        if not self._slots or self._matrix is None:
+            return [[] for _ in range(len(queries))]
+
+        mask = self._alive[:size].copy()
+        if where:
+            mask &= self._where_mask(where, size)
+        if where_document:
+            mask &= self._document_mask(where_document, size)
+
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return [[] for _ in range(len(queries))]
+
+        # Small filtered subsets are gathered; otherwise score every row
+        if candidates.size < size // 2:
+            distances = self._score(candidates, queries)
+        else:
+            distances = self._score(None, queries)[candidates]
+
+        k = min(n_results, candidates.size)
+
+        if self.quantization == "none":
+            top = np.argpartition(distances, k - 1, axis=0)[:k]
+            rows = []
+            for j in range(len(queries)):
+                order = top[:, j][np.argsort(distances[top[:, j], j], kind="stable")]
+                rows.append([(int(candidates[i]), float(distances[i, j])) for i in order])
+            return rows
+
+        # Compressed scores pick a shortlist; full precision decides the order
+        shortlist = min(candidates.size, k * self.rescore_factor)
+        top = np.argpartition(distances, shortlist - 1, axis=0)[:shortlist]
+
+        rows = []
+        for j in range(len(queries)):
+            slots = candidates[top[:, j]]
+            exact = self._distances(self._matrix[slots], self._norms[slots], queries[j:j + 1])[:, 0]
+            order = np.argsort(exact, kind="stable")[:k]
+            rows.append([(int(slots[i]), float(exact[i])) for i in order])
+        return rows
+
+    def _score(self, slots: Optional[np.ndarray], queries: np.ndarray) -> np.ndarray:
+        """Distances from the given slots (all used slots when None) to every query"""
+        if slots is None:
+            slots = slice(0, self._size)
+
+        if self.quantization == "none":
+            return self._distances(self._matrix[slots], self._norms[slots], queries)
+
+        compressed = self._compressed[slots]
+        dots = np.empty((len(compressed), len(queries)), dtype=np.float32)
+        for start in range(0, len(compressed), self.SCORE_CHUNK_ROWS):
+            block = compressed[start:start + self.SCORE_CHUNK_ROWS].astype(np.float32)
+            dots[start:start + self.SCORE_CHUNK_ROWS] = block @ queries.T
+        if self.quantization == "int8":
+            dots *= self._scales[slots][:, None]
+
+        return self._distances_from_dots(dots, self._norms[slots], queries)
+
+    def _distances(self, matrix: np.ndarray, norms: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Distance of every row to every query (rows x queries), using ChromaDB's definitions"""
+        return self._distances_from_dots(matrix @ queries.T, norms, queries)
+
+    def _distances_from_dots(self, dots: np.ndarray, norms: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Turn row/query dot products into distances for the collection metric"""
+        if self._metric == "l2":
+            query_norms = np.einsum("ij,ij->i", queries, queries)
+            return norms[:, None] ** 2 - 2 * dots + query_norms[None, :]
+        if self._metric == "ip":
+            return 1 - dots
+
+        query_norms = np.linalg.norm(queries, axis=1)
+        denominator = np.maximum(norms[:, None] * query_norms[None, :], 1e-12)
+        return 1 - dots / denominator
+
+    def _quantize(self, slots, vectors: np.ndarray):
+        """Write the compressed form of vectors into the search matrix"""
+        if self.quantization == "float16":
+            self._compressed[slots] = vectors.astype(np.float16)
+        elif self.quantization == "int8":
+            scales = np.abs(vectors).max(axis=-1) / 127
+            scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+            self._compressed[slots] = np.round(vectors / scales[..., None]).astype(np.int8)
+            self._scales[slots] = scales
+
+    def _where_mask(self, where: Dict[str, Any], size: int) -> np.ndarray:
+        """Evaluate a ChromaDB-style metadata filter against the columnar arrays"""
+        mask = np.ones(size, dtype=bool)
+
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._where_mask(clause, size)
+                continue
+            if key == "$or":
+                any_mask = np.zeros(size, dtype=bool)
+                for clause in condition:
+                    any_mask |= self._where_mask(clause, size)
+                mask &= any_mask
+                continue
+
+            column = self._columns.get(key)
+            values = column[:size] if column is not None else np.full(size, None, dtype=object)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+
+            for op, operand in condition.items():
+                mask &= self._compare(values, op, operand)
+
+        return mask
+
+    def _compare(self, values: np.ndarray, op: str, operand: Any) -> np.ndarray:
+        """Apply one filter operator to a metadata column"""
+        if op == "$eq":
+            return np.asarray(values == operand, dtype=bool)
+        if op == "$ne":
+            return np.asarray(values != operand, dtype=bool)
+        if op in ("$in", "$nin"):
+            allowed = set(operand)
+            matches = np.fromiter((v in allowed for v in values), dtype=bool, count=len(values))
+            return matches if op == "$in" else ~matches
+
+        compare = {
+            "$gt": lambda v: v > operand,
+            "$gte": lambda v: v >= operand,
+            "$lt": lambda v: v < operand,
+            "$lte": lambda v: v <= operand,
+        }.get(op)
+        if compare is None:
+            raise ValueError(f"Unsupported filter operator: {op}")
+
+        return np.fromiter(
+            (v is not None and compare(v) for v in values), dtype=bool, count=len(values)
+        )
+
+    def _document_mask(self, where_document: Dict[str, Any], size: int) -> np.ndarray:
+        """Evaluate a $contains / $not_contains document filter"""
+        mask = np.ones(size, dtype=bool)
+        for op, text in where_document.items():
+            contains = np.fromiter(
+                (doc is not None and text in doc for doc in self._documents[:size]),
+                dtype=bool,
+                count=size
+            )
+            if op == "$contains":
+                mask &= contains
+            elif op == "$not_contains":
+                mask &= ~contains
+            else:
+                raise ValueError(f"Unsupported document filter: {op}")
+        return mask
+
+    def _match(self, ids: Optional[List[str]], where: Optional[Dict[str, Any]]) -> List[int]:
+        """Slots matching the given IDs (in request order) and filter"""
+        if ids is not None:
+            slots = [self._slots[doc_id] for doc_id in ids if doc_id in self._slots]
+        else:
+            slots = np.flatnonzero(self._alive[:self._size]).tolist()
+
+        if where and slots:
+            mask = self._where_mask(where, self._size)
+            slots = [slot for slot in slots if mask[slot]]
+
+        return slots
+
+    # ====================
+    # STORAGE
+    # ====================
+
+    def _put(
+        self,
+        ids: List[str],
+        embeddings: Optional[List[List[float]]],
+        metadatas: Optional[List[Dict[str, Any]]],
+        documents: Optional[List[str]]
+    ):
+        """Write documents into their slots and append them to the log"""
+        if not ids:
+            return
+        if embeddings is None and any(doc_id not in self._slots for doc_id in ids):
+            raise ValueError("Local vector store requires embeddings for new documents")
+
+        vectors = None
+        if embeddings is not None:
+            vectors = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1)
+            if self._dimension is None:
+                self._dimension = vectors.shape[1]
+            if vectors.shape[1] != self._dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match collection dimension {self._dimension}"
+                )
+
+        with open(self._file("records.jsonl"), "a", encoding="utf-8") as log:
+            for i, doc_id in enumerate(ids):
+                slot = self._slots.get(doc_id)
+                if slot is None:
+                    slot = self._allocate()
+                    self._slots[doc_id] = slot
+                    self._ids[slot] = doc_id
+
+                metadata = metadatas[i] if metadatas else None
+                document = documents[i] if documents else None
+                self._set_record(slot, document, metadata)
+                if vectors is not None:
+                    self._matrix[slot] = vectors[i]
+                    self._norms[slot] = np.linalg.norm(vectors[i])
+                    self._quantize(slot, vectors[i])
+
+                log.write(json.dumps({
+                    "op": "put", "id": doc_id, "slot": slot,
+                    "document": document, "metadata": metadata,
+                }) + "\n")
+                self._log_entries += 1
+        self._mark_log_read()
+
+        self._matrix.flush()
+        self._maybe_compact()
+
+    def _set_record(self, slot: int, document: Optional[str], metadata: Optional[Dict[str, Any]]):
+        """Store a document and its metadata, updating the metadata columns"""
+        self._documents[slot] = document
+        self._metadatas[slot] = metadata
+        self._alive[slot] = True
+
+        for column in self._columns.values():
+            column[slot] = None
+        for key, value in (metadata or {}).items():
+            if key not in self._columns:
+                self._columns[key] = np.full(self._capacity, None, dtype=object)
+            self._columns[key][slot] = value
+
+    def _release(self, slot: int):
+        """Free a slot"""
+        del self._slots[self._ids[slot]]
+        self._ids[slot] = None
+        self._documents[slot] = None
+        self._metadatas[slot] = None
+        self._alive[slot] = False
+        for column in self._columns.values():
+            column[slot] = None
+        self._free.append(slot)
+
+    def _allocate(self) -> int:
+        """Take a free slot, growing the matrix when full"""
+        if self._free:
+            return self._free.pop()
+
+        if self._size >= self._capacity:
+            self._grow(max(self.INITIAL_CAPACITY, self._capacity * 2))
+
+        self._size += 1
+        return self._size - 1
+
+    def _grow(self, capacity: int, extend: bool = True):
+        """
+        Extend the embedding file and the in-memory arrays to a new capacity
+
+        Args:
+            capacity: New capacity
+            extend: False when another process already extended the file
+                (and wrote meta.json): only map it
+        """
+        path = self._file("embeddings.f32")
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+
+        if extend:
+            with open(path, "ab") as f:
+                f.truncate(capacity * self._dimension * 4)
+
+        self._matrix = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self._dimension))
+
+        extra = capacity - self._capacity
+        self._norms = np.concatenate([self._norms, np.zeros(extra, dtype=np.float32)])
+        if self.quantization != "none":
+            dtype = np.float16 if self.quantization == "float16" else np.int8
+            compressed = np.zeros((capacity, self._dimension), dtype=dtype)
+            if self._compressed is not None:
+                compressed[:self._capacity] = self._compressed
+            self._compressed = compressed
+            self._scales = np.concatenate([self._scales, np.zeros(extra, dtype=np.float32)])
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+        for key, column in self._columns.items():
+            self._columns[key] = np.concatenate([column, np.full(extra, None, dtype=object)])
+        self._ids.extend([None] * extra)
+        self._documents.extend([None] * extra)
+        self._metadatas.extend([None] * extra)
+
+        self._capacity = capacity
+        if extend:
+            self._write_meta()
+
+    def _write_meta(self):
+        """Persist dimension, capacity and metric"""
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "dimension": self._dimension,
+                "capacity": self._capacity,
+                "metric": self._metric,
+                "metadata": self.metadata,
+            }, f)
+        os.replace(tmp, self._file("meta.json"))
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        """Contents of meta.json, or None before the first write"""
+        meta_path = self._file("meta.json")
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _load(self):
+        """Map the embedding file and replay the record log"""
+        meta = self._read_meta()
+        if meta is None:
+            return
+
+        self._dimension = meta["dimension"]
+        self._metric = meta.get("metric", self._metric)
+        if meta["capacity"]:
+            self._grow(meta["capacity"], extend=False)
+
+        self._replay()
+
+        live = set(self._slots.values())
+        self._free = [slot for slot in range(self._size) if slot not in live]
+        if self._matrix is not None:
+            self._norms[:self._size] = np.linalg.norm(self._matrix[:self._size], axis=1)
+            if self.quantization != "none":
+                for start in range(0, self._size, self.SCORE_CHUNK_ROWS):
+                    end = min(start + self.SCORE_CHUNK_ROWS, self._size)
+                    self._quantize(slice(start, end), np.asarray(self._matrix[start:end]))
+
+        logger.info(f"Loaded local collection {self.name} with {len(self._slots)} documents")
+
+    def _replay(self) -> List[int]:
+        """
+        Apply the complete log records not applied yet
+
+        Returns:
+            Slots written by the applied records
+        """
+        try:
+            with open(self._file("records.jsonl"), "rb") as log:
+                self._log_inode = os.fstat(log.fileno()).st_ino
+                log.seek(self._log_offset)
+                data = log.read()
+        except FileNotFoundError:
+            return []
+
+        # A record still being appended is applied on a later call
+        end = data.rfind(b"\n") + 1
+        self._log_offset += end
+
+        # Read after the log, so it covers every slot the records use
+        meta = self._read_meta()
+        if meta and meta["capacity"] > self._capacity:
+            self._grow(meta["capacity"], extend=False)
+
+        written = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            self._log_entries += 1
+
+            if record["op"] == "del":
+                if record["id"] in self._slots:
+                    self._release(self._slots[record["id"]])
+                continue
+
+            slot = record["slot"]
+            self._slots[record["id"]] = slot
+            self._ids[slot] = record["id"]
+            self._size = max(self._size, slot + 1)
+            self._set_record(slot, record["document"], record["metadata"])
+            written.append(slot)
+
+        return written
+
+    def _sync(self):
+        """
+        Catch up with the writes of other processes (caller holds self._lock)
+        Costs one stat when nothing changed; a compacted log is reloaded whole
+        """
+        try:
+            stat = os.stat(self._file("records.jsonl"))
+        except FileNotFoundError:
+            return
+
+        if stat.st_ino != self._log_inode:
+            self._reset()
+            self._load()
+            return
+
+        if stat.st_size <= self._log_offset:
+            return
+
+        written = self._replay()
+        live = set(self._slots.values())
+        self._free = [slot for slot in range(self._size) if slot not in live]
+
+        if written:
+            slots = np.unique(written)
+            self._norms[slots] = np.linalg.norm(self._matrix[slots], axis=1)
+            self._quantize(slots, np.asarray(self._matrix[slots]))
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Hold the write lock shared with other processes, caught up with their writes"""
+        import fcntl
+
+        with open(self._file("write.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._sync()
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _mark_log_read(self):
+        """Record this process's own appends as applied (caller holds the write lock)"""
+        stat = os.stat(self._file("records.jsonl"))
+        self._log_inode = stat.st_ino
+        self._log_offset = stat.st_size
+
+    def _maybe_compact(self):
+        """Rewrite the record log once it is mostly superseded entries"""
+        if self._log_entries <= 2 * self.count() + 1000:
+            return
+
+        tmp = self._file("records.jsonl.tmp")
+        with open(tmp, "w", encoding="utf-8") as log:
+            for doc_id, slot in self._slots.items():
+                log.write(json.dumps({
+                    "op": "put", "id": doc_id, "slot": slot,
+                    "document": self._documents[slot], "metadata": self._metadatas[slot],
+                }) + "\n")
+        os.replace(tmp, self._file("records.jsonl"))
+        self._mark_log_read()
+        self._log_entries = len(self._slots)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self._path, name)
+
+    @staticmethod
+    def _select(values: Optional[List[Any]], indexes: List[int]) -> Optional[List[Any]]:
+        return [values[i] for i in indexes] if values is not None else None
+
+
+class LocalVectorClient:
+    """Minimal stand-in for chromadb clients, storing collections under one directory"""
+
+    def __init__(self, path: str, quantization: str = "none", rescore_factor: int = 4):
+        """
+        Initialize client
+
+        Args:
+            path: Root directory for collections
+            quantization: In-memory search vectors: none, float16 or int8
+            rescore_factor: Shortlist size, as a multiple of k, rescored at full precision
+        """
+        self.path = path
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        self._collections: Dict[str, LocalCollection] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> LocalCollection:
+        """Open a collection, creating it if needed"""
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = LocalCollection(
+                    os.path.join(self.path, name),
+                    name,
+                    metadata,
+                    quantization=self.quantization,
+                    rescore_factor=self.rescore_factor
+                )
+            return self._collections[name]
+
+    def get_collection(self, name: str) -> LocalCollection:
+        """
+        Open an existing collection
+
+        Raises:
+            ValueError: If the collection does not exist
+        """
+        if name not in self._collections and not os.path.exists(os.path.join(self.path, name, "meta.json")):
+            raise ValueError(f"Collection {name} does not exist")
+        return self.get_or_create_collection(name)
+
+    def delete_collection(self, name: str):
+        """Delete a collection and its files"""
+        with self._lock:
+            self._collections.pop(name, None)
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
@@ -0,0 +1,210 @@
+"""
+Prometheus Metrics for RAGSearch1
+Collectors are registered in the default registry, which the API
+exposes through the /metrics mount
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+
+# ====================
+# CACHES
+# ====================
+
+CACHE_HITS = Counter(
+    "ragsearch1_cache_hits_total",
+    "Number of cache hits",
+    ["cache"]
+)
+
+CACHE_MISSES = Counter(
+    "ragsearch1_cache_misses_total",
+    "Number of cache misses",
+    ["cache"]
+)
+
+CACHE_ENTRIES = Gauge(
+    "ragsearch1_cache_entries",
+    "Number of entries currently held in the cache",
+    ["cache"]
+)
+
+
+# ====================
+# WORKER POOLS
+# ====================
+
+POOL_WORKERS = Gauge(
+    "ragsearch1_pool_workers",
+    "Configured concurrency of the worker pool",
+    ["pool"]
+)
+
+POOL_ACTIVE = Gauge(
+    "ragsearch1_pool_active",
+    "Tasks currently running in the worker pool",
+    ["pool"]
+)
+
+POOL_QUEUED = Gauge(
+    "ragsearch1_pool_queued",
+    "Tasks waiting for a free slot in the worker pool",
+    ["pool"]
+)
+
+POOL_WAIT_SECONDS = Histogram(
+    "ragsearch1_pool_wait_seconds",
+    "Time tasks spend waiting for a free slot in the worker pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "ragsearch1_event_loop_lag_seconds",
+    "Delay of the event loop waking up from a timed sleep (time blocked by sync work)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+
+
+# ====================
+# REQUEST COALESCING
+# ====================
+
+SINGLEFLIGHT_CALLS = Counter(
+    "ragsearch1_singleflight_calls_total",
+    "Requests that started a shared call (leader) or joined one (coalesced)",
+    ["flight", "role"]
+)
+
+SINGLEFLIGHT_TIMEOUTS = Counter(
+    "ragsearch1_singleflight_timeouts_total",
+    "Shared calls that exceeded their timeout",
+    ["flight"]
+)
+
+
+# ====================
+# SCHEDULED JOBS
+# ====================
+
+JOB_RUNS = Counter(
+    "ragsearch1_job_runs_total",
+    "Scheduled job runs by outcome (success, failure, skipped, missed)",
+    ["job", "outcome"]
+)
+
+JOB_DURATION_SECONDS = Histogram(
+    "ragsearch1_job_duration_seconds",
+    "Duration of scheduled job runs",
+    ["job", "outcome"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+)
+
+JOB_QUEUE_WAIT_SECONDS = Histogram(
+    "ragsearch1_job_queue_wait_seconds",
+    "Time a due job waited for a free slot under MAX_CONCURRENT_TASKS",
+    ["job"],
+    buckets=(0.1, 1, 5, 15, 30, 60, 120, 300, 600)
+)
+
+
+# ====================
+# EMBEDDINGS
+# ====================
+
+EMBEDDING_TEXTS = Counter(
+    "ragsearch1_embedding_texts_total",
+    "Texts embedded through the embeddings API"
+)
+
+EMBEDDING_TOKENS = Counter(
+    "ragsearch1_embedding_tokens_total",
+    "Tokens sent to the embeddings API"
+)
+
+EMBEDDING_REQUEST_SECONDS = Histogram(
+    "ragsearch1_embedding_request_seconds",
+    "Duration of one embeddings API request",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32)
+)
+
+EMBEDDING_RETRIES = Counter(
+    "ragsearch1_embedding_retries_total",
+    "Embedding batches retried after a transient error",
+    ["reason"]
+)
+
+EMBEDDING_RATE_LIMIT_WAIT_SECONDS = Counter(
+    "ragsearch1_embedding_rate_limit_wait_seconds_total",
+    "Time embedding requests waited for the client-side rate limit",
+    ["bucket"]
+)
+
+EMBEDDING_THROUGHPUT = Gauge(
+    "ragsearch1_embedding_throughput_texts_per_second",
+    "Throughput of the last multi-batch embedding run"
+)
+
+
+# ====================
+# STREAMING INGEST
+# ====================
+
+PIPELINE_ITEMS = Counter(
+    "ragsearch1_pipeline_items_total",
+    "Items processed by a streaming pipeline stage (rate() gives throughput)",
+    ["pipeline", "stage"]
+)
+
+PIPELINE_QUEUE_DEPTH = Gauge(
+    "ragsearch1_pipeline_queue_depth",
+    "Batches waiting in front of a streaming pipeline stage",
+    ["pipeline", "stage"]
+)
+
+PIPELINE_BATCH_SECONDS = Histogram(
+    "ragsearch1_pipeline_batch_seconds",
+    "Time a streaming pipeline stage spends on one batch",
+    ["pipeline", "stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+
+# ====================
+# RAG
+# ====================
+
+ASK_STREAM_FIRST_TOKEN_SECONDS = Histogram(
+    "ragsearch1_ask_stream_first_token_seconds",
+    "Time from request to the first streamed answer token",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32)
+)
+
+ASK_STREAMS_CANCELLED = Counter(
+    "ragsearch1_ask_streams_cancelled_total",
+    "Streamed answers cancelled because the client disconnected"
+)
+
+LLM_PROMPT_TOKENS = Histogram(
+    "ragsearch1_llm_prompt_tokens",
+    "Tokens in prompts sent to the LLM",
+    buckets=(250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000)
+)
+
+LLM_COMPLETION_TOKENS = Histogram(
+    "ragsearch1_llm_completion_tokens",
+    "Tokens in LLM completions",
+    buckets=(50, 100, 250, 500, 1000, 2000, 4000)
+)
+
+RERANK_SECONDS = Histogram(
+    "ragsearch1_rerank_seconds",
+    "Time spent scoring candidates with the cross-encoder",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.15, 0.25, 0.5, 1)
+)
+
+RERANK_FALLBACKS = Counter(
+    "ragsearch1_rerank_fallbacks_total",
+    "Searches that kept retrieval order instead of reranking",
+    ["reason"]
+)
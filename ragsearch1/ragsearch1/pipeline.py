@@ -0,0 +1,188 @@
+"""
+Streaming Pipeline for RAGSearch1
+Runs items through a chain of async stages connected by bounded queues, so
+network, CPU and write work overlap and a slow stage holds back the ones
+before it instead of letting batches pile up in memory
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from .metrics import PIPELINE_BATCH_SECONDS, PIPELINE_ITEMS, PIPELINE_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+# Queued after the last batch of a stage's input
+_DONE = object()
+
+
+class Stage:
+    """One step of a StreamingPipeline"""
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[List[Any]], Awaitable[Optional[List[Any]]]],
+        batch_size: int,
+        concurrency: int = 1
+    ):
+        """
+        Initialize stage
+
+        Args:
+            name: Stage name used as metrics label
+            fn: Coroutine function taking a batch of items and returning the
+                items for the next stage (None or [] to pass nothing on)
+            batch_size: Items per call to fn
+            concurrency: Batches processed at the same time
+        """
+        self.name = name
+        self.fn = fn
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+
+
+class _Output:
+    """Re-batches a stage's output to the batch size of the next stage"""
+
+    def __init__(self, queue: Optional[asyncio.Queue], batch_size: int, gauge: Any):
+        self.queue = queue
+        self.batch_size = batch_size
+        self.gauge = gauge
+        self._buffer: List[Any] = []
+
+    async def put(self, items: List[Any]):
+        if self.queue is None:
+            return
+        self._buffer.extend(items)
+        while len(self._buffer) >= self.batch_size:
+            batch, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+            await self._send(batch)
+
+    async def close(self):
+        if self.queue is None:
+            return
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            await self._send(batch)
+        await self.queue.put(_DONE)
+
+    async def _send(self, batch: List[Any]):
+        await self.queue.put(batch)
+        self.gauge.set(self.queue.qsize())
+
+
+class StreamingPipeline:
+    """
+    Feeds items from an async source through stages in order
+    Each stage reads batches from a bounded queue: when it falls behind, the
+    queue fills and the previous stage (ultimately the source) waits. A
+    failing stage cancels the run and the error propagates to the caller.
+    """
+
+    def __init__(self, name: str, stages: List[Stage], queue_size: int):
+        """
+        Initialize pipeline
+
+        Args:
+            name: Pipeline name used as metrics label
+            stages: Stages in processing order
+            queue_size: Batches buffered in front of each stage
+        """
+        self.name = name
+        self.stages = stages
+        self.queue_size = queue_size
+
+    async def run(self, source: AsyncIterator[List[Any]], source_name: str = "collect") -> Dict[str, Dict[str, Any]]:
+        """
+        Run the source through all stages until it is exhausted
+
+        Args:
+            source: Async iterator of item batches (any size)
+            source_name: Name of the source in stats and metrics
+
+        Returns:
+            Per-stage stats: items, busy_seconds (time spent in the stage,
+            summed over its workers) and items_per_sec
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        gauges = [PIPELINE_QUEUE_DEPTH.labels(pipeline=self.name, stage=stage.name) for stage in self.stages]
+        # Output of stage i feeds stage i + 1; the last stage's output is dropped
+        outputs = [
+            _Output(queues[i], self.stages[i].batch_size, gauges[i]) for i in range(1, len(self.stages))
+        ] + [_Output(None, 0, None)]
+        stats = {
+            name: {"items": 0, "busy_seconds": 0.0, "first": None, "last": None}
+            for name in [source_name] + [stage.name for stage in self.stages]
+        }
+
+        def record(name: str, count: int, batch_started: float):
+            now = time.perf_counter()
+            entry = stats[name]
+            entry["items"] += count
+            entry["busy_seconds"] += now - batch_started
+            entry["first"] = batch_started if entry["first"] is None else min(entry["first"], batch_started)
+            entry["last"] = now
+            PIPELINE_ITEMS.labels(pipeline=self.name, stage=name).inc(count)
+
+        async def feed():
+            output = _Output(queues[0], self.stages[0].batch_size, gauges[0])
+            try:
+                batch_started = time.perf_counter()
+                async for batch in source:
+                    record(source_name, len(batch), batch_started)
+                    await output.put(batch)
+                    batch_started = time.perf_counter()
+            finally:
+                if hasattr(source, "aclose"):
+                    await source.aclose()
+            await output.close()
+
+        async def work(i: int):
+            stage, queue = self.stages[i], queues[i]
+            while True:
+                batch = await queue.get()
+                gauges[i].set(queue.qsize())
+                if batch is _DONE:
+                    # Let the stage's other workers see it too
+                    queue.put_nowait(_DONE)
+                    return
+
+                batch_started = time.perf_counter()
+                result = await stage.fn(batch)
+                PIPELINE_BATCH_SECONDS.labels(pipeline=self.name, stage=stage.name).observe(
+                    time.perf_counter() - batch_started
+                )
+                record(stage.name, len(batch), batch_started)
+
+                if result:
+                    await outputs[i].put(result)
+
+        async def run_stage(i: int):
+            await asyncio.gather(*(work(i) for _ in range(self.stages[i].concurrency)))
+            await outputs[i].close()
+
+        tasks = [asyncio.ensure_future(feed())] + [
+            asyncio.ensure_future(run_stage(i)) for i in range(len(self.stages))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for gauge in gauges:
+                gauge.set(0)
+
+        for entry in stats.values():
+            # Throughput over the window the stage was active in
+            window = (entry.pop("last") or 0) - (entry.pop("first") or 0)
+            entry["busy_seconds"] = round(entry["busy_seconds"], 3)
+            entry["items_per_sec"] = round(entry["items"] / window, 1) if window > 0 else None
+
+        logger.info(
+            f"Pipeline {self.name}: "
+            + ", ".join(f"{name} {entry['items']} ({entry['items_per_sec'] or 0:.0f}/s)" for name, entry in stats.items())
+        )
+        return stats
@@ -7,10 +7,10 @@ import re
 import hashlib
 from typing import List, Dict, Any, Optional
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from openai import OpenAI
 import logging
 
 from .config import settings
+from .embeddings import get_embedding_provider
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +22,8 @@ class DataProcessor:
     """
 
     def __init__(self):
-        """Initialize processor with OpenAI client"""
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        """Initialize processor with the configured embedding provider"""
+        self.embedding_provider = get_embedding_provider()
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.CHUNK_SIZE,
             chunk_overlap=settings.CHUNK_OVERLAP,
@@ -150,7 +150,7 @@ class DataProcessor:
 
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        Generate embeddings for texts using OpenAI
+        Generate embeddings for texts with the configured provider
 
         Args:
             texts: List of texts to embed
@@ -159,41 +159,59 @@ class DataProcessor:
             List of embedding vectors
         """
         try:
-            # OpenAI has a limit of 2048 texts per request
-            batch_size = 2048
-            all_embeddings = []
+            embeddings = self.embedding_provider.embed_documents(texts)
+            logger.info(f"Generated {len(embeddings)} embeddings ({self.embedding_provider.name})")
+            return embeddings
 
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-
-                response = self.openai_client.embeddings.create(
-                    model=settings.OPENAI_EMBEDDING_MODEL,
-                    input=batch
-                )
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings: {e}")
+            raise
 
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
+    async def agenerate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async variant of generate_embeddings(), sending batches concurrently
 
-                logger.info(f"Generated embeddings for batch {i // batch_size + 1}")
+        Args:
+            texts: List of texts to embed
 
-            return all_embeddings
+        Returns:
+            List of embedding vectors
+        """
+        try:
+            embeddings = await self.embedding_provider.aembed_documents(texts)
+            logger.info(f"Generated {len(embeddings)} embeddings ({self.embedding_provider.name})")
+            return embeddings
 
         except Exception as e:
             logger.error(f"Failed to generate embeddings: {e}")
             raise
 
-    def process_entity_batch(
+    def content_hash(self, document: str) -> str:
+        """
+        Hash of a document's text, stored in metadata to detect changes
+
+        Args:
+            document: Output of create_document_text()
+
+        Returns:
+            SHA-256 hex digest
+        """
+        return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+    def prepare_entity_batch(
         self,
-        entities: List[Dict[str, Any]]
-    ) -> tuple[List[str], List[Dict[str, Any]], List[str], List[List[float]]]:
+        entities: List[Dict[str, Any]],
+        scope: Optional[str] = None
+    ) -> tuple[List[str], List[Dict[str, Any]], List[str]]:
         """
-        Process a batch of entities for vector storage
+        Build documents and metadata for a batch of entities, without embeddings
 
         Args:
             entities: List of raw entity dicts
+            scope: Ingest scope recorded in metadata (the job owning the documents)
 
         Returns:
-            Tuple of (documents, metadatas, ids, embeddings)
+            Tuple of (documents, metadatas, ids)
         """
         documents = []
         metadatas = []
@@ -206,17 +224,44 @@ class DataProcessor:
             # Create document text
             doc_text = self.create_document_text(normalized)
 
-            # Store
-            documents.append(doc_text)
-            metadatas.append({
+            metadata = {
                 "name": normalized["name"],
                 "type": normalized["type"],
                 "country": normalized["country"],
                 "api_available": normalized["api_available"],
                 "url": normalized["url"],
-            })
+                "rating": float(normalized["rating"] or 0.0),
+                "content_hash": self.content_hash(doc_text),
+            }
+            if scope:
+                metadata["ingest_scope"] = scope
+            if entity.get("source"):
+                metadata["source"] = entity["source"]
+
+            # Store
+            documents.append(doc_text)
+            metadatas.append(metadata)
             ids.append(normalized["id"])
 
+        return documents, metadatas, ids
+
+    def process_entity_batch(
+        self,
+        entities: List[Dict[str, Any]],
+        scope: Optional[str] = None
+    ) -> tuple[List[str], List[Dict[str, Any]], List[str], List[List[float]]]:
+        """
+        Process a batch of entities for vector storage
+
+        Args:
+            entities: List of raw entity dicts
+            scope: Ingest scope recorded in metadata
+
+        Returns:
+            Tuple of (documents, metadatas, ids, embeddings)
+        """
+        documents, metadatas, ids = self.prepare_entity_batch(entities, scope)
+
         # Generate embeddings for all documents
         embeddings = self.generate_embeddings(documents)
 
@@ -224,6 +269,116 @@ class DataProcessor:
 
         return documents, metadatas, ids, embeddings
 
+    def plan_ingest(
+        self,
+        entities: List[Dict[str, Any]],
+        stored: Dict[str, Dict[str, Any]],
+        scope: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Diff collected entities against stored documents by content hash
+        Only new and changed documents need embedding; documents whose text is
+        unchanged but whose metadata differs (e.g. rating) are refreshed in place
+
+        Args:
+            entities: List of raw entity dicts
+            stored: Metadata of the documents in the collection, by ID
+            scope: Ingest scope of this run; stored documents of the same scope
+                missing from the batch are reported as removed
+
+        Returns:
+            Dict with the batch (documents, metadatas, ids) and ID lists:
+            new, changed, refreshed, unchanged, removed
+        """
+        return self.plan_prepared(self.prepare_entity_batch(entities, scope), stored, scope)
+
+    def plan_prepared(
+        self,
+        prepared: tuple[List[str], List[Dict[str, Any]], List[str]],
+        stored: Dict[str, Dict[str, Any]],
+        scope: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        plan_ingest() for a batch already built by prepare_entity_batch()
+
+        Args:
+            prepared: Tuple of (documents, metadatas, ids)
+            stored: Metadata of the documents in the collection, by ID
+            scope: Ingest scope of this run
+
+        Returns:
+            Same dict as plan_ingest()
+        """
+        documents, metadatas, ids = [], [], []
+        positions: Dict[str, int] = {}
+
+        # The same ID can come from several sources: keep the preferred
+        # version (see version_rank), whatever order they arrived in
+        for document, metadata, entity_id in zip(*prepared):
+            if entity_id in positions:
+                i = positions[entity_id]
+                if self.version_rank(metadata) < self.version_rank(metadatas[i]):
+                    documents[i] = document
+                    metadatas[i] = metadata
+                continue
+            positions[entity_id] = len(ids)
+            documents.append(document)
+            metadatas.append(metadata)
+            ids.append(entity_id)
+
+        plan = {
+            "documents": documents,
+            "metadatas": metadatas,
+            "ids": ids,
+            "new": [],
+            "changed": [],
+            "refreshed": [],
+            "unchanged": [],
+            "removed": [],
+        }
+
+        for metadata, entity_id in zip(metadatas, ids):
+            current = stored.get(entity_id)
+            if current is None:
+                plan["new"].append(entity_id)
+            elif current.get("content_hash") != metadata["content_hash"]:
+                plan["changed"].append(entity_id)
+            elif self._without_scope(current) != self._without_scope(metadata):
+                plan["refreshed"].append(entity_id)
+            else:
+                plan["unchanged"].append(entity_id)
+
+        if scope:
+            plan["removed"] = [
+                entity_id
+                for entity_id, metadata in stored.items()
+                if (metadata or {}).get("ingest_scope") == scope and entity_id not in positions
+            ]
+
+        return plan
+
+    @staticmethod
+    def version_rank(metadata: Dict[str, Any]) -> tuple:
+        """
+        Preference between versions of the same ID (lower wins)
+        Sources are ranked by INGEST_SOURCE_PRIORITY (unlisted or untagged
+        ones last); the content hash breaks ties between versions of one source
+
+        Args:
+            metadata: Document metadata
+
+        Returns:
+            Sortable rank
+        """
+        priority = settings.INGEST_SOURCE_PRIORITY_LIST
+        source = metadata.get("source")
+        return (priority.index(source) if source in priority else len(priority), metadata["content_hash"])
+
+    @staticmethod
+    def _without_scope(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Metadata compared between runs (the owning scope may differ between jobs)"""
+        return {key: value for key, value in metadata.items() if key != "ingest_scope"}
+
     def extract_metadata(self, entity: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract relevant metadata from entity
@@ -310,3 +465,15 @@ processor = DataProcessor()
 def get_processor() -> DataProcessor:
     """Get global processor instance"""
     return processor
+
+
+# Process pool entry point: module-level so it pickles by name, and runs on
+# the global processor of the worker process
+
+def prepare_entities(
+    entities: List[Dict[str, Any]],
+    scope: Optional[str] = None
+) -> tuple[List[str], List[Dict[str, Any]], List[str]]:
+    """prepare_entity_batch() on the global processor"""
+    return processor.prepare_entity_batch(entities, scope)
+
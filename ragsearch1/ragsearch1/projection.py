@@ -0,0 +1,279 @@
+"""
+Embedding Projection for RAGSearch1
+PCA projection fitted on the collection's embeddings, used to search a
+reduced-dimension copy of the collection
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def reduced_collection_name(collection_name: str, components: int) -> str:
+    """Name of the reduced-dimension copy of a collection"""
+    return f"{collection_name}_pca{components}"
+
+
+def projection_path(collection_name: str, components: int) -> str:
+    """
+    File holding the projection fitted for a collection
+    Stored next to the collection unless PROJECTION_DIR is set
+    """
+    directory = settings.PROJECTION_DIR or (
+        settings.LOCAL_VECTOR_DIR if settings.VECTOR_BACKEND == "local" else settings.CHROMA_PERSIST_DIR
+    )
+    return os.path.join(directory, f"{reduced_collection_name(collection_name, components)}.npz")
+
+
+class PCAProjection:
+    """
+    Linear projection onto the top principal components
+    Projected vectors are L2-normalized so cosine search keeps working
+    """
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, explained_variance_ratio: float):
+        """
+        Initialize projection
+
+        Args:
+            mean: Mean embedding (dimension,)
+            components: Principal axes (n_components x dimension)
+            explained_variance_ratio: Share of variance kept by the components
+        """
+        self.mean = mean.astype(np.float32)
+        self.components = components.astype(np.float32)
+        self.explained_variance_ratio = float(explained_variance_ratio)
+
+    @property
+    def input_dimension(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def output_dimension(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, n_components: int) -> "PCAProjection":
+        """
+        Fit a projection from the eigenvectors of the covariance matrix
+
+        Args:
+            vectors: Embeddings (n x dimension)
+            n_components: Output dimension
+
+        Returns:
+            Fitted projection
+
+        Raises:
+            ValueError: If there are fewer vectors or dimensions than components
+        """
+        vectors = np.asarray(vectors, dtype=np.float64)
+        if n_components > min(vectors.shape):
+            raise ValueError(
+                f"Cannot fit {n_components} components on {vectors.shape[0]} vectors of dimension {vectors.shape[1]}"
+            )
+
+        mean = vectors.mean(axis=0)
+        centered = vectors - mean
+        covariance = centered.T @ centered / max(len(vectors) - 1, 1)
+
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:n_components]
+        explained = eigenvalues[order].sum() / max(eigenvalues.sum(), 1e-12)
+
+        return cls(mean, eigenvectors[:, order].T, explained)
+
+    def transform(self, vectors: Any) -> np.ndarray:
+        """
+        Project embeddings
+
+        Args:
+            vectors: Embeddings (n x dimension)
+
+        Returns:
+            Normalized projected vectors (n x n_components)
+        """
+        projected = (np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components.T
+        norms = np.linalg.norm(projected, axis=1, keepdims=True)
+        return projected / np.maximum(norms, 1e-12)
+
+    def save(self, path: str):
+        """Write the projection to an .npz file"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            path,
+            mean=self.mean,
+            components=self.components,
+            explained_variance_ratio=np.float64(self.explained_variance_ratio)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "PCAProjection":
+        """Read a projection written by save()"""
+        with np.load(path) as data:
+            return cls(data["mean"], data["components"], float(data["explained_variance_ratio"]))
+
+
+def load_projection(collection_name: str, components: int) -> Optional[PCAProjection]:
+    """
+    Load the fitted projection for a collection
+
+    Returns:
+        Projection, or None when none has been fitted
+    """
+    path = projection_path(collection_name, components)
+    if not os.path.exists(path):
+        return None
+
+    projection = PCAProjection.load(path)
+    logger.info(
+        f"Loaded PCA projection {projection.input_dimension}->{projection.output_dimension} "
+        f"({projection.explained_variance_ratio:.1%} variance)"
+    )
+    return projection
+
+
+def build_reduced_collection(
+    client: Any,
+    collection: Any,
+    projection: PCAProjection,
+    batch_size: int = 1000
+) -> Any:
+    """
+    Recreate the reduced-dimension copy of a collection
+
+    Args:
+        client: Vector database client owning the collection
+        collection: Full-dimension collection
+        projection: Fitted projection
+        batch_size: Documents copied per batch
+
+    Returns:
+        Reduced collection
+    """
+    name = reduced_collection_name(collection.name, projection.output_dimension)
+    try:
+        client.delete_collection(name=name)
+    except Exception:
+        pass  # Did not exist yet
+
+    reduced = client.get_or_create_collection(
+        name=name,
+        metadata={
+            "description": f"PCA-{projection.output_dimension} projection of {collection.name}",
+            "dimension": projection.output_dimension,
+            "metric": "cosine",
+            "hnsw:space": "cosine",
+        }
+    )
+
+    total = collection.count()
+    for offset in range(0, total, batch_size):
+        batch = collection.get(
+            include=["embeddings", "documents", "metadatas"],
+            limit=batch_size,
+            offset=offset
+        )
+        if not batch["ids"]:
+            break
+
+        reduced.add(
+            ids=batch["ids"],
+            embeddings=projection.transform(batch["embeddings"]).tolist(),
+            documents=batch["documents"],
+            metadatas=batch["metadatas"]
+        )
+
+    logger.info(f"Built reduced collection {name} with {reduced.count()} documents")
+    return reduced
+
+
+def fit_projection(collection: Any, n_components: int) -> PCAProjection:
+    """
+    Fit a projection on every embedding stored in a collection
+
+    Args:
+        collection: Full-dimension collection
+        n_components: Output dimension
+
+    Returns:
+        Fitted projection
+    """
+    data = collection.get(include=["embeddings"])
+    vectors = np.asarray(data["embeddings"], dtype=np.float32)
+    projection = PCAProjection.fit(vectors, n_components)
+
+    logger.info(
+        f"Fitted PCA {vectors.shape[1]}->{n_components} on {len(vectors)} embeddings "
+        f"({projection.explained_variance_ratio:.1%} variance kept)"
+    )
+    return projection
+
+
+def recall_at_k(approximate: List[List[str]], exact: List[List[str]]) -> float:
+    """Mean share of the exact top-k found by the approximate search"""
+    if not exact:
+        return 0.0
+    return sum(
+        len(set(a) & set(e)) / max(len(e), 1) for a, e in zip(approximate, exact)
+    ) / len(exact)
+
+
+def evaluate_projection(
+    collection: Any,
+    reduced: Any,
+    projection: PCAProjection,
+    n_queries: int = 200,
+    k: int = 10,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Compare the reduced collection against the full-dimension one
+    Queries are stored embeddings with small noise added
+
+    Returns:
+        Dict with recall@k and mean/p99 latency for both collections
+    """
+    import time
+
+    data = collection.get(include=["embeddings"])
+    vectors = np.asarray(data["embeddings"], dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+    queries = vectors[picks] + 0.01 * rng.standard_normal(vectors[picks].shape).astype(np.float32)
+
+    def run(target, query_vectors):
+        latencies, results = [], []
+        for query in query_vectors:
+            start = time.perf_counter()
+            result = target.query(query_embeddings=[query.tolist()], n_results=k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append(result["ids"][0])
+        return latencies, results
+
+    full_latencies, exact = run(collection, queries)
+    reduced_latencies, approximate = run(reduced, projection.transform(queries))
+
+    def summary(latencies):
+        ordered = sorted(latencies)
+        return {
+            "mean_ms": round(float(np.mean(ordered)), 2),
+            "p99_ms": round(ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)], 2),
+        }
+
+    return {
+        "queries": len(queries),
+        "k": k,
+        "dimension": projection.input_dimension,
+        "reduced_dimension": projection.output_dimension,
+        "explained_variance_ratio": round(projection.explained_variance_ratio, 4),
+        "recall": round(recall_at_k(approximate, exact), 4),
+        "full": summary(full_latencies),
+        "reduced": summary(reduced_latencies),
+    }
@@ -0,0 +1,126 @@
+"""
+Reranking for RAGSearch1
+Scores (query, document) pairs with a local sentence-transformers
+cross-encoder on CPU, within a per-request latency budget
+"""
+
+import logging
+import threading
+import time
+from typing import List, Dict, Any, Optional
+
+from .config import settings
+from .metrics import RERANK_FALLBACKS, RERANK_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class CrossEncoderReranker:
+    """
+    Cross-encoder reranker with a latency budget
+    The model loads in a background thread on first use; until it is ready,
+    or when scoring would exceed the budget, results keep their retrieval order
+    """
+
+    def __init__(self, model_name: str, batch_size: int, budget_ms: int):
+        """
+        Initialize reranker
+
+        Args:
+            model_name: sentence-transformers cross-encoder model
+            batch_size: Pairs scored per model call
+            budget_ms: Per-request scoring budget in milliseconds
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.budget_ms = budget_ms
+        self._model = None
+        self._loading = False
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def rerank(
+        self,
+        query: str,
+        results: List[Dict[str, Any]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Reorder results by cross-encoder score
+
+        Args:
+            query: Search query
+            results: Candidate results, best first
+            limit: Number of results to return
+
+        Returns:
+            Top results; reranked ones carry a 'rerank_score'
+        """
+        if len(results) <= 1:
+            return results[:limit]
+
+        model = self._get_model()
+        if model is None:
+            RERANK_FALLBACKS.labels(reason="unavailable").inc()
+            return results[:limit]
+
+        started_at = time.perf_counter()
+        deadline = started_at + self.budget_ms / 1000
+        scores: List[float] = []
+
+        for i in range(0, len(results), self.batch_size):
+            if time.perf_counter() > deadline:
+                RERANK_FALLBACKS.labels(reason="budget").inc()
+                logger.warning(f"Rerank budget of {self.budget_ms}ms exceeded, keeping retrieval order")
+                return results[:limit]
+
+            batch = results[i:i + self.batch_size]
+            scores.extend(
+                float(score) for score in
+                model.predict([(query, result["document"]) for result in batch], batch_size=self.batch_size)
+            )
+
+        RERANK_SECONDS.observe(time.perf_counter() - started_at)
+
+        ranked = sorted(zip(scores, range(len(results))), key=lambda item: (-item[0], item[1]))
+        return [
+            {**results[i], "rerank_score": round(score, 4)}
+            for score, i in ranked[:limit]
+        ]
+
+    def _get_model(self) -> Optional[Any]:
+        """Return the loaded model, starting the background load if needed"""
+        if self._model is not None or self._failed:
+            return self._model
+
+        with self._lock:
+            if not self._loading:
+                self._loading = True
+                threading.Thread(target=self._load, name="ragsearch1-rerank-load", daemon=True).start()
+
+        return None
+
+    def _load(self):
+        """Load the cross-encoder (runs in a background thread)"""
+        try:
+            from sentence_transformers import CrossEncoder
+
+            self._model = CrossEncoder(self.model_name, device="cpu")
+            logger.info(f"Rerank model {self.model_name} loaded")
+
+        except Exception as e:
+            self._failed = True
+            logger.error(f"Failed to load rerank model {self.model_name}: {e}")
+
+
+# Global reranker instance
+reranker = CrossEncoderReranker(
+    model_name=settings.RERANK_MODEL,
+    batch_size=settings.RERANK_BATCH_SIZE,
+    budget_ms=settings.RERANK_BUDGET_MS
+)
+
+
+def get_reranker() -> CrossEncoderReranker:
+    """Get global reranker instance"""
+    return reranker
@@ -4,14 +4,31 @@ Implements Retrieval-Augmented Generation for intelligent search
 Uses Langchain + ChromaDB + OpenAI
 """
 
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from typing import AsyncIterator, Awaitable, Callable, Hashable, Iterable, List, Dict, Any, Optional
 from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import ChatOpenAI
 from langchain_community.vectorstores import Chroma
 
+from .cache import (
+    LRUCache,
+    get_answer_cache,
+    get_collection_version,
+    get_result_cache,
+    normalize_query,
+)
 from .config import settings
+from .executor import get_executor, get_llm_limiter
+from .lexical import InvertedIndex, get_lexical_index
+from .context import get_context_packer
+from .embeddings import get_embedding_provider
+from .metrics import ASK_STREAM_FIRST_TOKEN_SECONDS, LLM_COMPLETION_TOKENS, LLM_PROMPT_TOKENS
+from .rerank import get_reranker
+from .singleflight import SingleFlight
 from .vectordb import get_vector_db
 
 logger = logging.getLogger(__name__)
@@ -26,10 +43,20 @@ class RAGRetriever:
     def __init__(self):
         """Initialize RAG retriever"""
         self.vector_db = get_vector_db()
-        self.embeddings = OpenAIEmbeddings(
-            model=settings.OPENAI_EMBEDDING_MODEL,
-            openai_api_key=settings.OPENAI_API_KEY
+        self.embeddings = get_embedding_provider()
+        self.embedding_cache = LRUCache(
+            name="query_embedding",
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            ttl=settings.EMBEDDING_CACHE_TTL
         )
+        self.result_cache = get_result_cache()
+        self.answer_cache = get_answer_cache()
+        self.context_packer = get_context_packer()
+        self.search_flight = SingleFlight("search")
+        self.ask_flight = SingleFlight("ask")
+        self._lexical_lock = threading.Lock()
+        self._lexical_built_at = 0.0
+        self._lexical_rebuilding = False
         self.llm = ChatOpenAI(
             model=settings.OPENAI_MODEL,
             temperature=settings.OPENAI_TEMPERATURE,
@@ -63,6 +90,144 @@ Answer in a clear, professional manner with specific details:"""
         # In production, this would integrate directly with ChromaDB via Langchain
         logger.info("RAG retriever initialized")
 
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Get the embedding for a query, reusing cached embeddings when possible
+        Only the cache key is normalized: the provider embeds the query as written
+
+        Args:
+            query: Search query
+
+        Returns:
+            Query embedding vector
+        """
+        if not settings.EMBEDDING_CACHE_ENABLE:
+            return self.embeddings.embed_query(query)
+
+        key = (self.embeddings.model, normalize_query(query))
+        embedding = self.embedding_cache.get(key)
+
+        if embedding is None:
+            embedding = self.embeddings.embed_query(query)
+            self.embedding_cache.set(key, embedding)
+
+        return embedding
+
+    async def aembed_query(self, query: str) -> List[float]:
+        """Async variant of embed_query(), using the async embeddings client"""
+        if not settings.EMBEDDING_CACHE_ENABLE:
+            return await self.embeddings.aembed_query(query)
+
+        key = (self.embeddings.model, normalize_query(query))
+        embedding = self.embedding_cache.get(key)
+
+        if embedding is None:
+            embedding = await self.embeddings.aembed_query(query)
+            self.embedding_cache.set(key, embedding)
+
+        return embedding
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Get embeddings for several queries with a single embedding request
+        Cached embeddings are reused; only the missing queries are sent, as
+        written (the first of those sharing a normalized cache key)
+
+        Args:
+            queries: Search queries
+
+        Returns:
+            Query embedding vectors, in input order
+        """
+        keys = [normalize_query(q) for q in queries]
+        embeddings: Dict[str, List[float]] = {}
+
+        if settings.EMBEDDING_CACHE_ENABLE:
+            for key in set(keys):
+                cached = self.embedding_cache.get((self.embeddings.model, key))
+                if cached is not None:
+                    embeddings[key] = cached
+
+        missing: Dict[str, str] = {}
+        for key, query in zip(keys, queries):
+            if key not in embeddings:
+                missing.setdefault(key, query)
+
+        if missing:
+            computed = self.embeddings.embed_documents(list(missing.values()))
+            for key, embedding in zip(missing, computed):
+                embeddings[key] = embedding
+                if settings.EMBEDDING_CACHE_ENABLE:
+                    self.embedding_cache.set((self.embeddings.model, key), embedding)
+
+        return [embeddings[key] for key in keys]
+
+    def _cached(self, namespace: str, params: Dict[str, Any], compute):
+        """
+        Serve a result from the shared result cache when caching is enabled
+
+        Args:
+            namespace: Cache namespace
+            params: Parameters identifying the result
+            compute: Function producing the result on a miss
+
+        Returns:
+            Cached or freshly computed result
+        """
+        if not settings.CACHE_ENABLE:
+            return compute()
+
+        return self.result_cache.get_or_compute(namespace, params, compute)
+
+    async def _acached(self, namespace: str, params: Dict[str, Any], compute):
+        """
+        Async variant of _cached()
+        Redis is accessed through a sync client, so lookups run in the retrieval pool
+
+        Args:
+            namespace: Cache namespace
+            params: Parameters identifying the result
+            compute: Coroutine function producing the result on a miss
+
+        Returns:
+            Cached or freshly computed result
+        """
+        if not settings.CACHE_ENABLE:
+            return await compute()
+
+        pool = get_executor("retrieval")
+        key, value = await pool.run(self.result_cache.lookup, namespace, params)
+        if value is not None:
+            return value
+
+        value = await compute()
+        await pool.run(self.result_cache.store, key, value)
+        return value
+
+    async def _coalesce(
+        self,
+        flight: SingleFlight,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: float
+    ) -> Any:
+        """
+        Run fn through a single-flight group when coalescing is enabled
+
+        Args:
+            flight: Single-flight group
+            key: Normalized request key
+            fn: Coroutine function performing the request
+            timeout: Seconds before the shared call fails
+
+        Returns:
+            Result of fn (shared with concurrent identical requests)
+        """
+        if not settings.SINGLEFLIGHT_ENABLE:
+            return await fn()
+
+        return await flight.run(key, fn, timeout=timeout)
+
     def search(
         self,
         query: str,
@@ -70,7 +235,8 @@ Answer in a clear, professional manner with specific details:"""
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
-        Search for financial entities using vector similarity
+        Search for financial entities using vector similarity, fused with
+        BM25 lexical matches when hybrid search is enabled
 
         Args:
             query: Search query
@@ -81,45 +247,421 @@ Answer in a clear, professional manner with specific details:"""
             List of matching entities
         """
         try:
-            # Build where clause from filters
-            where = {}
-            if filters:
-                if filters.get("country"):
-                    where["country"] = filters["country"]
-                if filters.get("type"):
-                    where["type"] = filters["type"]
-
-            # Query vector database
-            results = self.vector_db.query(
-                query_texts=[query],
-                n_results=limit,
-                where=where if where else None
+            return self._cached(
+                "search",
+                {"query": normalize_query(query), "limit": limit, "filters": filters or {}},
+                lambda: self._search(query, limit, filters)
             )
 
-            # Format results
-            formatted_results = []
-            for i in range(len(results['ids'][0])):
-                similarity = 1 - results['distances'][0][i]
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            return []
+
+    def _search(
+        self,
+        query: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Uncached hybrid search (see search)"""
+        # Exact-name queries are answered lexically, without an embedding
+        shortcut = self._lexical_shortcut(query, limit, filters)
+        if shortcut is not None:
+            return shortcut
+
+        # Query vector database
+        results = self.vector_db.query(
+            query_embeddings=[self.embed_query(query)],
+            n_results=self._candidate_count(limit),
+            where=self._build_where(filters)
+        )
+
+        # Failed queries are not cached
+        if results.get("error"):
+            raise RuntimeError(results["error"])
 
-                # Only return results above minimum similarity threshold
-                if similarity >= settings.MIN_SIMILARITY_SCORE:
-                    formatted_results.append({
-                        "id": results['ids'][0][i],
-                        "document": results['documents'][0][i],
-                        "metadata": results['metadatas'][0][i],
-                        "similarity_score": round(similarity, 3)
-                    })
+        formatted_results = self._rank(query, limit, filters, self._format_results(results))
 
-            logger.info(f"Search for '{query}' returned {len(formatted_results)} results")
-            return formatted_results
+        logger.info(f"Search for '{query}' returned {len(formatted_results)} results")
+        return formatted_results
+
+    async def asearch(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of search()
+        Identical concurrent searches share one cache lookup and backend call
+        """
+        params = {"query": normalize_query(query), "limit": limit, "filters": filters or {}}
+
+        try:
+            return await self._coalesce(
+                self.search_flight,
+                json.dumps(params, sort_keys=True),
+                lambda: self._acached("search", params, lambda: self._asearch(query, limit, filters)),
+                settings.SINGLEFLIGHT_SEARCH_TIMEOUT
+            )
 
         except Exception as e:
             logger.error(f"Search failed: {e}")
             return []
 
-    def ask(self, question: str, context_limit: int = 5) -> Dict[str, Any]:
+    async def _asearch(
+        self,
+        query: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Uncached async hybrid search (see asearch)"""
+        pool = get_executor("retrieval")
+
+        shortcut = await pool.run(self._lexical_shortcut, query, limit, filters)
+        if shortcut is not None:
+            return shortcut
+
+        results = await self.vector_db.aquery(
+            query_embeddings=[await self.aembed_query(query)],
+            n_results=self._candidate_count(limit),
+            where=self._build_where(filters)
+        )
+
+        if results.get("error"):
+            raise RuntimeError(results["error"])
+
+        formatted_results = await pool.run(
+            self._rank, query, limit, filters, self._format_results(results)
+        )
+
+        logger.info(f"Search for '{query}' returned {len(formatted_results)} results")
+        return formatted_results
+
+    def search_batch(self, requests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Run several searches with one embedding request and one vector query
+        per distinct filter
+
+        Args:
+            requests: List of dicts with query, limit and optional filters
+
+        Returns:
+            List of result lists, in request order
+        """
+        responses: List[Optional[List[Dict[str, Any]]]] = [None] * len(requests)
+        cache_keys: Dict[int, str] = {}
+        pending = []
+
+        # 1. Serve what we can from the result cache
+        for i, request in enumerate(requests):
+            if settings.CACHE_ENABLE:
+                key, cached = self.result_cache.lookup("search", {
+                    "query": normalize_query(request["query"]),
+                    "limit": request["limit"],
+                    "filters": request.get("filters") or {},
+                })
+                if cached is not None:
+                    responses[i] = cached
+                    continue
+                cache_keys[i] = key
+            pending.append(i)
+
+        # 2. Answer exact-name queries lexically
+        for i in list(pending):
+            request = requests[i]
+            shortcut = self._lexical_shortcut(request["query"], request["limit"], request.get("filters"))
+            if shortcut is not None:
+                responses[i] = shortcut
+                pending.remove(i)
+                if i in cache_keys:
+                    self.result_cache.store(cache_keys[i], shortcut)
+
+        if not pending:
+            return responses
+
+        # 3. Embed all remaining queries in one batch
+        embeddings = self.embed_queries([requests[i]["query"] for i in pending])
+
+        # 4. Group requests sharing the same filter into one multi-query call
+        groups: Dict[str, List[tuple[int, List[float]]]] = {}
+        for i, embedding in zip(pending, embeddings):
+            where = self._build_where(requests[i].get("filters"))
+            groups.setdefault(json.dumps(where, sort_keys=True), []).append((i, embedding))
+
+        for where_key, members in groups.items():
+            results = self.vector_db.query(
+                query_embeddings=[embedding for _, embedding in members],
+                n_results=max(self._candidate_count(requests[i]["limit"]) for i, _ in members),
+                where=json.loads(where_key)
+            )
+
+            for row, (i, _) in enumerate(members):
+                request = requests[i]
+                responses[i] = self._rank(
+                    request["query"],
+                    request["limit"],
+                    request.get("filters"),
+                    self._format_results(results, row=row)
+                )
+                if i in cache_keys and not results.get("error"):
+                    self.result_cache.store(cache_keys[i], responses[i])
+
+        logger.info(f"Batch search of {len(requests)} queries ran {len(groups)} vector queries")
+        return responses
+
+    def _lexical_index(self) -> InvertedIndex:
+        """
+        Get the lexical index, rebuilding it when the collection changed
+        Writes made by this process keep the index in sync; writes from other
+        processes (the ingest worker) trigger a full rebuild in a background
+        thread, at most once per HYBRID_INDEX_REBUILD_INTERVAL. Searches keep
+        using the stale index until the rebuilt one is swapped in; only the
+        first build blocks.
+
+        Returns:
+            Lexical index (possibly stale)
+        """
+        index = get_lexical_index()
+        version = get_collection_version().current()
+
+        if index.version == version:
+            return index
+
+        if index.version is None:
+            with self._lexical_lock:
+                if index.version is None:
+                    self._rebuild_lexical(index, version)
+            return index
+
+        with self._lexical_lock:
+            now = time.monotonic()
+            if (
+                self._lexical_rebuilding
+                or index.version == version
+                or now - self._lexical_built_at < settings.HYBRID_INDEX_REBUILD_INTERVAL
+            ):
+                return index
+
+            self._lexical_rebuilding = True
+            self._lexical_built_at = now
+
+        def rebuild():
+            try:
+                self._rebuild_lexical(index, version)
+            finally:
+                self._lexical_rebuilding = False
+
+        threading.Thread(target=rebuild, name="ragsearch1-lexical-rebuild", daemon=True).start()
+        return index
+
+    def _rebuild_lexical(self, index: InvertedIndex, version: int):
+        """Rebuild the lexical index from the collection (read at version or later)"""
+        try:
+            data = self.vector_db.get(include=["documents", "metadatas"])
+            index.build(data["ids"], data["documents"], data["metadatas"], version)
+        except Exception as e:
+            logger.error(f"Lexical index rebuild failed: {e}")
+        self._lexical_built_at = time.monotonic()
+
+    def _lexical_shortcut(
+        self,
+        query: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Serve a query whose tokens exactly match an entity name from the
+        lexical index, skipping the embedding request and the vector query
+
+        Args:
+            query: Search query
+            limit: Number of results
+            filters: Optional metadata filters
+
+        Returns:
+            Results (exact matches first), or None when no name matches
+        """
+        if not (settings.HYBRID_SEARCH_ENABLE and settings.HYBRID_SHORTCUT_ENABLE):
+            return None
+
+        index = self._lexical_index()
+        where = self._build_where(filters)
+        exact = index.exact_name_matches(query, where)
+        if not exact:
+            return None
+
+        ranked = [(doc_id, 1.0) for doc_id in exact]
+        ranked += [
+            (doc_id, score) for doc_id, score in index.search(query, limit, where)
+            if doc_id not in exact
+        ]
+
+        logger.info(f"Search for '{query}' served from the lexical index")
+        return self._format_lexical(index, ranked[:limit])
+
+    def _rank(
+        self,
+        query: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+        vector_results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Turn vector candidates into the final top results: fuse with BM25
+        matches, then rerank with the cross-encoder when RAG_RERANK is set
+
+        Args:
+            query: Search query
+            limit: Number of results
+            filters: Optional metadata filters
+            vector_results: Formatted vector results, best first
+
+        Returns:
+            Top results
+        """
+        candidates = self._fuse(query, self._candidate_count(limit), filters, vector_results)
+
+        if not settings.RAG_RERANK:
+            return candidates[:limit]
+
+        return get_reranker().rerank(query, candidates, limit)
+
+    def _fuse(
+        self,
+        query: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+        vector_results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge vector results with BM25 results using reciprocal rank fusion
+
+        Args:
+            query: Search query
+            limit: Number of results
+            filters: Optional metadata filters
+            vector_results: Formatted vector results, best first
+
+        Returns:
+            Fused results; lexical-only hits have no similarity_score and
+            carry their normalized BM25 score as lexical_score
+        """
+        if not settings.HYBRID_SEARCH_ENABLE:
+            return vector_results[:limit]
+
+        index = self._lexical_index()
+        lexical = index.search(query, self._candidate_count(limit), self._build_where(filters))
+
+        k = settings.HYBRID_RRF_K
+        fused: Dict[str, float] = {}
+        for rank, result in enumerate(vector_results):
+            fused[result["id"]] = fused.get(result["id"], 0.0) + 1 / (k + rank + 1)
+        for rank, (doc_id, _) in enumerate(lexical):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1 / (k + rank + 1)
+
+        by_id = {result["id"]: result for result in vector_results}
+        lexical_only = self._format_lexical(
+            index, [(doc_id, score) for doc_id, score in lexical if doc_id not in by_id]
+        )
+        by_id.update({result["id"]: result for result in lexical_only})
+
+        ranked = sorted((doc_id for doc_id in fused if doc_id in by_id), key=lambda d: (-fused[d], d))
+        return [by_id[doc_id] for doc_id in ranked[:limit]]
+
+    def _format_lexical(
+        self,
+        index: InvertedIndex,
+        ranked: List[tuple[str, float]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Format (doc_id, score) pairs from the lexical index like vector results
+        BM25 scores are not similarities: they go under lexical_score, so the
+        similarity threshold and answer confidence only see vector scores
+        """
+        formatted_results = []
+        for doc_id, score in ranked:
+            entry = index.get(doc_id)
+            if entry is not None:
+                formatted_results.append({
+                    "id": doc_id,
+                    "document": entry["document"],
+                    "metadata": entry["metadata"],
+                    "similarity_score": None,
+                    "lexical_score": round(score, 3)
+                })
+
+        return formatted_results
+
+    def _candidate_count(self, limit: int) -> int:
+        """Number of candidates to fetch, widened for fusion and reranking"""
+        count = limit
+        if settings.HYBRID_SEARCH_ENABLE:
+            count = max(count, settings.HYBRID_CANDIDATES)
+        if settings.RAG_RERANK:
+            count = max(count, settings.RERANK_CANDIDATES)
+        return count
+
+    def _build_where(self, filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Build a ChromaDB where clause from search filters
+
+        Args:
+            filters: Optional filters (country, type)
+
+        Returns:
+            Where clause or None when no filter applies
+        """
+        where = {}
+        if filters:
+            if filters.get("country"):
+                where["country"] = filters["country"]
+            if filters.get("type"):
+                where["type"] = filters["type"]
+
+        return where if where else None
+
+    def _format_results(
+        self,
+        results: Dict[str, Any],
+        row: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Format one row of a vector query result
+
+        Args:
+            results: Raw query results
+            row: Index of the query within the results
+            limit: Optional maximum number of results to keep
+
+        Returns:
+            List of entities above the minimum similarity score
+        """
+        formatted_results = []
+        for i in range(len(results['ids'][row])):
+            similarity = results['similarities'][row][i]
+
+            # Only return results above minimum similarity threshold
+            if similarity >= settings.MIN_SIMILARITY_SCORE:
+                formatted_results.append({
+                    "id": results['ids'][row][i],
+                    "document": results['documents'][row][i],
+                    "metadata": results['metadatas'][row][i],
+                    "similarity_score": round(similarity, 3)
+                })
+
+        return formatted_results[:limit] if limit else formatted_results
+
+    def ask(
+        self,
+        question: str,
+        context_limit: int = 5
+    ) -> Dict[str, Any]:
         """
         Ask a question and get an LLM-powered answer with sources
+        Answers to semantically equivalent questions are served from the
+        semantic answer cache until the collection changes
 
         Args:
             question: Natural language question
@@ -129,24 +671,222 @@ Answer in a clear, professional manner with specific details:"""
             Dict with answer and sources
         """
         try:
-            # 1. Retrieve relevant context
-            context_docs = self.search(question, limit=context_limit)
-
-            if not context_docs:
-                return {
-                    "answer": "I couldn't find relevant information to answer your question.",
-                    "sources": [],
-                    "confidence": 0.0
-                }
+            scope = f"ask:{context_limit}"
+
+            # 1. Check semantic cache
+            if settings.SEMANTIC_CACHE_ENABLE:
+                embedding = self.embed_query(question)
+                version = get_collection_version().current()
+                cached = self.answer_cache.get(embedding, scope, version)
+                if cached is not None:
+                    return cached
+
+            # 2. Retrieve relevant context
+            context = self._pack_context(self.search(question, limit=context_limit))
+
+            if not context["sources"]:
+                return self._no_context_answer()
+
+            # 3. Get LLM response
+            answer = self._generate(question, context)
+
+            if settings.SEMANTIC_CACHE_ENABLE:
+                self.answer_cache.set(embedding, scope, version, answer)
+
+            return answer
+
+        except Exception as e:
+            logger.error(f"Ask failed: {e}")
+            return self._error_answer(e)
+
+    async def aask(
+        self,
+        question: str,
+        context_limit: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Async variant of ask()
+        Retrieval runs in the worker pools and the LLM is called through its
+        async client, so a slow answer never blocks the event loop. Identical
+        concurrent questions share one LLM call.
+        """
+        try:
+            return await self._coalesce(
+                self.ask_flight,
+                (normalize_query(question), context_limit),
+                lambda: self._aask(question, context_limit),
+                settings.SINGLEFLIGHT_ASK_TIMEOUT
+            )
+
+        except Exception as e:
+            logger.error(f"Ask failed: {e}")
+            return self._error_answer(e)
+
+    async def _aask(self, question: str, context_limit: int) -> Dict[str, Any]:
+        """Uncoalesced async question answering (see aask)"""
+        scope = f"ask:{context_limit}"
+
+        if settings.SEMANTIC_CACHE_ENABLE:
+            embedding = await self.aembed_query(question)
+            version = await get_executor("retrieval").run(get_collection_version().current)
+            cached = await get_executor("retrieval").run(self.answer_cache.get, embedding, scope, version)
+            if cached is not None:
+                return cached
+
+        context = await get_executor("retrieval").run(
+            self._pack_context, await self.asearch(question, limit=context_limit)
+        )
+
+        if not context["sources"]:
+            return self._no_context_answer()
+
+        answer = await self._agenerate(question, context)
+
+        if settings.SEMANTIC_CACHE_ENABLE:
+            await get_executor("retrieval").run(self.answer_cache.set, embedding, scope, version, answer)
+
+        return answer
+
+    async def astream_ask(
+        self,
+        question: str,
+        context_limit: int = 5
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Ask a question and stream the answer as it is generated
+
+        Yields events in order: one 'sources' event, 'token' events with answer
+        fragments, then a final 'confidence' event. Closing the generator early
+        closes the upstream LLM stream, so abandoned answers stop generating.
+
+        Args:
+            question: Natural language question
+            context_limit: Number of context documents to retrieve
+
+        Yields:
+            Dicts with 'event' and 'data' keys
+        """
+        started_at = time.perf_counter()
+
+        if settings.SEMANTIC_CACHE_ENABLE:
+            scope = f"ask:{context_limit}"
+            embedding = await self.aembed_query(question)
+            version = await get_executor("retrieval").run(get_collection_version().current)
+            cached = await get_executor("retrieval").run(self.answer_cache.get, embedding, scope, version)
+            if cached is not None:
+                yield {"event": "sources", "data": {"sources": cached["sources"]}}
+                yield {"event": "token", "data": {"content": cached["answer"]}}
+                yield {"event": "confidence", "data": {"confidence": cached["confidence"]}}
+                return
+
+        context = await get_executor("retrieval").run(
+            self._pack_context, await self.asearch(question, limit=context_limit)
+        )
+
+        if not context["sources"]:
+            no_context = self._no_context_answer()
+            yield {"event": "sources", "data": {"sources": []}}
+            yield {"event": "token", "data": {"content": no_context["answer"]}}
+            yield {"event": "confidence", "data": {"confidence": no_context["confidence"]}}
+            return
+
+        answer = self._build_answer("", context["sources"])
+        yield {"event": "sources", "data": {"sources": answer["sources"]}}
+
+        prompt = self._build_prompt(question, context["text"])
+        async with get_llm_limiter().acquire():
+            stream = self.llm.astream(prompt)
+            first_token = True
+            fragments = []
 
-            # 2. Build context for LLM
-            context_text = "\n\n".join([
-                f"Source {i+1}:\n{doc['document']}"
-                for i, doc in enumerate(context_docs)
-            ])
+            try:
+                async for chunk in stream:
+                    if not chunk.content:
+                        continue
 
-            # 3. Create prompt
-            prompt = f"""You are an expert assistant for financial institutions in the Americas.
+                    if first_token:
+                        ASK_STREAM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - started_at)
+                        first_token = False
+
+                    fragments.append(chunk.content)
+                    yield {"event": "token", "data": {"content": chunk.content}}
+
+            finally:
+                # Closes the HTTP stream to the LLM provider if we stop early
+                await stream.aclose()
+
+        # Only completed answers reach the semantic cache
+        answer["answer"] = "".join(fragments)
+        self._record_tokens(prompt, answer["answer"])
+        if settings.SEMANTIC_CACHE_ENABLE:
+            await get_executor("retrieval").run(self.answer_cache.set, embedding, scope, version, answer)
+
+        yield {"event": "confidence", "data": {"confidence": answer["confidence"]}}
+
+    def _select_context(self, context_docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Trim reranked context to RERANK_CONTEXT_LIMIT documents
+        Cross-encoder ordering puts the relevant documents first, so fewer are
+        sent to the LLM; results that kept vector order are left untouched
+        """
+        if context_docs and "rerank_score" in context_docs[0]:
+            return context_docs[:settings.RERANK_CONTEXT_LIMIT]
+        return context_docs
+
+    def _pack_context(self, context_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Fit retrieved documents into the RAG_CONTEXT_WINDOW token budget
+
+        Args:
+            context_docs: Retrieved documents, best first
+
+        Returns:
+            Dict with context text, the sources it contains and its token count
+        """
+        return self.context_packer.pack(self._select_context(context_docs))
+
+    def _generate(self, question: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Answer a question from packed context with the LLM
+
+        Args:
+            question: Natural language question
+            context: Context packed by _pack_context
+
+        Returns:
+            Dict with answer, sources and confidence
+        """
+        prompt = self._build_prompt(question, context["text"])
+        response = self.llm.invoke(prompt)
+        self._record_tokens(prompt, response.content)
+        return self._build_answer(response.content, context["sources"])
+
+    async def _agenerate(self, question: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of _generate(), limited by the LLM concurrency limiter"""
+        prompt = self._build_prompt(question, context["text"])
+        async with get_llm_limiter().acquire():
+            response = await self.llm.ainvoke(prompt)
+
+        self._record_tokens(prompt, response.content)
+        return self._build_answer(response.content, context["sources"])
+
+    def _record_tokens(self, prompt: str, completion: str):
+        """Export prompt and completion sizes, counted with the model tokenizer"""
+        LLM_PROMPT_TOKENS.observe(self.context_packer.count(prompt))
+        LLM_COMPLETION_TOKENS.observe(self.context_packer.count(completion))
+
+    def _build_prompt(self, question: str, context_text: str) -> str:
+        """
+        Build the LLM prompt from the question and packed context
+
+        Args:
+            question: Natural language question
+            context_text: Context packed by _pack_context
+
+        Returns:
+            Prompt text
+        """
+        return f"""You are an expert assistant for financial institutions in the Americas.
 Use the following pieces of context to answer the question at the end.
 If you don't know the answer, just say that you don't know, don't try to make up an answer.
 Always provide specific institution names, countries, and relevant details.
@@ -158,34 +898,51 @@ Question: {question}
 
 Answer in a clear, professional manner with specific details:"""
 
-            # 4. Get LLM response
-            response = self.llm.invoke(prompt)
-            answer = response.content
-
-            # 5. Calculate confidence based on similarity scores
-            avg_similarity = sum(doc['similarity_score'] for doc in context_docs) / len(context_docs)
-
-            return {
-                "answer": answer,
-                "sources": [
-                    {
-                        "name": doc['metadata'].get('name', 'Unknown'),
-                        "type": doc['metadata'].get('type', 'unknown'),
-                        "country": doc['metadata'].get('country', ''),
-                        "similarity": doc['similarity_score']
-                    }
-                    for doc in context_docs
-                ],
-                "confidence": round(avg_similarity, 3)
-            }
+    def _build_answer(self, answer: str, context_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the ask() response from the LLM answer and its sources
 
-        except Exception as e:
-            logger.error(f"Ask failed: {e}")
-            return {
-                "answer": f"Error processing question: {str(e)}",
-                "sources": [],
-                "confidence": 0.0
-            }
+        Args:
+            answer: LLM answer text
+            context_docs: Context documents sent to the LLM
+
+        Returns:
+            Dict with answer, sources and confidence
+        """
+        # Calculate confidence based on the vector similarity of the sources
+        # (lexical-only matches have none)
+        similarities = [doc['similarity_score'] for doc in context_docs if doc.get('similarity_score') is not None]
+        avg_similarity = sum(similarities) / len(similarities) if similarities else 0.0
+
+        return {
+            "answer": answer,
+            "sources": [
+                {
+                    "name": doc['metadata'].get('name', 'Unknown'),
+                    "type": doc['metadata'].get('type', 'unknown'),
+                    "country": doc['metadata'].get('country', ''),
+                    "similarity": doc['similarity_score']
+                }
+                for doc in context_docs
+            ],
+            "confidence": round(avg_similarity, 3)
+        }
+
+    def _no_context_answer(self) -> Dict[str, Any]:
+        """Response returned when no relevant context was found"""
+        return {
+            "answer": "I couldn't find relevant information to answer your question.",
+            "sources": [],
+            "confidence": 0.0
+        }
+
+    def _error_answer(self, error: Exception) -> Dict[str, Any]:
+        """Response returned when answering failed"""
+        return {
+            "answer": f"Error processing question: {str(error)}",
+            "sources": [],
+            "confidence": 0.0
+        }
 
     def compare_remittance_options(
         self,
@@ -195,6 +952,7 @@ Answer in a clear, professional manner with specific details:"""
     ) -> Dict[str, Any]:
         """
         Compare remittance options between two countries
+        Candidates are retrieved once; the LLM sees exactly the options returned
 
         Args:
             from_country: Source country code
@@ -202,46 +960,128 @@ Answer in a clear, professional manner with specific details:"""
             amount: Amount to send
 
         Returns:
-            Dict with comparison and recommendations
+            Dict with comparison, recommendations and stage timings (ms)
         """
+        started_at = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        def compute():
+            stage_at = time.perf_counter()
+            services = self._search(
+                self._remittance_query(from_country, to_country),
+                limit=10,
+                filters={"type": "fintech"}
+            )
+            timings["retrieval_ms"] = self._elapsed_ms(stage_at)
+
+            if not services:
+                return self._no_remittance_options(from_country, to_country)
+
+            stage_at = time.perf_counter()
+            context = self._pack_context(services[:5])
+            answer = self._generate(self._remittance_question(from_country, to_country, amount), context)
+            timings["generation_ms"] = self._elapsed_ms(stage_at)
+
+            return self._build_comparison(services, context, answer)
+
         try:
-            # Build query
-            query = f"remittance services from {from_country} to {to_country}"
+            comparison = self._cached("compare", self._remittance_params(from_country, to_country, amount), compute)
+
+        except Exception as e:
+            logger.error(f"Remittance comparison failed: {e}")
+            comparison = self._comparison_error(e)
+
+        return {**comparison, "timings": {**timings, "total_ms": self._elapsed_ms(started_at)}}
 
-            # Search for relevant services
-            services = self.search(
-                query=query,
+    async def acompare_remittance_options(
+        self,
+        from_country: str,
+        to_country: str,
+        amount: float
+    ) -> Dict[str, Any]:
+        """Async variant of compare_remittance_options()"""
+        started_at = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        async def compute():
+            stage_at = time.perf_counter()
+            services = await self._asearch(
+                self._remittance_query(from_country, to_country),
                 limit=10,
                 filters={"type": "fintech"}
             )
+            timings["retrieval_ms"] = self._elapsed_ms(stage_at)
 
             if not services:
-                return {
-                    "options": [],
-                    "recommendation": f"No remittance services found for {from_country} to {to_country}",
-                    "total_found": 0
-                }
+                return self._no_remittance_options(from_country, to_country)
 
-            # Ask LLM for comparison
-            question = f"""Compare the best remittance options to send ${amount} from {from_country} to {to_country}.
-Consider fees, speed, reliability, and user ratings. Provide a clear recommendation."""
+            stage_at = time.perf_counter()
+            context = await get_executor("retrieval").run(self._pack_context, services[:5])
+            answer = await self._agenerate(self._remittance_question(from_country, to_country, amount), context)
+            timings["generation_ms"] = self._elapsed_ms(stage_at)
 
-            comparison = self.ask(question, context_limit=5)
+            return self._build_comparison(services, context, answer)
 
-            return {
-                "options": services[:5],  # Top 5 options
-                "comparison": comparison['answer'],
-                "sources": comparison['sources'],
-                "total_found": len(services)
-            }
+        try:
+            comparison = await self._acached(
+                "compare", self._remittance_params(from_country, to_country, amount), compute
+            )
 
         except Exception as e:
             logger.error(f"Remittance comparison failed: {e}")
-            return {
-                "options": [],
-                "recommendation": f"Error comparing options: {str(e)}",
-                "total_found": 0
-            }
+            comparison = self._comparison_error(e)
+
+        return {**comparison, "timings": {**timings, "total_ms": self._elapsed_ms(started_at)}}
+
+    def _elapsed_ms(self, started_at: float) -> float:
+        """Milliseconds since a perf_counter() timestamp"""
+        return round((time.perf_counter() - started_at) * 1000, 1)
+
+    def _remittance_query(self, from_country: str, to_country: str) -> str:
+        """Search query for remittance services on a corridor"""
+        return f"remittance services from {from_country} to {to_country}"
+
+    def _remittance_question(self, from_country: str, to_country: str, amount: float) -> str:
+        """LLM question comparing remittance options on a corridor"""
+        return f"""Compare the best remittance options to send ${amount} from {from_country} to {to_country}.
+Consider fees, speed, reliability, and user ratings. Provide a clear recommendation."""
+
+    def _remittance_params(self, from_country: str, to_country: str, amount: float) -> Dict[str, Any]:
+        """Result cache parameters identifying a comparison"""
+        return {"from_country": from_country, "to_country": to_country, "amount": round(amount, 2)}
+
+    def _build_comparison(
+        self,
+        services: List[Dict[str, Any]],
+        context: Dict[str, Any],
+        answer: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build the comparison response
+        The options are the packed context sources, i.e. what the LLM compared
+        """
+        return {
+            "options": context["sources"],
+            "comparison": answer["answer"],
+            "sources": answer["sources"],
+            "total_found": len(services)
+        }
+
+    def _no_remittance_options(self, from_country: str, to_country: str) -> Dict[str, Any]:
+        """Comparison response when no service was found"""
+        return {
+            "options": [],
+            "recommendation": f"No remittance services found for {from_country} to {to_country}",
+            "total_found": 0
+        }
+
+    def _comparison_error(self, error: Exception) -> Dict[str, Any]:
+        """Comparison response when the comparison failed"""
+        return {
+            "options": [],
+            "recommendation": f"Error comparing options: {str(error)}",
+            "total_found": 0
+        }
 
     def get_entity_by_id(self, entity_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -254,71 +1094,125 @@ Consider fees, speed, reliability, and user ratings. Provide a clear recommendat
             Entity dict or None
         """
         try:
-            # ChromaDB get by ID
-            result = self.vector_db.collection.get(
-                ids=[entity_id],
-                include=["documents", "metadatas"]
-            )
-
-            if result['ids']:
-                return {
-                    "id": result['ids'][0],
-                    "document": result['documents'][0],
-                    "metadata": result['metadatas'][0]
-                }
-
-            return None
+            return self.vector_db.get_entity_by_id(entity_id)
 
         except Exception as e:
             logger.error(f"Get entity failed: {e}")
             return None
 
+    def list_entities(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        List entities matching metadata filters, without vector search
+        No embedding is computed and no similarity threshold applies, so the
+        listing is complete. Ordered by rating (desc) and name.
+
+        Args:
+            filters: Optional metadata filters (country, type)
+            limit: Page size
+            cursor: Cursor returned by the previous page
+
+        Returns:
+            Dict with entities and next_cursor (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        return self._cached(
+            "list",
+            {"filters": filters or {}, "limit": limit, "cursor": cursor},
+            lambda: self._list_entities(filters, limit, cursor)
+        )
+
+    def _list_entities(
+        self,
+        filters: Optional[Dict[str, Any]],
+        limit: int,
+        cursor: Optional[str]
+    ) -> Dict[str, Any]:
+        """Uncached entity listing (see list_entities)"""
+        page = self.vector_db.list_documents(
+            where=self._build_where(filters),
+            limit=limit,
+            cursor=cursor
+        )
+
+        return {
+            "entities": [
+                {
+                    "id": entity_id,
+                    "document": document,
+                    "metadata": metadata,
+                    "similarity_score": None
+                }
+                for entity_id, document, metadata in zip(
+                    page["ids"], page["documents"], page["metadatas"]
+                )
+            ],
+            "next_cursor": page["next_cursor"]
+        }
+
     def get_entities_by_country(
         self,
         country_code: str,
-        limit: int = 20
-    ) -> List[Dict[str, Any]]:
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Get all entities for a specific country
 
         Args:
             country_code: ISO country code
             limit: Maximum results
+            cursor: Cursor returned by the previous page
 
         Returns:
-            List of entities
+            Dict with entities and next_cursor
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
         try:
-            # Query with country filter
-            query = f"financial institutions in {country_code}"
-            return self.search(query, limit=limit, filters={"country": country_code})
+            return self.list_entities({"country": country_code}, limit=limit, cursor=cursor)
 
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Get entities by country failed: {e}")
-            return []
+            return {"entities": [], "next_cursor": None}
 
     def get_entities_by_type(
         self,
         entity_type: str,
-        limit: int = 20
-    ) -> List[Dict[str, Any]]:
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Get all entities of a specific type
 
         Args:
             entity_type: Type (bank, exchange, fintech, etc.)
             limit: Maximum results
+            cursor: Cursor returned by the previous page
 
         Returns:
-            List of entities
+            Dict with entities and next_cursor
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
         try:
-            query = f"{entity_type} institutions"
-            return self.search(query, limit=limit, filters={"type": entity_type})
+            return self.list_entities({"type": entity_type}, limit=limit, cursor=cursor)
 
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Get entities by type failed: {e}")
-            return []
+            return {"entities": [], "next_cursor": None}
 
     def suggest_similar(
         self,
@@ -336,25 +1230,184 @@ Consider fees, speed, reliability, and user ratings. Provide a clear recommendat
             List of similar entities
         """
         try:
-            # Get reference entity
-            entity = self.get_entity_by_id(entity_id)
+            return self._cached(
+                "similar",
+                {"entity_id": entity_id, "limit": limit},
+                lambda: self._suggest_similar(entity_id, limit)
+            )
 
-            if not entity:
-                return []
+        except Exception as e:
+            logger.error(f"Suggest similar failed: {e}")
+            return []
 
-            # Search for similar entities
-            query = entity['document']
-            similar = self.search(query, limit=limit + 1)
+    def _suggest_similar(self, entity_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Uncached similar entities lookup (see suggest_similar)"""
+        # Precomputed neighbours make this a key lookup
+        if settings.CACHE_ENABLE and limit <= settings.SIMILAR_PRECOMPUTE_K:
+            key = self._neighbours_key(entity_id)
+            neighbours = self.result_cache.get_many([key]).get(key)
+            if neighbours is not None:
+                return self._hydrate_neighbours(neighbours[:limit])
 
-            # Remove the reference entity itself
-            similar = [e for e in similar if e['id'] != entity_id]
+        # Reuse the stored vector of the reference entity instead of re-embedding it
+        entity = self.vector_db.get(ids=[entity_id], include=["embeddings"])
 
-            return similar[:limit]
+        if not entity['ids']:
+            return []
 
-        except Exception as e:
-            logger.error(f"Suggest similar failed: {e}")
+        results = self.vector_db.query(
+            query_embeddings=[entity['embeddings'][0]],
+            n_results=limit + 1
+        )
+
+        if results.get("error"):
+            raise RuntimeError(results["error"])
+
+        # Remove the reference entity itself
+        similar = [e for e in self._format_results(results) if e['id'] != entity_id]
+
+        return similar[:limit]
+
+    def _hydrate_neighbours(self, neighbours: List[List[Any]]) -> List[Dict[str, Any]]:
+        """
+        Turn precomputed (id, similarity) pairs into full results
+
+        Args:
+            neighbours: List of [entity_id, similarity_score] pairs
+
+        Returns:
+            List of entities in neighbour order (deleted entities are skipped)
+        """
+        if not neighbours:
             return []
 
+        fetched = self.vector_db.get(
+            ids=[entity_id for entity_id, _ in neighbours],
+            include=["documents", "metadatas"]
+        )
+        entities = {
+            entity_id: (document, metadata)
+            for entity_id, document, metadata in zip(
+                fetched['ids'], fetched['documents'], fetched['metadatas']
+            )
+        }
+
+        return [
+            {
+                "id": entity_id,
+                "document": entities[entity_id][0],
+                "metadata": entities[entity_id][1],
+                "similarity_score": similarity
+            }
+            for entity_id, similarity in neighbours
+            if entity_id in entities
+        ]
+
+    def _neighbours_key(self, entity_id: str) -> str:
+        """Cache key of an entity's precomputed neighbours (not tied to the collection version)"""
+        return self.result_cache.make_key("similar_precomputed", {"entity_id": entity_id}, None)
+
+    def precompute_similar(self, changed_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Precompute similar entities into the shared result cache
+        Neighbour lists are not keyed on the collection version: writes only
+        recompute the entities they can affect. With changed_ids (entities
+        embedded or removed by an ingest), those entities are recomputed
+        along with their neighbours before and after the change; without,
+        the whole collection is scanned in pages of stored vectors.
+
+        Args:
+            changed_ids: IDs whose embeddings changed or were removed (None: all)
+
+        Returns:
+            Number of entities recomputed
+        """
+        if not settings.CACHE_ENABLE:
+            return 0
+
+        if changed_ids is None:
+            return self._precompute_neighbours(self.vector_db.get(include=[])["ids"])
+
+        changed = list(dict.fromkeys(changed_ids))
+        if not changed:
+            return 0
+
+        # Entities listing a changed one among their neighbours before the change
+        previous = self.result_cache.get_many([self._neighbours_key(entity_id) for entity_id in changed])
+        affected = dict.fromkeys(changed)
+        for neighbours in previous.values():
+            affected.update(dict.fromkeys(neighbour_id for neighbour_id, _ in neighbours))
+
+        computed: Dict[str, List[List[Any]]] = {}
+        count = self._precompute_neighbours(list(affected), computed)
+
+        # Entities the changed ones are now close to may now list them
+        nearby = {
+            neighbour_id
+            for entity_id in changed
+            for neighbour_id, _ in computed.get(entity_id, [])
+            if neighbour_id not in affected
+        }
+        count += self._precompute_neighbours(list(nearby))
+
+        # Removed entities have no neighbours left
+        gone = [entity_id for entity_id in changed if entity_id not in computed]
+        self.result_cache.delete_many([self._neighbours_key(entity_id) for entity_id in gone])
+
+        return count
+
+    def _precompute_neighbours(
+        self,
+        ids: List[str],
+        computed: Optional[Dict[str, List[List[Any]]]] = None
+    ) -> int:
+        """
+        Query and store the top-K neighbours of the given entities, one page
+        of stored vectors at a time (one pipelined Redis write per page)
+
+        Args:
+            ids: Entity IDs (missing ones are skipped)
+            computed: Optional dict receiving the neighbour lists by ID
+
+        Returns:
+            Number of entities stored
+        """
+        k = settings.SIMILAR_PRECOMPUTE_K
+        batch_size = settings.SIMILAR_PRECOMPUTE_BATCH_SIZE
+        count = 0
+
+        for start in range(0, len(ids), batch_size):
+            page = self.vector_db.get(ids=ids[start:start + batch_size], include=["embeddings"])
+            if not page['ids']:
+                continue
+
+            results = self.vector_db.query(
+                query_embeddings=list(page['embeddings']),
+                n_results=k + 1
+            )
+
+            if results.get("error"):
+                raise RuntimeError(results["error"])
+
+            entries = {}
+            for row, entity_id in enumerate(page['ids']):
+                neighbours = [
+                    [e['id'], e['similarity_score']]
+                    for e in self._format_results(results, row=row)
+                    if e['id'] != entity_id
+                ][:k]
+
+                entries[self._neighbours_key(entity_id)] = neighbours
+                if computed is not None:
+                    computed[entity_id] = neighbours
+
+            self.result_cache.store_many(entries, ttl=settings.SIMILAR_PRECOMPUTE_TTL)
+            count += len(page['ids'])
+
+        if count:
+            logger.info(f"Precomputed similar entities for {count} entities")
+        return count
+
 
 # Global retriever instance
 retriever = RAGRetriever()
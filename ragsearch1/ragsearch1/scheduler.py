@@ -4,14 +4,22 @@ Handles periodic data updates and maintenance tasks
 """
 
 import logging
+from apscheduler.jobstores.base import ConflictingIdError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
 import asyncio
 
+from .cache import redis_connection
 from .config import settings
 from .collector import get_collector
+from .executor import get_executor
+from .ingest import get_ingest_pipeline
+from .jobs import JobRunner, RunRequests
+from .leader import LeaderElector, create_lease
 from .processor import get_processor
+from .retriever import get_retriever
 from .vectordb import get_vector_db
 
 logger = logging.getLogger(__name__)
@@ -24,11 +32,69 @@ class TaskScheduler:
 
     def __init__(self):
         """Initialize scheduler"""
-        self.scheduler = AsyncIOScheduler(timezone=settings.SCHEDULER_TIMEZONE)
+        self.scheduler = AsyncIOScheduler(
+            timezone=settings.SCHEDULER_TIMEZONE,
+            job_defaults={
+                "max_instances": 1,       # Never stack runs of the same job
+                "coalesce": True,         # Run missed fires once, not once per miss
+                "misfire_grace_time": settings.SCHEDULER_MISFIRE_GRACE_TIME,
+            }
+        )
+        self.jobs = JobRunner(max_concurrent=settings.MAX_CONCURRENT_TASKS)
+        self.scheduler.add_listener(self.jobs.on_scheduler_event, JobRunner.EVENTS)
+        self._ingest_lock = asyncio.Lock()
         self.collector = get_collector()
         self.processor = get_processor()
         self.vector_db = get_vector_db()
+        self.ingest_pipeline = get_ingest_pipeline()
         self.is_running = False
+        self.last_runs: Dict[str, Dict[str, Any]] = {}  # Latest ingest summary per scope
+
+        # Jobs that can be run on demand (request_run), with display names
+        self.manual_jobs = {
+            "update_exchanges": (self.update_exchanges, "Update Crypto Exchanges"),
+            "update_bcv": (self.update_bcv_rates, "Update BCV Rates"),
+            "update_banks": (self.update_banks, "Update Banking Institutions"),
+            "update_remittance": (self.update_remittance, "Update Remittance Services"),
+            "discover_entities": (self.discover_new_entities, "Discover New Entities"),
+        }
+        # Manual runs requested in any process reach the elected one through this queue
+        self.run_requests = RunRequests(
+            "scheduler",
+            redis_connection if settings.SCHEDULER_LEADER_BACKEND == "redis" else None,
+            settings.SCHEDULER_LOCK_DIR
+        )
+
+        # Only the elected process runs jobs (None: no election, always run)
+        lease = create_lease("scheduler")
+        self.elector = LeaderElector(
+            "scheduler",
+            lease,
+            on_elected=self.start,
+            on_demoted=self.stop,
+            renew_interval=settings.SCHEDULER_LEASE_RENEW_INTERVAL
+        ) if lease else None
+
+    def start_elected(self):
+        """
+        Run the scheduler in this process once it wins the leader election
+        Must be called from the running event loop (API startup or worker)
+        """
+        if not settings.SCHEDULER_ENABLE:
+            logger.info("Scheduler is disabled in settings")
+            return
+
+        if self.elector is None:
+            self.start()
+        else:
+            self.elector.start()
+
+    async def stop_elected(self):
+        """Stop the scheduler and leave the election, letting another process take over"""
+        if self.elector is not None:
+            await self.elector.stop()
+        elif self.is_running:
+            self.stop()
 
     def start(self):
         """Start the scheduler with all configured tasks"""
@@ -42,47 +108,30 @@ class TaskScheduler:
 
         try:
             # Task 1: Update crypto exchanges (every 15 minutes)
-            self.scheduler.add_job(
-                self.update_exchanges,
-                trigger=IntervalTrigger(seconds=settings.UPDATE_EXCHANGES_INTERVAL),
-                id='update_exchanges',
-                name='Update Crypto Exchanges',
-                replace_existing=True
-            )
+            self._add_job(self.update_exchanges, 'update_exchanges', 'Update Crypto Exchanges',
+                          settings.UPDATE_EXCHANGES_INTERVAL)
 
             # Task 2: Update BCV rates (every 30 minutes)
-            self.scheduler.add_job(
-                self.update_bcv_rates,
-                trigger=IntervalTrigger(seconds=settings.UPDATE_BCV_INTERVAL),
-                id='update_bcv',
-                name='Update BCV Rates',
-                replace_existing=True
-            )
+            self._add_job(self.update_bcv_rates, 'update_bcv', 'Update BCV Rates',
+                          settings.UPDATE_BCV_INTERVAL)
 
             # Task 3: Update banking institutions (every 24 hours)
-            self.scheduler.add_job(
-                self.update_banks,
-                trigger=IntervalTrigger(seconds=settings.UPDATE_BANKS_INTERVAL),
-                id='update_banks',
-                name='Update Banking Institutions',
-                replace_existing=True
-            )
+            self._add_job(self.update_banks, 'update_banks', 'Update Banking Institutions',
+                          settings.UPDATE_BANKS_INTERVAL)
 
             # Task 4: Discovery of new entities (every 7 days)
-            self.scheduler.add_job(
-                self.discover_new_entities,
-                trigger=IntervalTrigger(seconds=settings.UPDATE_DISCOVERY_INTERVAL),
-                id='discover_entities',
-                name='Discover New Entities',
-                replace_existing=True
-            )
+            self._add_job(self.discover_new_entities, 'discover_entities', 'Discover New Entities',
+                          settings.UPDATE_DISCOVERY_INTERVAL)
 
             # Task 5: Database maintenance (every 24 hours)
+            self._add_job(self.database_maintenance, 'db_maintenance', 'Database Maintenance', 86400)
+
+            # Manual run requests from other processes (cheap: outside the job runner)
             self.scheduler.add_job(
-                self.database_maintenance,
-                trigger=IntervalTrigger(seconds=86400),  # 24 hours
-                id='db_maintenance',
-                name='Database Maintenance',
+                self._take_run_requests,
+                trigger=IntervalTrigger(seconds=settings.SCHEDULER_RUN_REQUEST_INTERVAL),
+                id='run_requests',
+                name='Manual Run Requests',
                 replace_existing=True
             )
 
@@ -97,6 +146,73 @@ class TaskScheduler:
             logger.error(f"Failed to start scheduler: {e}")
             raise
 
+    def _add_job(self, fn, job_id: str, name: str, interval: int):
+        """
+        Register a job behind the job runner's limits and metrics
+        Each fire is delayed by up to SCHEDULER_JOB_JITTER seconds so jobs
+        with related intervals do not start together
+
+        Args:
+            fn: Job coroutine function
+            job_id: Job ID
+            name: Display name
+            interval: Seconds between runs
+        """
+        self.scheduler.add_job(
+            self.jobs.wrap(job_id, fn),
+            trigger=IntervalTrigger(seconds=interval, jitter=settings.SCHEDULER_JOB_JITTER or None),
+            id=job_id,
+            name=name,
+            replace_existing=True
+        )
+
+    def request_run(self, job_id: str) -> bool:
+        """
+        Run a job now, in whichever process runs the scheduler
+        The run goes through the job runner (concurrency limit, metrics)
+        like a scheduled one; other processes queue it for the leader
+
+        Args:
+            job_id: Key of manual_jobs
+
+        Returns:
+            True if the run was scheduled or queued
+
+        Raises:
+            ValueError: If the job cannot be run on demand
+        """
+        if job_id not in self.manual_jobs:
+            raise ValueError(f"Unknown job: {job_id}")
+
+        if self.is_running:
+            self._run_now(job_id)
+            return True
+
+        return self.run_requests.push(job_id)
+
+    def _run_now(self, job_id: str):
+        """Add a one-off run of a manual job (a pending one absorbs repeats)"""
+        fn, name = self.manual_jobs[job_id]
+        try:
+            self.scheduler.add_job(
+                self.jobs.wrap(job_id, fn),
+                trigger="date",
+                id=f"{job_id}_manual",
+                name=f"{name} (manual)"
+            )
+            logger.info(f"Manual run of {job_id} scheduled")
+        except ConflictingIdError:
+            logger.info(f"Manual run of {job_id} already pending")
+
+    async def _take_run_requests(self):
+        """Schedule the manual runs requested by other processes"""
+        loop = asyncio.get_running_loop()
+        for job_id in await loop.run_in_executor(None, self.run_requests.pop_all):
+            if job_id in self.manual_jobs:
+                self._run_now(job_id)
+            else:
+                logger.warning(f"Ignoring run request for unknown job {job_id}")
+
     def stop(self):
         """Stop the scheduler"""
         if not self.is_running:
@@ -117,40 +233,15 @@ class TaskScheduler:
             logger.info("Starting crypto exchanges update...")
 
             # Collect latest exchange data
-            exchanges = await self.collector.collect_crypto_exchanges()
+            summary = await self.ingest_sources(["ccxt"], scope="exchanges")
 
-            if not exchanges:
+            if not summary["collected"]:
                 logger.warning("No exchange data collected")
-                return
-
-            # Process and update vector database
-            documents, metadatas, ids, embeddings = self.processor.process_entity_batch(exchanges)
-
-            # Update or add to vector DB
-            for i, entity_id in enumerate(ids):
-                existing = self.vector_db.get_entity_by_id(entity_id)
-
-                if existing:
-                    # Update existing
-                    self.vector_db.update_document(
-                        document_id=entity_id,
-                        document=documents[i],
-                        metadata=metadatas[i],
-                        embedding=embeddings[i]
-                    )
-                else:
-                    # Add new
-                    self.vector_db.add_documents(
-                        documents=[documents[i]],
-                        metadatas=[metadatas[i]],
-                        ids=[entity_id],
-                        embeddings=[embeddings[i]]
-                    )
-
-            logger.info(f"Updated {len(exchanges)} crypto exchanges")
+            logger.info(f"Updated crypto exchanges: {summary}")
 
         except Exception as e:
             logger.error(f"Exchange update failed: {e}")
+            raise
 
     async def update_bcv_rates(self):
         """Update Venezuela BCV rates"""
@@ -158,131 +249,149 @@ class TaskScheduler:
             logger.info("Starting BCV rates update...")
 
             # Collect Venezuela entities (includes BCV)
-            ve_entities = await self.collector.collect_venezuela_entities()
+            summary = await self.ingest_sources(["venezuela"], scope="venezuela")
 
-            if not ve_entities:
+            if not summary["collected"]:
                 logger.warning("No Venezuela data collected")
-                return
-
-            # Process and update
-            documents, metadatas, ids, embeddings = self.processor.process_entity_batch(ve_entities)
-
-            for i, entity_id in enumerate(ids):
-                existing = self.vector_db.get_entity_by_id(entity_id)
-
-                if existing:
-                    self.vector_db.update_document(
-                        document_id=entity_id,
-                        document=documents[i],
-                        metadata=metadatas[i],
-                        embedding=embeddings[i]
-                    )
-                else:
-                    self.vector_db.add_documents(
-                        documents=[documents[i]],
-                        metadatas=[metadatas[i]],
-                        ids=[entity_id],
-                        embeddings=[embeddings[i]]
-                    )
-
-            logger.info(f"Updated {len(ve_entities)} Venezuela entities")
+            logger.info(f"Updated Venezuela entities: {summary}")
 
         except Exception as e:
             logger.error(f"BCV update failed: {e}")
+            raise
 
-    async def update_banks(self):
-        """Update banking institutions"""
+    async def update_remittance(self):
+        """Update remittance services (on demand only)"""
         try:
-            logger.info("Starting banks update...")
+            logger.info("Starting remittance services update...")
 
-            # Collect from Plaid and Belvo
-            tasks = []
+            entities = await self.collector.collect_remittance_services()
 
-            if settings.PLAID_CLIENT_ID:
-                tasks.append(self.collector.collect_plaid_institutions())
+            summary = await self.ingest(entities, scope="remittance")
+            logger.info(f"Updated remittance services: {summary}")
 
-            if settings.BELVO_SECRET_ID:
-                tasks.append(self.collector.collect_belvo_institutions())
+        except Exception as e:
+            logger.error(f"Remittance update failed: {e}")
+            raise
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def update_banks(self):
+        """Update banking institutions"""
+        try:
+            logger.info("Starting banks update...")
 
-            all_banks = []
-            for result in results:
-                if isinstance(result, list):
-                    all_banks.extend(result)
+            # Stream from Plaid and Belvo (11k+ institutions)
+            summary = await self.ingest_sources(["plaid", "belvo"], scope="banks")
 
-            if not all_banks:
+            if not summary["collected"]:
                 logger.warning("No banking data collected")
-                return
-
-            # Process and update
-            documents, metadatas, ids, embeddings = self.processor.process_entity_batch(all_banks)
-
-            for i, entity_id in enumerate(ids):
-                existing = self.vector_db.get_entity_by_id(entity_id)
-
-                if existing:
-                    self.vector_db.update_document(
-                        document_id=entity_id,
-                        document=documents[i],
-                        metadata=metadatas[i],
-                        embedding=embeddings[i]
-                    )
-                else:
-                    self.vector_db.add_documents(
-                        documents=[documents[i]],
-                        metadatas=[metadatas[i]],
-                        ids=[entity_id],
-                        embeddings=[embeddings[i]]
-                    )
-
-            logger.info(f"Updated {len(all_banks)} banking institutions")
+            logger.info(f"Updated banking institutions: {summary}")
 
         except Exception as e:
             logger.error(f"Banks update failed: {e}")
+            raise
 
     async def discover_new_entities(self):
         """Discover and add new financial entities"""
         try:
             logger.info("Starting entity discovery...")
 
-            # Collect all available data
-            all_entities = await self.collector.collect_all()
+            # Stream all available data through the ingest pipeline
+            summary = await self.ingest_sources(None, scope="discovery")
 
-            if not all_entities:
+            if not summary["collected"]:
                 logger.warning("No entities discovered")
-                return
+            logger.info(f"Entity discovery: {summary}")
 
-            # Deduplicate
-            unique_entities = self.processor.deduplicate_entities(all_entities)
-
-            # Filter only new entities (not in DB)
-            new_entities = []
-            for entity in unique_entities:
-                entity_id = self.processor._generate_id(entity)
-                existing = self.vector_db.get_entity_by_id(entity_id)
-
-                if not existing:
-                    new_entities.append(entity)
-
-            if not new_entities:
-                logger.info("No new entities to add")
-                return
-
-            # Process and add to vector DB
-            documents, metadatas, ids, embeddings = self.processor.process_entity_batch(new_entities)
+        except Exception as e:
+            logger.error(f"Entity discovery failed: {e}")
+            raise
 
-            self.vector_db.add_documents(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids,
-                embeddings=embeddings
-            )
+    async def ingest(self, entities: List[Dict[str, Any]], scope: str) -> Dict[str, Any]:
+        """
+        Write collected entities incrementally (see IngestPipeline)
+        Normalization, embedding and writes run off the event loop
+
+        Args:
+            entities: Raw entities from the collector
+            scope: Ingest scope (job) owning the documents
+
+        Returns:
+            Run summary (also exposed in get_job_status)
+        """
+        async with self._ingest_lock:
+            # Diffs are computed against a snapshot: one ingest writes at a time
+            changed_ids: set = set()
+            summary = await self.ingest_pipeline.run(entities, scope, changed_ids)
+            return await self._finish_ingest(summary, changed_ids)
+
+    async def ingest_stream(
+        self,
+        batches: AsyncIterator[List[Dict[str, Any]]],
+        scope: str,
+        failed_sources: Optional[set] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream entity batches into the collection as they are collected
+        Collection runs inside the ingest lock, overlapping with embedding
+        and writes
+
+        Args:
+            batches: Async iterator of raw entity batches (DataCollector.stream_all())
+            scope: Ingest scope (job) owning the documents
+            failed_sources: Set the collector fills with failed sources
+                (documents are not removed if any failed)
+
+        Returns:
+            Run summary (also exposed in get_job_status)
+        """
+        async with self._ingest_lock:
+            changed_ids: set = set()
+            summary = await self.ingest_pipeline.stream(batches, scope, changed_ids, failed_sources)
+            return await self._finish_ingest(summary, changed_ids)
+
+    async def ingest_sources(self, sources: Optional[List[str]], scope: str) -> Dict[str, Any]:
+        """
+        Collect sources and stream them into the collection
+        A source that fails keeps the scope's documents it did not return
+
+        Args:
+            sources: Collector source names (None: all enabled)
+            scope: Ingest scope (job) owning the documents
+
+        Returns:
+            Run summary (also exposed in get_job_status)
+        """
+        failed: set = set()
+        return await self.ingest_stream(
+            self.collector.stream_all(sources=sources, failed=failed),
+            scope,
+            failed_sources=failed
+        )
+
+    async def _finish_ingest(self, summary: Dict[str, Any], changed_ids: set) -> Dict[str, Any]:
+        self.last_runs[summary["scope"]] = summary
+
+        # Metadata-only refreshes leave the neighbour lists valid
+        if changed_ids:
+            await self.refresh_similar_entities(changed_ids)
+
+        return summary
+
+    async def refresh_similar_entities(self, changed_ids: Optional[set] = None):
+        """
+        Precompute similar-entity lists (runs in the retrieval pool)
+
+        Args:
+            changed_ids: IDs embedded or removed by an ingest (None: whole collection)
+        """
+        if not settings.SIMILAR_PRECOMPUTE_ENABLE:
+            return
 
-            logger.info(f"Discovered and added {len(new_entities)} new entities")
+        try:
+            count = await get_executor("retrieval").run(get_retriever().precompute_similar, changed_ids)
+            logger.info(f"Refreshed similar entities for {count} entities")
 
         except Exception as e:
-            logger.error(f"Entity discovery failed: {e}")
+            logger.error(f"Similar entities refresh failed: {e}")
 
     async def database_maintenance(self):
         """Perform database maintenance tasks"""
@@ -290,9 +399,13 @@ class TaskScheduler:
             logger.info("Starting database maintenance...")
 
             # Get database stats
-            stats = self.vector_db.get_collection_stats()
+            stats = await get_executor("ingest").run(self.vector_db.get_collection_stats)
             logger.info(f"Database stats: {stats}")
 
+            # Full neighbour rebuild: renews lists before SIMILAR_PRECOMPUTE_TTL
+            # and catches drift from incremental updates
+            await self.refresh_similar_entities()
+
             # TODO: Add cleanup logic here
             # - Remove outdated entities
             # - Update timestamps
@@ -302,6 +415,7 @@ class TaskScheduler:
 
         except Exception as e:
             logger.error(f"Database maintenance failed: {e}")
+            raise
 
     def get_job_status(self):
         """Get status of all scheduled jobs"""
@@ -317,7 +431,9 @@ class TaskScheduler:
                     "next_run": job.next_run_time.isoformat() if job.next_run_time else None,
                 }
                 for job in jobs
-            ]
+            ],
+            "last_runs": self.last_runs,
+            "leader": self.elector.status() if self.elector else None,
         }
 
 
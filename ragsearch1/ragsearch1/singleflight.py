@@ -0,0 +1,85 @@
+"""
+Request coalescing for RAGSearch1
+Concurrent identical requests share one in-flight backend call
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .metrics import SINGLEFLIGHT_CALLS, SINGLEFLIGHT_TIMEOUTS
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Single-flight group for async calls
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it runs await the same task. The result, or the exception, is
+    delivered to every caller. A caller that is cancelled (e.g. its client
+    disconnected) stops waiting without cancelling the shared call.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize group
+
+        Args:
+            name: Group name used as metrics label
+        """
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def run(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run fn once per key among concurrent callers
+
+        Args:
+            key: Normalized request key
+            fn: Coroutine function performing the call
+            timeout: Seconds before the shared call fails with TimeoutError
+
+        Returns:
+            Result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised, for every caller
+        """
+        task = self._inflight.get(key)
+
+        if task is None:
+            SINGLEFLIGHT_CALLS.labels(flight=self.name, role="leader").inc()
+            task = asyncio.ensure_future(self._call(key, fn, timeout))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            SINGLEFLIGHT_CALLS.labels(flight=self.name, role="coalesced").inc()
+
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def _call(self, key: Hashable, fn: Callable[[], Awaitable[Any]], timeout: Optional[float]) -> Any:
+        try:
+            return await asyncio.wait_for(fn(), timeout)
+        except asyncio.TimeoutError:
+            SINGLEFLIGHT_TIMEOUTS.labels(flight=self.name).inc()
+            logger.warning(f"Single-flight call {self.name}:{key} timed out after {timeout}s")
+            raise
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        """Drop a finished call so the next request starts a fresh one"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # Mark the exception as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
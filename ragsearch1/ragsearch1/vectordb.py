@@ -1,17 +1,93 @@
 """
 ChromaDB Vector Database Integration
 Handles vector storage, retrieval, and similarity search
+The backend is ChromaDB or the local NumPy store (VECTOR_BACKEND)
 """
 
 import chromadb
 from chromadb.config import Settings as ChromaSettings
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional
+import base64
+import bisect
+import json
 import logging
+import threading
+from collections import OrderedDict
+from .cache import get_collection_version
 from .config import settings
+from .embeddings import get_vector_dimension
+from .executor import get_executor
+from .lexical import InvertedIndex, get_lexical_index
+from .localvectordb import LocalCollection, LocalVectorClient
+from .projection import PCAProjection, load_projection, reduced_collection_name
 
 logger = logging.getLogger(__name__)
 
 
+def listing_sort_key(entity_id: str, metadata: Dict[str, Any]) -> tuple:
+    """
+    Deterministic listing order: rating (desc), name, then ID as tie-breaker
+
+    Args:
+        entity_id: Document ID
+        metadata: Document metadata
+
+    Returns:
+        Sort key tuple
+    """
+    return (
+        -float(metadata.get("rating") or 0.0),
+        str(metadata.get("name", "")).casefold(),
+        entity_id,
+    )
+
+
+def distance_space(collection: Any) -> str:
+    """
+    Distance function of a collection's query results
+    ChromaDB fixes it at creation (hnsw:space, l2 by default); the local
+    store uses its metric
+    """
+    if isinstance(collection, LocalCollection):
+        return collection.metric
+    return (collection.metadata or {}).get("hnsw:space", "l2")
+
+
+def distance_to_similarity(distance: float, space: str) -> float:
+    """
+    Convert a query distance to cosine similarity
+
+    Args:
+        distance: Distance returned by the collection
+        space: Distance function (cosine, ip or l2; l2 is squared, as in ChromaDB)
+
+    Returns:
+        Similarity in [-1, 1] (l2 and ip assume unit-length embeddings)
+    """
+    if space == "l2":
+        return 1 - distance / 2
+    return 1 - distance
+
+
+def encode_cursor(key: tuple) -> str:
+    """Encode a listing sort key as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a pagination cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        rating, name, entity_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (float(rating), str(name), str(entity_id))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
 class VectorDatabase:
     """
     ChromaDB wrapper for RAGSearch1
@@ -22,12 +98,24 @@ class VectorDatabase:
         """Initialize ChromaDB client and collection"""
         self.client = None
         self.collection = None
+        self.projection: Optional[PCAProjection] = None
+        self.reduced_collection = None
+        # Sorted listing keys per filter, valid for one collection version
+        self._listing_keys: "OrderedDict[str, tuple[int, List[tuple]]]" = OrderedDict()
+        self._listing_lock = threading.Lock()
         self._initialize_client()
 
     def _initialize_client(self):
         """Initialize ChromaDB client with configuration"""
         try:
-            if settings.ENVIRONMENT == "production":
+            if settings.VECTOR_BACKEND == "local":
+                # Exact kNN over a memory-mapped NumPy matrix, no network hop
+                self.client = LocalVectorClient(
+                    path=settings.LOCAL_VECTOR_DIR,
+                    quantization=settings.LOCAL_VECTOR_QUANTIZATION,
+                    rescore_factor=settings.LOCAL_VECTOR_RESCORE_FACTOR
+                )
+            elif settings.ENVIRONMENT == "production":
                 # Production: Connect to remote ChromaDB
                 self.client = chromadb.HttpClient(
                     host=settings.CHROMA_HOST,
@@ -50,17 +138,56 @@ class VectorDatabase:
                 name="financial_entities",
                 metadata={
                     "description": "Financial institutions across America",
-                    "dimension": settings.VECTOR_DIMENSION,
+                    "dimension": get_vector_dimension(),
                     "metric": settings.VECTOR_METRIC,
+                    "hnsw:space": settings.VECTOR_METRIC,
                 }
             )
 
-            logger.info(f"ChromaDB initialized successfully. Collection: {self.collection.name}")
+            stored_dimension = self.collection.metadata.get("dimension")
+            if stored_dimension and stored_dimension != get_vector_dimension():
+                logger.warning(
+                    f"Collection dimension {stored_dimension} does not match the "
+                    f"embedding provider ({get_vector_dimension()}); re-ingest the collection"
+                )
+
+            self._initialize_projection()
+
+            logger.info(
+                f"Vector database initialized successfully ({settings.VECTOR_BACKEND}). "
+                f"Collection: {self.collection.name}"
+            )
 
         except Exception as e:
-            logger.error(f"Failed to initialize ChromaDB: {e}")
+            logger.error(f"Failed to initialize vector database: {e}")
             raise
 
+    def _initialize_projection(self):
+        """Open the reduced-dimension collection when PROJECTION_ENABLE is set"""
+        self.projection = None
+        self.reduced_collection = None
+        if not settings.PROJECTION_ENABLE:
+            return
+
+        projection = load_projection(self.collection.name, settings.PROJECTION_COMPONENTS)
+        if projection is None:
+            logger.warning(
+                "PROJECTION_ENABLE is set but no projection has been fitted; "
+                "run scripts/pca_projection.py fit. Searching full-dimension vectors"
+            )
+            return
+
+        self.projection = projection
+        self.reduced_collection = self.client.get_or_create_collection(
+            name=reduced_collection_name(self.collection.name, projection.output_dimension),
+            metadata={
+                "description": f"PCA-{projection.output_dimension} projection of {self.collection.name}",
+                "dimension": projection.output_dimension,
+                "metric": settings.VECTOR_METRIC,
+                "hnsw:space": settings.VECTOR_METRIC,
+            }
+        )
+
     def add_documents(
         self,
         documents: List[str],
@@ -96,6 +223,8 @@ class VectorDatabase:
                     ids=ids
                 )
 
+            self._mirror_reduced("add", ids, embeddings, documents=documents, metadatas=metadatas)
+            self._record_write(lambda index: index.upsert_many(ids, documents, metadatas))
             logger.info(f"Added {len(documents)} documents to ChromaDB")
             return True
 
@@ -103,39 +232,322 @@ class VectorDatabase:
             logger.error(f"Failed to add documents: {e}")
             return False
 
+    def upsert_documents(
+        self,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Add or update documents in chunks
+        Each chunk costs one existence check plus at most one add and one
+        update call, instead of a lookup and a write per document.
+        Without embeddings, existing documents only get their metadata
+        updated (ChromaDB would otherwise re-embed the text itself)
+
+        Args:
+            documents: List of text documents
+            metadatas: List of metadata dicts for each document
+            ids: List of unique IDs for each document
+            embeddings: Optional pre-computed embeddings
+            chunk_size: Documents per chunk (VECTORDB_UPSERT_CHUNK_SIZE by default)
+
+        Returns:
+            Dict with added, updated and failed counts
+        """
+        chunk_size = chunk_size or settings.VECTORDB_UPSERT_CHUNK_SIZE
+        counts = {"added": 0, "updated": 0, "failed": 0}
+        written = []  # (ids, documents, metadatas) of the chunks that succeeded
+
+        def pick(values, indexes):
+            return [values[i] for i in indexes]
+
+        for start in range(0, len(ids), chunk_size):
+            chunk_ids = ids[start:start + chunk_size]
+            chunk_documents = documents[start:start + chunk_size]
+            chunk_metadatas = metadatas[start:start + chunk_size]
+            chunk_embeddings = embeddings[start:start + chunk_size] if embeddings else None
+
+            try:
+                existing = set(self.collection.get(ids=chunk_ids, include=[])["ids"])
+                new = [i for i, entity_id in enumerate(chunk_ids) if entity_id not in existing]
+                old = [i for i, entity_id in enumerate(chunk_ids) if entity_id in existing]
+
+                if new:
+                    add_data = {
+                        "ids": pick(chunk_ids, new),
+                        "documents": pick(chunk_documents, new),
+                        "metadatas": pick(chunk_metadatas, new),
+                    }
+                    if chunk_embeddings:
+                        add_data["embeddings"] = pick(chunk_embeddings, new)
+                    self.collection.add(**add_data)
+                    self._mirror_reduced(
+                        "add",
+                        add_data["ids"],
+                        add_data.get("embeddings"),
+                        documents=add_data["documents"],
+                        metadatas=add_data["metadatas"]
+                    )
+
+                if old:
+                    update_data = {"ids": pick(chunk_ids, old), "metadatas": pick(chunk_metadatas, old)}
+                    if chunk_embeddings:
+                        update_data["documents"] = pick(chunk_documents, old)
+                        update_data["embeddings"] = pick(chunk_embeddings, old)
+                    self.collection.update(**update_data)
+                    self._mirror_reduced(
+                        "update",
+                        update_data["ids"],
+                        update_data.get("embeddings"),
+                        documents=update_data.get("documents"),
+                        metadatas=update_data["metadatas"]
+                    )
+
+                written.append((chunk_ids, chunk_documents, chunk_metadatas))
+                counts["added"] += len(new)
+                counts["updated"] += len(old)
+
+            except Exception as e:
+                logger.error(f"Upsert of {len(chunk_ids)} documents failed: {e}")
+                counts["failed"] += len(chunk_ids)
+
+        # One version bump per call: each bump invalidates every worker's
+        # caches and makes other processes rebuild their lexical index
+        if written:
+            def apply(index: InvertedIndex):
+                for chunk in written:
+                    index.upsert_many(*chunk)
+
+            self._record_write(apply)
+
+        logger.info(
+            f"Upserted {len(ids)} documents: {counts['added']} added, "
+            f"{counts['updated']} updated, {counts['failed']} failed"
+        )
+        return counts
+
     def query(
         self,
-        query_texts: List[str],
+        query_texts: Optional[List[str]] = None,
         n_results: int = 10,
         where: Optional[Dict[str, Any]] = None,
-        where_document: Optional[Dict[str, str]] = None
+        where_document: Optional[Dict[str, str]] = None,
+        query_embeddings: Optional[List[List[float]]] = None
     ) -> Dict[str, Any]:
         """
         Query the vector database for similar documents
 
         Args:
-            query_texts: List of query strings
+            query_texts: List of query strings (embedded by ChromaDB)
             n_results: Number of results to return
             where: Metadata filter conditions
             where_document: Document content filter conditions
+            query_embeddings: Pre-computed query embeddings, used instead of query_texts
 
         Returns:
-            Dict with ids, documents, metadatas, distances
+            Dict with ids, documents, metadatas, distances, and similarities
+            (cosine similarity, comparable whichever collection answered)
         """
         try:
-            results = self.collection.query(
-                query_texts=query_texts,
-                n_results=n_results,
-                where=where,
-                where_document=where_document
-            )
+            collection = self.collection
+            if query_embeddings is not None and self.projection is not None:
+                # Search the reduced collection with projected queries
+                collection = self.reduced_collection
+                results = self.reduced_collection.query(
+                    query_embeddings=self.projection.transform(query_embeddings).tolist(),
+                    n_results=n_results,
+                    where=where,
+                    where_document=where_document
+                )
+            elif query_embeddings is not None:
+                results = self.collection.query(
+                    query_embeddings=query_embeddings,
+                    n_results=n_results,
+                    where=where,
+                    where_document=where_document
+                )
+            else:
+                results = self.collection.query(
+                    query_texts=query_texts,
+                    n_results=n_results,
+                    where=where,
+                    where_document=where_document
+                )
+
+            space = distance_space(collection)
+            results["similarities"] = [
+                [distance_to_similarity(distance, space) for distance in row]
+                for row in results["distances"]
+            ]
 
             logger.info(f"Query returned {len(results['ids'][0])} results")
             return results
 
         except Exception as e:
             logger.error(f"Query failed: {e}")
-            return {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+            n_queries = len(query_embeddings if query_embeddings is not None else query_texts or [[]])
+            return {
+                "ids": [[] for _ in range(n_queries)],
+                "documents": [[] for _ in range(n_queries)],
+                "metadatas": [[] for _ in range(n_queries)],
+                "distances": [[] for _ in range(n_queries)],
+                "similarities": [[] for _ in range(n_queries)],
+                "error": str(e),
+            }
+
+    async def aquery(
+        self,
+        query_texts: Optional[List[str]] = None,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, str]] = None,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of query()
+        ChromaDB has no async client, so the call runs in the vectordb pool
+        """
+        return await get_executor("vectordb").run(
+            self.query,
+            query_texts=query_texts,
+            n_results=n_results,
+            where=where,
+            where_document=where_document,
+            query_embeddings=query_embeddings
+        )
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get documents by ID and/or metadata filter
+
+        Args:
+            ids: Optional list of document IDs
+            where: Optional metadata filter conditions
+            include: Fields to return (documents, metadatas, embeddings)
+
+        Returns:
+            Dict with ids and the requested fields
+        """
+        return self.collection.get(
+            ids=ids,
+            where=where,
+            include=include if include is not None else ["documents", "metadatas"]
+        )
+
+    async def aget(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Async variant of get(), runs in the vectordb pool"""
+        return await get_executor("vectordb").run(self.get, ids=ids, where=where, include=include)
+
+    def get_entity_by_id(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a document by ID
+
+        Args:
+            entity_id: Document ID
+
+        Returns:
+            Dict with id, document and metadata, or None if missing
+        """
+        result = self.get(ids=[entity_id])
+        if not result["ids"]:
+            return None
+
+        return {
+            "id": result["ids"][0],
+            "document": result["documents"][0],
+            "metadata": result["metadatas"][0],
+        }
+
+    def list_documents(
+        self,
+        where: Optional[Dict[str, Any]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        List documents matching a metadata filter, without any embedding
+        Results are ordered by rating (desc) and name, and paginated with an
+        opaque cursor pointing after the last returned document
+
+        Args:
+            where: Optional metadata filter conditions
+            limit: Page size
+            cursor: Cursor returned by the previous page
+
+        Returns:
+            Dict with ids, documents, metadatas and next_cursor (None on last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = decode_cursor(cursor) if cursor else None
+        keys = self._listing_order(where)
+
+        start = bisect.bisect_right(keys, after) if after else 0
+        page = keys[start:start + limit]
+
+        # Fetch documents for the page only
+        page_ids = [key[2] for key in page]
+        documents = {}
+        if page_ids:
+            fetched = self.collection.get(ids=page_ids, include=["documents", "metadatas"])
+            documents = {
+                entity_id: (document, metadata)
+                for entity_id, document, metadata in zip(
+                    fetched["ids"], fetched["documents"], fetched["metadatas"]
+                )
+            }
+
+        page_ids = [entity_id for entity_id in page_ids if entity_id in documents]
+        has_more = start + limit < len(keys)
+
+        return {
+            "ids": page_ids,
+            "documents": [documents[entity_id][0] for entity_id in page_ids],
+            "metadatas": [documents[entity_id][1] for entity_id in page_ids],
+            "next_cursor": encode_cursor(page[-1]) if has_more and page else None,
+        }
+
+    def _listing_order(self, where: Optional[Dict[str, Any]]) -> List[tuple]:
+        """
+        Sort keys of all documents matching a filter
+        Built from a metadata-only scan once per collection version, so
+        paging through a listing does not rescan and re-sort on every page
+        """
+        cache_key = json.dumps(where or {}, sort_keys=True)
+        version = get_collection_version().current()
+
+        with self._listing_lock:
+            cached = self._listing_keys.get(cache_key)
+            if cached is not None and cached[0] == version:
+                self._listing_keys.move_to_end(cache_key)
+                return cached[1]
+
+        scan = self.collection.get(where=where, include=["metadatas"])
+        keys = sorted(
+            listing_sort_key(entity_id, metadata or {})
+            for entity_id, metadata in zip(scan["ids"], scan["metadatas"])
+        )
+
+        with self._listing_lock:
+            self._listing_keys[cache_key] = (version, keys)
+            self._listing_keys.move_to_end(cache_key)
+            while len(self._listing_keys) > settings.LISTING_ORDER_CACHE_SIZE:
+                self._listing_keys.popitem(last=False)
+        return keys
 
     def search_by_country(
         self,
@@ -168,7 +580,7 @@ class VectorDatabase:
                     "id": results['ids'][0][i],
                     "document": results['documents'][0][i],
                     "metadata": results['metadatas'][0][i],
-                    "similarity": 1 - results['distances'][0][i]  # Convert distance to similarity
+                    "similarity": distance_to_similarity(results['distances'][0][i], distance_space(self.collection))
                 })
 
             return formatted_results
@@ -207,7 +619,7 @@ class VectorDatabase:
                     "id": results['ids'][0][i],
                     "document": results['documents'][0][i],
                     "metadata": results['metadatas'][0][i],
-                    "similarity": 1 - results['distances'][0][i]
+                    "similarity": distance_to_similarity(results['distances'][0][i], distance_space(self.collection))
                 })
 
             return formatted_results
@@ -246,6 +658,14 @@ class VectorDatabase:
                 update_data["embeddings"] = [embedding]
 
             self.collection.update(**update_data)
+            self._mirror_reduced(
+                "update",
+                [document_id],
+                update_data.get("embeddings"),
+                documents=update_data.get("documents"),
+                metadatas=update_data.get("metadatas")
+            )
+            self._record_write(lambda index: index.upsert(document_id, document or None, metadata or None))
             logger.info(f"Updated document {document_id}")
             return True
 
@@ -265,6 +685,9 @@ class VectorDatabase:
         """
         try:
             self.collection.delete(ids=ids)
+            if self.reduced_collection is not None:
+                self.reduced_collection.delete(ids=ids)
+            self._record_write(lambda index: index.remove(ids))
             logger.info(f"Deleted {len(ids)} documents")
             return True
 
@@ -272,6 +695,53 @@ class VectorDatabase:
             logger.error(f"Delete failed: {e}")
             return False
 
+    def _mirror_reduced(
+        self,
+        method: str,
+        ids: List[str],
+        embeddings: Optional[List[List[float]]],
+        **fields
+    ):
+        """
+        Apply a write to the reduced collection, projecting its embeddings
+        Failures are logged: the full collection stays the source of truth and
+        scripts/pca_projection.py build recreates the copy
+
+        Args:
+            method: Collection method ("add" or "update")
+            ids: Document IDs
+            embeddings: Full-dimension embeddings (read back from the collection when None on add)
+            **fields: documents / metadatas passed through
+        """
+        if self.reduced_collection is None:
+            return
+
+        try:
+            if embeddings is None and method == "add":
+                # Embedded by ChromaDB: copy the stored records as returned
+                stored = self.collection.get(ids=ids, include=["embeddings", "documents", "metadatas"])
+                ids, embeddings = stored["ids"], stored["embeddings"]
+                fields = {"documents": stored["documents"], "metadatas": stored["metadatas"]}
+            if embeddings is not None:
+                fields["embeddings"] = self.projection.transform(embeddings).tolist()
+
+            getattr(self.reduced_collection, method)(ids=ids, **fields)
+
+        except Exception as e:
+            logger.error(f"Reduced collection {method} failed: {e}")
+
+    def _record_write(self, apply: Callable[[InvertedIndex], Any]):
+        """
+        Mirror a successful write into the lexical index and bump the collection version
+        Other workers see the new version and rebuild their own index lazily
+
+        Args:
+            apply: Function applying the write to the lexical index
+        """
+        index = get_lexical_index()
+        apply(index)
+        index.mark_written(get_collection_version().bump())
+
     def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the collection
@@ -281,12 +751,18 @@ class VectorDatabase:
         """
         try:
             count = self.collection.count()
-            return {
+            stats = {
                 "name": self.collection.name,
                 "count": count,
                 "metadata": self.collection.metadata
             }
 
+            # Local backend only: size of the (possibly quantized) search matrix
+            if hasattr(self.collection, "memory_usage"):
+                stats["memory"] = self.collection.memory_usage()
+
+            return stats
+
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
             return {}
@@ -300,7 +776,10 @@ class VectorDatabase:
         """
         try:
             self.client.delete_collection(name=self.collection.name)
+            if self.reduced_collection is not None:
+                self.client.delete_collection(name=self.reduced_collection.name)
             self._initialize_client()
+            get_lexical_index().clear(get_collection_version().bump())
             logger.warning("Collection has been reset!")
             return True
 
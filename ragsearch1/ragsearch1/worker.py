@@ -0,0 +1,70 @@
+"""
+Standalone Ingestion Worker for RAGSearch1
+Runs the scheduled collection, embedding and write jobs in their own
+process, apart from API request serving. Several workers can run: leader
+election keeps exactly one of them active and fails over when it dies.
+
+Set SCHEDULER_IN_API=false on the API so its workers do not compete.
+
+Usage:
+    python -m ragsearch1.worker
+"""
+
+import asyncio
+import logging
+import signal
+
+from .config import settings
+from .executor import shutdown_executors, start_loop_lag_monitor
+
+# Keep module-level imports light: process pool children are spawned and
+# re-import this module as __mp_main__, so the scheduler, collectors and
+# vector DB are imported inside run()/main() instead
+
+logger = logging.getLogger(__name__)
+
+
+async def run():
+    """Join the scheduler election and run until SIGINT/SIGTERM"""
+    from .scheduler import get_scheduler
+
+    scheduler = get_scheduler()
+    stop = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    start_loop_lag_monitor()
+    scheduler.start_elected()
+    logger.info("Worker started")
+
+    await stop.wait()
+
+    logger.info("Worker shutting down...")
+    await scheduler.stop_elected()
+    shutdown_executors()
+
+
+def main():
+    """Worker entry point"""
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    if not settings.SCHEDULER_ENABLE:
+        logger.error("SCHEDULER_ENABLE is false; nothing to run")
+        return
+
+    if settings.PROMETHEUS_ENABLE:
+        from prometheus_client import start_http_server
+
+        start_http_server(settings.WORKER_METRICS_PORT)
+        logger.info(f"Worker metrics on port {settings.WORKER_METRICS_PORT}")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: OpenAI vs local sentence-transformers embeddings
+Reports document throughput (embeddings/sec) and query-embedding latency
+(p50/p99), sequential and with concurrent callers, for each provider.
+
+Usage:
+    python scripts/benchmark_embeddings.py --documents 1000 --queries 200 --concurrency 16
+    python scripts/benchmark_embeddings.py --providers local
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ragsearch1.config import settings  # noqa: E402
+from ragsearch1.embeddings import LocalEmbeddingProvider, OpenAIEmbeddingProvider  # noqa: E402
+
+SAMPLE_DOCUMENT = (
+    "Name: Banco {i}\nType: bank\nCountry: VE\n"
+    "Description: Banco universal con servicios de transferencias y remesas\n"
+    "Services: transfers, remittances, savings\nSupported Currencies: VES, USD"
+)
+SAMPLE_QUERIES = [
+    "best way to send money from US to Venezuela",
+    "casas de cambio en Caracas",
+    "exchanges that support USDT in Colombia",
+    "bancos con API en México",
+]
+
+
+def make_provider(name: str):
+    if name == "local":
+        return LocalEmbeddingProvider(
+            model=settings.LOCAL_EMBEDDING_MODEL,
+            threads=settings.EMBEDDING_THREADS,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS
+        )
+    return OpenAIEmbeddingProvider(model=settings.OPENAI_EMBEDDING_MODEL, api_key=settings.OPENAI_API_KEY)
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+def timed_query(provider, text: str) -> float:
+    start = time.perf_counter()
+    provider.embed_query(text)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding provider benchmark")
+    parser.add_argument("--providers", default="openai,local", help="Comma-separated providers")
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    documents = [SAMPLE_DOCUMENT.format(i=i) for i in range(args.documents)]
+    queries = [f"{SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)]} {i}" for i in range(args.queries)]
+
+    for name in args.providers.split(","):
+        provider = make_provider(name.strip())
+
+        # Warm up (model load / connection setup) outside the measurements
+        provider.embed_query("warm up")
+
+        start = time.perf_counter()
+        provider.embed_documents(documents)
+        throughput = len(documents) / (time.perf_counter() - start)
+
+        sequential = [timed_query(provider, q) for q in queries]
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            concurrent = list(pool.map(lambda q: timed_query(provider, q), queries))
+
+        print(f"{provider.name} ({provider.model}, dimension {provider.dimension})")
+        print(f"  documents   {throughput:8.1f} embeddings/sec")
+        print(f"  query seq   p50={statistics.median(sequential):7.1f}ms  p99={percentile(sequential, 0.99):7.1f}ms")
+        print(f"  query x{args.concurrency:<3}  p50={statistics.median(concurrent):7.1f}ms  p99={percentile(concurrent, 0.99):7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
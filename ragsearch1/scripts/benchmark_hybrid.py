@@ -0,0 +1,101 @@
+"""
+Benchmark: hybrid (BM25 + vector) vs vector-only search
+Queries are entity names taken from the collection, in three forms:
+exact name, lowercase without accents, and name followed by the entity type.
+Reports mean/p95 latency and recall@k (the named entity is in the top k).
+
+Usage:
+    python scripts/benchmark_hybrid.py --queries 100 --k 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ragsearch1.config import settings  # noqa: E402
+from ragsearch1.retriever import get_retriever  # noqa: E402
+
+
+def strip_accents(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def build_queries(retriever, n_queries: int, seed: int):
+    """Sample entities and build (query kind, query, expected id) triples"""
+    data = retriever.vector_db.get(include=["metadatas"])
+    entities = [
+        (entity_id, metadata) for entity_id, metadata in zip(data["ids"], data["metadatas"])
+        if metadata and metadata.get("name")
+    ]
+    random.Random(seed).shuffle(entities)
+
+    queries = []
+    for entity_id, metadata in entities[:n_queries]:
+        name = metadata["name"]
+        queries.append(("exact", name, entity_id))
+        queries.append(("folded", strip_accents(name), entity_id))
+        queries.append(("name+type", f"{name} {metadata.get('type', '')}".strip(), entity_id))
+
+    return queries
+
+
+def run(retriever, queries, k: int, hybrid: bool):
+    """Run all queries uncached in one mode, returning per-kind latencies and hits"""
+    settings.HYBRID_SEARCH_ENABLE = hybrid
+    stats = {}
+
+    for kind, query, expected in queries:
+        start = time.perf_counter()
+        results = retriever._search(query, k, None)
+        elapsed = time.perf_counter() - start
+
+        latencies, hits = stats.setdefault(kind, ([], []))
+        latencies.append(elapsed * 1000)
+        hits.append(any(r["id"] == expected for r in results))
+
+    return stats
+
+
+def report(label: str, stats):
+    for kind, (latencies, hits) in stats.items():
+        p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+        print(
+            f"{label:<12} {kind:<10} n={len(latencies):<5} "
+            f"mean={statistics.mean(latencies):8.1f}ms  p95={p95:8.1f}ms  "
+            f"recall={sum(hits) / len(hits):.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hybrid vs vector-only search benchmark")
+    parser.add_argument("--queries", type=int, default=100, help="Number of entities to sample")
+    parser.add_argument("--k", type=int, default=5, help="Results per query")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Every vector query pays for its embedding, as a first-time query would
+    settings.EMBEDDING_CACHE_ENABLE = False
+
+    retriever = get_retriever()
+    queries = build_queries(retriever, args.queries, args.seed)
+    if not queries:
+        print("Collection is empty, nothing to benchmark")
+        return
+
+    # Build the lexical index up front so it is not timed
+    settings.HYBRID_SEARCH_ENABLE = True
+    retriever._lexical_index()
+
+    report("vector-only", run(retriever, queries, args.k, hybrid=False))
+    report("hybrid", run(retriever, queries, args.k, hybrid=True))
+
+
+if __name__ == "__main__":
+    main()
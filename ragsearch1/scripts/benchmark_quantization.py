@@ -0,0 +1,108 @@
+"""
+Benchmark: quantized (float16 / int8 + rescoring) vs float32 local vector search
+Loads the same vectors into one local collection per quantization mode and
+reports search-matrix memory, recall@k against the float32 results, and
+query latency.
+
+Vectors come from a synthetic corpus, or from the live collection with
+--source collection (queries are then sampled from the stored embeddings).
+
+Usage:
+    python scripts/benchmark_quantization.py --entities 30000 --queries 200 --k 10
+    python scripts/benchmark_quantization.py --source collection --rescore-factor 2
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ragsearch1.localvectordb import LocalCollection  # noqa: E402
+
+BATCH_SIZE = 1000
+
+
+def load_vectors(args):
+    if args.source == "collection":
+        from ragsearch1.vectordb import get_vector_db
+
+        data = get_vector_db().get(include=["embeddings"])
+        vectors = np.asarray(data["embeddings"], dtype=np.float32)
+    else:
+        vectors = np.random.default_rng(args.seed).standard_normal(
+            (args.entities, args.dimension)
+        ).astype(np.float32)
+
+    rng = np.random.default_rng(args.seed + 1)
+    picks = rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)
+    # Perturb sampled vectors so queries are near, not identical to, stored ones
+    queries = vectors[picks] + 0.1 * rng.standard_normal(vectors[picks].shape).astype(np.float32)
+    return vectors, queries
+
+
+def build(path: str, quantization: str, vectors: np.ndarray, rescore_factor: int) -> LocalCollection:
+    collection = LocalCollection(
+        path, "benchmark", {"dimension": vectors.shape[1], "metric": "cosine"},
+        quantization=quantization, rescore_factor=rescore_factor
+    )
+    for i in range(0, len(vectors), BATCH_SIZE):
+        batch = vectors[i:i + BATCH_SIZE]
+        ids = [f"v{j}" for j in range(i, i + len(batch))]
+        collection.add(ids=ids, embeddings=batch, metadatas=[{} for _ in ids], documents=["" for _ in ids])
+    return collection
+
+
+def run(collection: LocalCollection, queries: np.ndarray, k: int):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        result = collection.query(query_embeddings=[query], n_results=k, include=[])
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(result["ids"][0])
+    return latencies, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantized local vector search benchmark")
+    parser.add_argument("--source", choices=["synthetic", "collection"], default="synthetic")
+    parser.add_argument("--entities", type=int, default=30000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    vectors, queries = load_vectors(args)
+    print(f"{len(vectors)} vectors, dimension {vectors.shape[1]}, {len(queries)} queries, "
+          f"k={args.k}, rescore factor {args.rescore_factor}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for quantization in LocalCollection.QUANTIZATIONS:
+            collection = build(os.path.join(tmp, quantization), quantization, vectors, args.rescore_factor)
+            latencies, results = run(collection, queries, args.k)
+            memory = collection.memory_usage()
+
+            if baseline is None:
+                baseline = results
+            recall = statistics.mean(
+                len(set(r) & set(b)) / max(len(b), 1) for r, b in zip(results, baseline)
+            )
+
+            p99 = sorted(latencies)[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+            print(
+                f"{quantization:<8} memory={memory['search_bytes'] / 2**20:8.1f}MiB "
+                f"({memory['ratio']:.2f}x)  recall@{args.k}={recall:.3f}  "
+                f"mean={statistics.mean(latencies):6.2f}ms  p99={p99:6.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: per-entity get/update/add loop vs chunked bulk upsert
+Writes the same synthetic entities (random embeddings, no API calls) to a
+scratch collection on the configured vector backend, twice per method: a
+first load (all new) and a refresh (all existing).
+
+The scratch collection is dropped afterwards. Writes still bump the shared
+collection version, so avoid running this against a busy deployment.
+
+Usage:
+    python scripts/benchmark_upsert.py --entities 10000
+    python scripts/benchmark_upsert.py --entities 10000 --chunk-size 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ragsearch1.embeddings import get_vector_dimension  # noqa: E402
+from ragsearch1.vectordb import get_vector_db  # noqa: E402
+
+COLLECTION = "benchmark_upsert"
+COUNTRIES = ["US", "MX", "VE", "CO", "BR", "AR", "CL", "PE"]
+TYPES = ["bank", "exchange", "fintech", "casa_cambio", "wallet", "defi"]
+
+
+def make_entities(n: int, dimension: int, seed: int):
+    rng = np.random.default_rng(seed)
+    ids = [f"entity_{i}" for i in range(n)]
+    metadatas = [
+        {"name": f"Entity {i}", "country": COUNTRIES[i % len(COUNTRIES)], "type": TYPES[i % len(TYPES)]}
+        for i in range(n)
+    ]
+    documents = [f"Name: Entity {i}\nCountry: {m['country']}\nType: {m['type']}" for i, m in enumerate(metadatas)]
+    embeddings = rng.standard_normal((n, dimension)).astype(np.float32).tolist()
+    return documents, metadatas, ids, embeddings
+
+
+def loop_write(vector_db, documents, metadatas, ids, embeddings):
+    """The previous ingest path: one lookup and one write per entity"""
+    for i, entity_id in enumerate(ids):
+        if vector_db.get_entity_by_id(entity_id):
+            vector_db.update_document(
+                document_id=entity_id,
+                document=documents[i],
+                metadata=metadatas[i],
+                embedding=embeddings[i]
+            )
+        else:
+            vector_db.add_documents(
+                documents=[documents[i]],
+                metadatas=[metadatas[i]],
+                ids=[entity_id],
+                embeddings=[embeddings[i]]
+            )
+
+
+def bulk_write(vector_db, documents, metadatas, ids, embeddings, chunk_size):
+    vector_db.upsert_documents(documents, metadatas, ids, embeddings, chunk_size=chunk_size)
+
+
+def fresh_collection(vector_db):
+    try:
+        vector_db.client.delete_collection(name=COLLECTION)
+    except Exception:
+        pass
+    vector_db.collection = vector_db.client.get_or_create_collection(
+        name=COLLECTION,
+        metadata={"dimension": get_vector_dimension(), "metric": "cosine", "hnsw:space": "cosine"}
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk upsert benchmark")
+    parser.add_argument("--entities", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=None, help="Defaults to VECTORDB_UPSERT_CHUNK_SIZE")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    vector_db = get_vector_db()
+    # Write to the scratch collection only
+    vector_db.projection = None
+    vector_db.reduced_collection = None
+
+    entities = make_entities(args.entities, get_vector_dimension(), args.seed)
+    print(f"{args.entities} entities, backend {type(vector_db.client).__name__}")
+
+    methods = [
+        ("loop", lambda: loop_write(vector_db, *entities)),
+        ("bulk", lambda: bulk_write(vector_db, *entities, args.chunk_size)),
+    ]
+
+    try:
+        for name, write in methods:
+            fresh_collection(vector_db)
+            timings = []
+            for _ in ("load", "refresh"):
+                start = time.perf_counter()
+                write()
+                timings.append(time.perf_counter() - start)
+
+            print(
+                f"{name:<5} load={timings[0]:7.2f}s ({args.entities / timings[0]:7.0f}/s)  "
+                f"refresh={timings[1]:7.2f}s ({args.entities / timings[1]:7.0f}/s)  "
+                f"count={vector_db.collection.count()}"
+            )
+    finally:
+        vector_db.client.delete_collection(name=COLLECTION)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: local NumPy exact-kNN store vs ChromaDB PersistentClient
+Loads the same synthetic corpus into both backends (temporary directories)
+and compares insert time, query latency (unfiltered and country-filtered)
+and Chroma's recall@k against the exact results.
+
+Usage:
+    python scripts/benchmark_vector_backends.py --entities 30000 --queries 200 --k 10
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb  # noqa: E402
+from chromadb.config import Settings as ChromaSettings  # noqa: E402
+
+from ragsearch1.localvectordb import LocalVectorClient  # noqa: E402
+
+COUNTRIES = ["US", "MX", "VE", "CO", "BR", "AR", "CL", "PE"]
+TYPES = ["bank", "exchange", "fintech", "casa_cambio", "wallet", "defi"]
+BATCH_SIZE = 1000
+
+
+def make_corpus(n: int, dimension: int, seed: int):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n, dimension)).astype(np.float32)
+    ids = [f"entity_{i}" for i in range(n)]
+    metadatas = [
+        {"name": f"Entity {i}", "country": COUNTRIES[i % len(COUNTRIES)], "type": TYPES[i % len(TYPES)]}
+        for i in range(n)
+    ]
+    documents = [f"Name: Entity {i}\nCountry: {m['country']}\nType: {m['type']}" for i, m in enumerate(metadatas)]
+    return ids, embeddings, metadatas, documents
+
+
+def load(collection, ids, embeddings, metadatas, documents) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(ids), BATCH_SIZE):
+        collection.add(
+            ids=ids[i:i + BATCH_SIZE],
+            embeddings=embeddings[i:i + BATCH_SIZE].tolist(),
+            metadatas=metadatas[i:i + BATCH_SIZE],
+            documents=documents[i:i + BATCH_SIZE],
+        )
+    return time.perf_counter() - start
+
+
+def run_queries(collection, queries, k: int, where):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        result = collection.query(query_embeddings=[query.tolist()], n_results=k, where=where)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(result["ids"][0])
+    return latencies, results
+
+
+def summarize(label: str, latencies):
+    p95 = sorted(latencies)[max(int(len(latencies) * 0.95) - 1, 0)]
+    return f"{label:<22} mean={statistics.mean(latencies):7.2f}ms  p95={p95:7.2f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local vs ChromaDB vector backend benchmark")
+    parser.add_argument("--entities", type=int, default=30000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    ids, embeddings, metadatas, documents = make_corpus(args.entities, args.dimension, args.seed)
+    queries = np.random.default_rng(args.seed + 1).standard_normal((args.queries, args.dimension)).astype(np.float32)
+    collection_metadata = {"dimension": args.dimension, "metric": "cosine", "hnsw:space": "cosine"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        local = LocalVectorClient(os.path.join(tmp, "local")).get_or_create_collection(
+            "benchmark", metadata=collection_metadata
+        )
+        chroma = chromadb.PersistentClient(
+            path=os.path.join(tmp, "chroma"),
+            settings=ChromaSettings(anonymized_telemetry=False)
+        ).get_or_create_collection("benchmark", metadata=collection_metadata)
+
+        print(f"{args.entities} entities, dimension {args.dimension}, {args.queries} queries, k={args.k}")
+        print(f"insert  local={load(local, ids, embeddings, metadatas, documents):.1f}s  "
+              f"chroma={load(chroma, ids, embeddings, metadatas, documents):.1f}s")
+
+        for label, where in (("unfiltered", None), ("country=VE", {"country": "VE"})):
+            local_latencies, exact = run_queries(local, queries, args.k, where)
+            chroma_latencies, approximate = run_queries(chroma, queries, args.k, where)
+            recall = statistics.mean(
+                len(set(a) & set(e)) / max(len(e), 1) for a, e in zip(approximate, exact)
+            )
+
+            print(summarize(f"local  {label}", local_latencies))
+            print(summarize(f"chroma {label}", chroma_latencies) + f"  recall@{args.k}={recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
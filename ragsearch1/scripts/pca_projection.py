@@ -0,0 +1,84 @@
+"""
+Offline job: PCA projection of the collection's embeddings
+fit       fits the projection, stores it next to the collection and builds
+          the reduced-dimension collection
+build     rebuilds the reduced collection from an existing projection
+evaluate  reports recall@k and query latency of the reduced collection
+          against the full-dimension one
+
+Search uses the reduced collection once PROJECTION_ENABLE=true (restart the
+API after fitting).
+
+Usage:
+    python scripts/pca_projection.py fit --components 256
+    python scripts/pca_projection.py build
+    python scripts/pca_projection.py evaluate --queries 200 --k 10
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ragsearch1.config import settings  # noqa: E402
+from ragsearch1.projection import (  # noqa: E402
+    build_reduced_collection,
+    evaluate_projection,
+    fit_projection,
+    load_projection,
+    projection_path,
+    reduced_collection_name,
+)
+from ragsearch1.vectordb import get_vector_db  # noqa: E402
+
+
+def require_projection(collection, components: int):
+    projection = load_projection(collection.name, components)
+    if projection is None:
+        sys.exit(f"No projection at {projection_path(collection.name, components)}; run fit first")
+    return projection
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PCA projection of collection embeddings")
+    parser.add_argument("command", choices=["fit", "build", "evaluate"])
+    parser.add_argument("--components", type=int, default=settings.PROJECTION_COMPONENTS)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    vector_db = get_vector_db()
+    collection = vector_db.collection
+
+    if args.command == "fit":
+        projection = fit_projection(collection, args.components)
+        path = projection_path(collection.name, args.components)
+        projection.save(path)
+        print(f"Projection {projection.input_dimension}->{projection.output_dimension} saved to {path} "
+              f"({projection.explained_variance_ratio:.1%} variance kept)")
+
+    if args.command in ("fit", "build"):
+        projection = require_projection(collection, args.components)
+        reduced = build_reduced_collection(vector_db.client, collection, projection, args.batch_size)
+        print(f"Reduced collection {reduced.name}: {reduced.count()} documents")
+        return
+
+    projection = require_projection(collection, args.components)
+    reduced = vector_db.client.get_collection(
+        name=reduced_collection_name(collection.name, projection.output_dimension)
+    )
+    report = evaluate_projection(collection, reduced, projection, args.queries, args.k, args.seed)
+
+    print(f"{report['queries']} queries, k={report['k']}, "
+          f"{report['dimension']}->{report['reduced_dimension']} "
+          f"({report['explained_variance_ratio']:.1%} variance)")
+    print(f"recall@{report['k']}={report['recall']:.3f}")
+    for label in ("full", "reduced"):
+        print(f"{label:<8} mean={report[label]['mean_ms']:6.2f}ms  p99={report[label]['p99_ms']:6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()